@@ -14,16 +14,31 @@
 #
 ##############################################################################
 
+from functools import partial
 from itertools import chain
+from time import time as get_current_time
 
 from pyrecord import Record
 
+from hubspot.contacts._concurrency import map_concurrently
+from hubspot.contacts._concurrency import require_valid_concurrency
 from hubspot.contacts._constants import BATCH_SAVING_SIZE_LIMIT
 from hubspot.contacts._constants import CONTACTS_API_SCRIPT_NAME
 from hubspot.contacts._property_utils import get_property_type_by_property_name
+from hubspot.contacts.connections import can_send_serialized_bodies
+from hubspot.contacts.exc import HubspotPropertyValueError
 from hubspot.contacts.generic_utils import ipaginate
+from hubspot.contacts.generic_utils import ipaginate_by_size
+from hubspot.contacts.instrumentation import BatchSendingMetrics
+from hubspot.contacts.instrumentation import get_metrics_sink
+from hubspot.contacts.request_data_formatters.contacts import \
+    ContactsEncoder
 from hubspot.contacts.request_data_formatters.contacts import \
     format_contacts_data_for_saving
+from hubspot.contacts.request_data_formatters.contacts import \
+    get_contact_data_byte_size
+from hubspot.contacts.request_data_formatters.contacts import \
+    get_contact_digest
 
 
 Contact = Record.create_type(
@@ -36,14 +51,35 @@ Contact = Record.create_type(
     )
 
 
+ContactsBatchSavingResult = Record.create_type(
+    'ContactsBatchSavingResult',
+    'batch_index',
+    'contact_count',
+    'failed_contacts',
+    'exception',
+    failed_contacts=(),
+    exception=None,
+    )
+
+
 _CONTACTS_SAVING_URL_PATH = CONTACTS_API_SCRIPT_NAME + '/contact/batch/'
 
 
-def save_contacts(contacts, connection):
+def save_contacts(
+    contacts,
+    connection,
+    max_batch_byte_size=None,
+    contact_digest_store=None,
+    ):
     """
     Request the creation and/or update of the ``contacts``.
     
     :param iterable contacts: The contacts to be created/updated
+    :param int max_batch_byte_size: The maximum size of the body of each
+        request, in bytes, or ``None`` for no limit
+    :param hubspot.contacts.digests.ContactDigestStore contact_digest_store:
+        The digests of the contacts previously saved, if the contacts that
+        haven't changed since then should be skipped
     :return: ``None``
     :raises hubspot.connection.exc.HubspotException:
     :raises hubspot.contacts.exc.HubspotPropertyValueError: If one of the
@@ -56,6 +92,21 @@ def save_contacts(contacts, connection):
     immediately. Instead, it **partially** validates the input and, if it's all
     correct, the requested changes are queued.
     
+    The contacts are sent in batches of up to 250 contacts. If
+    ``max_batch_byte_size`` is set, batches whose serialization would exceed
+    it are split further; measuring them takes an extra serialization of each
+    contact unless ``connection`` supports pre-serialized bodies.
+    
+    If ``connection`` supports it, the body of each request is serialized to
+    JSON straight from the contacts; see :mod:`hubspot.contacts.connections`.
+    
+    If ``contact_digest_store`` is set, the contacts whose digest is in it
+    already are skipped, and the digests of the rest are added to it as each
+    batch is sent. The batches are made up of changed contacts only.
+    
+    If ``connection`` has a metrics sink, the time taken to send each batch
+    and its size are recorded; see :mod:`hubspot.contacts.instrumentation`.
+    
     End-point documentation:
     http://developers.hubspot.com/docs/methods/contacts/batch_create_or_update
     
@@ -68,13 +119,337 @@ def save_contacts(contacts, connection):
 
     property_type_by_property_name = \
         get_property_type_by_property_name(connection)
+    contacts_batch_formatter = _get_contacts_batch_formatter(
+        connection,
+        property_type_by_property_name,
+        )
+    metrics_sink = get_metrics_sink(connection)
 
-    for contacts_batch in chain([contacts_first_batch], contacts_batches):
-        contacts_batch_data = format_contacts_data_for_saving(
-            contacts_batch,
+    contacts_batches = chain([contacts_first_batch], contacts_batches)
+    if contact_digest_store is not None:
+        # Each digest travels with its contact, so that it's only stored once
+        # that very contact has been sent
+        changed_contacts_and_digests = _iter_changed_contacts_and_digests(
+            chain.from_iterable(contacts_batches),
+            contact_digest_store,
             property_type_by_property_name,
             )
-        connection.send_post_request(
+        contacts_batches = ipaginate(
+            changed_contacts_and_digests,
+            BATCH_SAVING_SIZE_LIMIT,
+            )
+
+    for contacts_batch in contacts_batches:
+        if contact_digest_store is None:
+            batch_contacts = contacts_batch
+        else:
+            batch_contacts = [c for c, _ in contacts_batch]
+        formatted_contacts_batch = \
+            contacts_batch_formatter.format_contacts(batch_contacts)
+        sized_contacts_batches = _split_formatted_contacts_batch(
+            contacts_batch,
+            formatted_contacts_batch,
+            contacts_batch_formatter,
+            max_batch_byte_size,
+            )
+        for sized_contacts_batch, sized_formatted_contacts_batch in \
+                sized_contacts_batches:
+            _send_formatted_contacts(
+                connection,
+                contacts_batch_formatter,
+                sized_formatted_contacts_batch,
+                metrics_sink,
+                )
+
+            if contact_digest_store is not None:
+                contact_digest_store.set_digests(
+                    {c.email_address: d for c, d in sized_contacts_batch},
+                    )
+
+
+def save_contacts_concurrently(
+    contacts,
+    connection,
+    worker_count=4,
+    max_batches_in_flight=None,
+    max_batch_byte_size=None,
+    ):
+    """
+    Request the creation and/or update of the ``contacts``, sending several
+    batches at the same time.
+    
+    :param iterable contacts: The contacts to be created/updated
+    :param int worker_count: The number of threads sending batches
+    :param int max_batches_in_flight: The maximum number of batches that have
+        been formatted but not sent yet; twice ``worker_count`` by default
+    :param int max_batch_byte_size: The maximum size of the body of each
+        request, in bytes, or ``None`` for no limit
+    :return: A :class:`list` of :class:`ContactsBatchSavingResult` instances,
+        in the order in which the batches were taken from ``contacts``
+    :raises hubspot.connection.exc.HubspotException: If the property
+        definitions cannot be retrieved
+    :raises ValueError: If ``worker_count`` or ``max_batches_in_flight`` is
+        lower than one
+    
+    This behaves like :func:`save_contacts`, except that the batches are sent
+    from a pool of threads and the failure to save a batch doesn't prevent the
+    rest from being sent. Each batch is formatted in the calling thread whilst
+    the previous ones are being sent.
+    
+    ``connection`` is shared by all the threads, so it must be safe to use it
+    concurrently.
+    
+    """
+    require_valid_concurrency(worker_count, max_batches_in_flight)
+
+    if max_batches_in_flight is None:
+        max_batches_in_flight = worker_count * 2
+
+    contacts_batches = ipaginate(contacts, BATCH_SAVING_SIZE_LIMIT)
+
+    contacts_first_batch = next(contacts_batches, None)
+    if not contacts_first_batch:
+        return []
+
+    property_type_by_property_name = \
+        get_property_type_by_property_name(connection)
+    contacts_batch_formatter = _get_contacts_batch_formatter(
+        connection,
+        property_type_by_property_name,
+        )
+    metrics_sink = get_metrics_sink(connection)
+
+    batch_results = []
+    formatted_contacts_batches = _format_contacts_batches(
+        chain([contacts_first_batch], contacts_batches),
+        contacts_batch_formatter,
+        max_batch_byte_size,
+        batch_results,
+        )
+
+    sent_contacts_batches = map_concurrently(
+        partial(
+            _send_formatted_contacts_batch,
+            connection,
+            contacts_batch_formatter,
+            metrics_sink,
+            ),
+        formatted_contacts_batches,
+        worker_count,
+        max_batches_in_flight,
+        )
+    for formatted_contacts_batch, _, exception in sent_contacts_batches:
+        batch_index, contacts_batch, _ = formatted_contacts_batch
+        batch_result = _make_contacts_batch_saving_result(
+            batch_index,
+            contacts_batch,
+            exception,
+            )
+        batch_results.append(batch_result)
+
+    batch_results.sort(key=lambda r: r.batch_index)
+    return batch_results
+
+
+def _get_contacts_batch_formatter(connection, property_type_by_property_name):
+    if can_send_serialized_bodies(connection):
+        contacts_batch_formatter = \
+            _SerializedContactsBatchFormatter(property_type_by_property_name)
+    else:
+        contacts_batch_formatter = \
+            _ContactsBatchFormatter(property_type_by_property_name)
+    return contacts_batch_formatter
+
+
+class _ContactsBatchFormatter(object):
+
+    def __init__(self, property_type_by_property_name):
+        super(_ContactsBatchFormatter, self).__init__()
+
+        self._property_type_by_property_name = property_type_by_property_name
+
+    def format_contacts(self, contacts):
+        contacts_data = format_contacts_data_for_saving(
+            contacts,
+            self._property_type_by_property_name,
+            )
+        return contacts_data
+
+    @staticmethod
+    def get_formatted_contact_byte_size(contact_data):
+        return get_contact_data_byte_size(contact_data)
+
+    @staticmethod
+    def send_formatted_contacts(connection, contacts_data):
+        connection.send_post_request(_CONTACTS_SAVING_URL_PATH, contacts_data)
+
+
+class _SerializedContactsBatchFormatter(object):
+
+    def __init__(self, property_type_by_property_name):
+        super(_SerializedContactsBatchFormatter, self).__init__()
+
+        self._contacts_encoder = \
+            ContactsEncoder(property_type_by_property_name)
+
+    def format_contacts(self, contacts):
+        encoded_contacts = \
+            [self._contacts_encoder.encode_contact(c) for c in contacts]
+        return encoded_contacts
+
+    @staticmethod
+    def get_formatted_contact_byte_size(encoded_contact):
+        # The separator between items in a serialized list is two bytes long
+        return len(encoded_contact) + 2
+
+    @staticmethod
+    def send_formatted_contacts(connection, encoded_contacts):
+        connection.send_serialized_post_request(
             _CONTACTS_SAVING_URL_PATH,
-            contacts_batch_data,
+            '[' + ', '.join(encoded_contacts) + ']',
+            )
+
+
+def _iter_changed_contacts_and_digests(
+    contacts,
+    contact_digest_store,
+    property_type_by_property_name,
+    ):
+    for contact in contacts:
+        contact_digest = \
+            get_contact_digest(contact, property_type_by_property_name)
+        stored_contact_digest = \
+            contact_digest_store.get_digest(contact.email_address)
+        if contact_digest != stored_contact_digest:
+            yield contact, contact_digest
+
+
+def _format_contacts_batches(
+    contacts_batches,
+    contacts_batch_formatter,
+    max_batch_byte_size,
+    batch_results,
+    ):
+    batch_index = 0
+    for contacts_batch in contacts_batches:
+        try:
+            formatted_contacts_batch = \
+                contacts_batch_formatter.format_contacts(contacts_batch)
+        except HubspotPropertyValueError as exception:
+            batch_result = _make_contacts_batch_saving_result(
+                batch_index,
+                contacts_batch,
+                exception,
+                )
+            batch_results.append(batch_result)
+            batch_index += 1
+            continue
+
+        sized_contacts_batches = _split_formatted_contacts_batch(
+            contacts_batch,
+            formatted_contacts_batch,
+            contacts_batch_formatter,
+            max_batch_byte_size,
+            )
+        for sized_contacts_batch, sized_formatted_contacts_batch in \
+                sized_contacts_batches:
+            yield (
+                batch_index,
+                sized_contacts_batch,
+                sized_formatted_contacts_batch,
+                )
+            batch_index += 1
+
+
+def _split_formatted_contacts_batch(
+    contacts_batch,
+    formatted_contacts_batch,
+    contacts_batch_formatter,
+    max_batch_byte_size,
+    ):
+    if max_batch_byte_size is None:
+        yield contacts_batch, formatted_contacts_batch
+        return
+
+    get_formatted_contact_byte_size = \
+        contacts_batch_formatter.get_formatted_contact_byte_size
+    contacts_and_formatted_contacts_batches = ipaginate_by_size(
+        zip(contacts_batch, formatted_contacts_batch),
+        len(contacts_batch),
+        max_batch_byte_size,
+        lambda contact_and_formatted_contact:
+            get_formatted_contact_byte_size(contact_and_formatted_contact[1]),
+        )
+    for batch in contacts_and_formatted_contacts_batches:
+        sized_contacts_batch = [c for c, _ in batch]
+        sized_formatted_contacts_batch = [f for _, f in batch]
+        yield sized_contacts_batch, sized_formatted_contacts_batch
+
+
+def _send_formatted_contacts_batch(
+    connection,
+    contacts_batch_formatter,
+    metrics_sink,
+    formatted_contacts_batch,
+    ):
+    _, _, sized_formatted_contacts_batch = formatted_contacts_batch
+    _send_formatted_contacts(
+        connection,
+        contacts_batch_formatter,
+        sized_formatted_contacts_batch,
+        metrics_sink,
+        )
+
+
+def _send_formatted_contacts(
+    connection,
+    contacts_batch_formatter,
+    formatted_contacts,
+    metrics_sink,
+    ):
+    if not metrics_sink:
+        contacts_batch_formatter.send_formatted_contacts(
+            connection,
+            formatted_contacts,
+            )
+        return
+
+    request_start_time = get_current_time()
+    contacts_batch_formatter.send_formatted_contacts(
+        connection,
+        formatted_contacts,
+        )
+    request_duration = get_current_time() - request_start_time
+
+    # The brackets around the list take the place of the separator after the
+    # last contact
+    body_byte_size = sum(
+        map(
+            contacts_batch_formatter.get_formatted_contact_byte_size,
+            formatted_contacts,
+            ),
+        )
+    batch_sending_metrics = BatchSendingMetrics(
+        _CONTACTS_SAVING_URL_PATH,
+        len(formatted_contacts),
+        body_byte_size,
+        request_duration,
+        None,
+        )
+    metrics_sink.record_batch_sending(batch_sending_metrics)
+
+
+def _make_contacts_batch_saving_result(batch_index, contacts_batch, exception):
+    if exception:
+        batch_result = ContactsBatchSavingResult(
+            batch_index,
+            len(contacts_batch),
+            contacts_batch,
+            exception,
+            )
+    else:
+        batch_result = ContactsBatchSavingResult(
+            batch_index,
+            len(contacts_batch),
             )
+    return batch_result
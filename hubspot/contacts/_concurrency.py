@@ -0,0 +1,137 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from Queue import Empty
+from Queue import Queue
+from threading import Event
+from threading import Thread
+import sys
+
+
+_END_OF_TASKS = object()
+
+
+def require_valid_concurrency(worker_count, max_pending_count):
+    """
+    Raise :class:`ValueError` unless ``worker_count`` and
+    ``max_pending_count`` (if set) are positive, since
+    :func:`map_concurrently` would otherwise block forever.
+    
+    """
+    if worker_count < 1:
+        raise ValueError(
+            'worker_count must be at least 1, not {!r}'.format(worker_count),
+            )
+    if max_pending_count is not None and max_pending_count < 1:
+        raise ValueError(
+            'max_batches_in_flight must be at least 1, not {!r}'.format(
+                max_pending_count,
+                ),
+            )
+
+
+def map_concurrently(function, arguments, worker_count, max_pending_count):
+    """
+    Call ``function`` on each item in ``arguments`` from a pool of
+    ``worker_count`` threads.
+    
+    :return: An iterator of ``(argument, result, exception)`` tuples in the
+        order in which the calls complete
+    
+    ``arguments`` is consumed lazily from the calling thread, so producing the
+    next argument overlaps with the calls in progress. No more than
+    ``max_pending_count`` arguments are submitted and not yet yielded back at
+    any time. Calls which haven't started when the iterator is closed are
+    cancelled.
+    
+    Exceptions from ``function`` are yielded with their argument, except for
+    those which don't derive from :class:`Exception` (e.g.,
+    :class:`KeyboardInterrupt`), which are re-raised in the calling thread.
+    
+    """
+    require_valid_concurrency(worker_count, max_pending_count)
+
+    task_queue = Queue()
+    result_queue = Queue()
+    cancellation_event = Event()
+
+    worker_threads = []
+    for _ in range(worker_count):
+        worker_thread = Thread(
+            target=_process_tasks,
+            args=(function, task_queue, result_queue, cancellation_event),
+            )
+        worker_thread.daemon = True
+        worker_thread.start()
+        worker_threads.append(worker_thread)
+
+    submitted_task_count = 0
+    completed_task_count = 0
+    try:
+        for argument in arguments:
+            pending_task_count = submitted_task_count - completed_task_count
+            while max_pending_count <= pending_task_count:
+                yield _get_result(result_queue)
+                completed_task_count += 1
+                pending_task_count -= 1
+
+            task_queue.put(argument)
+            submitted_task_count += 1
+
+            for result in _get_available_results(result_queue):
+                yield result
+                completed_task_count += 1
+
+        while completed_task_count < submitted_task_count:
+            yield _get_result(result_queue)
+            completed_task_count += 1
+
+    finally:
+        cancellation_event.set()
+        for _ in worker_threads:
+            task_queue.put(_END_OF_TASKS)
+
+
+def _get_available_results(result_queue):
+    while True:
+        try:
+            yield _get_result(result_queue, block=False)
+        except Empty:
+            break
+
+
+def _get_result(result_queue, block=True):
+    result, exc_info = result_queue.get(block)
+    if exc_info:
+        raise exc_info[0], exc_info[1], exc_info[2]
+    return result
+
+
+def _process_tasks(function, task_queue, result_queue, cancellation_event):
+    while True:
+        argument = task_queue.get()
+        if argument is _END_OF_TASKS or cancellation_event.is_set():
+            break
+
+        try:
+            result = function(argument)
+        except Exception as exception:
+            result_queue.put(((argument, None, exception), None))
+        except BaseException:
+            # The caller would wait forever for a result without this
+            result_queue.put((None, sys.exc_info()))
+        else:
+            result_queue.put(((argument, result, None), None))
@@ -0,0 +1,97 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+from json import dumps as json_serialize
+from json import loads as json_deserialize
+
+from hubspot.contacts import Contact
+
+
+_DATE_FORMAT = '%Y-%m-%d'
+
+_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+_DATETIME_WITH_MICROSECONDS_FORMAT = _DATETIME_FORMAT + '.%f'
+
+
+def serialize_contact(contact):
+    contact_data = {
+        'vid': contact.vid,
+        'email_address': contact.email_address,
+        'properties': dict(contact.properties),
+        'related_contact_vids': contact.related_contact_vids,
+        }
+    contact_line = json_serialize(
+        contact_data,
+        default=_serialize_property_value,
+        separators=(',', ':'),
+        sort_keys=True,
+        )
+    return contact_line
+
+
+def _serialize_property_value(property_value):
+    if isinstance(property_value, Decimal):
+        property_value_data = {'$decimal': str(property_value)}
+    elif isinstance(property_value, datetime):
+        property_value_data = {'$datetime': property_value.isoformat()}
+    elif isinstance(property_value, date):
+        property_value_data = {'$date': property_value.isoformat()}
+    else:
+        raise TypeError('{!r} is not serializable'.format(property_value))
+    return property_value_data
+
+
+def deserialize_contact(contact_line):
+    contact_data = json_deserialize(
+        contact_line,
+        object_hook=_deserialize_property_value,
+        )
+    contact = Contact(
+        contact_data['vid'],
+        contact_data['email_address'],
+        contact_data['properties'],
+        contact_data['related_contact_vids'],
+        )
+    return contact
+
+
+def _deserialize_property_value(property_value_data):
+    if '$decimal' in property_value_data:
+        property_value = Decimal(property_value_data['$decimal'])
+    elif '$datetime' in property_value_data:
+        property_value = \
+            _deserialize_datetime(property_value_data['$datetime'])
+    elif '$date' in property_value_data:
+        property_value = datetime.strptime(
+            property_value_data['$date'],
+            _DATE_FORMAT,
+            ).date()
+    else:
+        property_value = property_value_data
+    return property_value
+
+
+def _deserialize_datetime(datetime_string):
+    # datetime.isoformat() omits the microseconds when they're zero
+    if '.' in datetime_string:
+        datetime_format = _DATETIME_WITH_MICROSECONDS_FORMAT
+    else:
+        datetime_format = _DATETIME_FORMAT
+    return datetime.strptime(datetime_string, datetime_format)
@@ -1,13 +1,24 @@
 import re
+import sys
+from Queue import Full
+from Queue import Queue
+from threading import Event
+from threading import Thread
+from time import time as get_current_time
 
 from voluptuous import Schema
 
 from hubspot.contacts._constants import BATCH_RETRIEVAL_SIZE_LIMIT
+from hubspot.contacts.instrumentation import PageRetrievalMetrics
+from hubspot.contacts.instrumentation import get_metrics_sink
 
 
 _CAMEL_CASE_CONVERSION_RE = re.compile(r'\-(\w)')
 
 
+_PREFETCH_QUEUE_PUT_TIMEOUT = 0.1
+
+
 class PaginatedDataRetriever(object):
 
     def __init__(
@@ -15,24 +26,103 @@ class PaginatedDataRetriever(object):
         response_data_key,
         response_offset_keys,
         page_size=BATCH_RETRIEVAL_SIZE_LIMIT,
+        prefetch_depth=0,
         ):
         self._response_data_key = response_data_key
         self._response_offset_keys = response_offset_keys
         self._page_size = page_size
+        self._prefetch_depth = prefetch_depth
 
         self._offset_url_param_name_by_response_key = \
             {k: _convert_to_camel_case(k) for k in self._response_offset_keys}
 
         self._schema = self._get_response_data_schema()
 
-    def get_data(self, connection, path_info, query_string_args=None):
-        data_by_page = \
-            self._get_data_by_page(path_info, query_string_args, connection)
-        for page_data in data_by_page:
+    def get_data(
+        self,
+        connection,
+        path_info,
+        query_string_args=None,
+        checkpoint_store=None,
+        datum_validator=None,
+        datum_decoder=None,
+        ):
+        """
+        Yield the data in each page, optionally resuming from and updating
+        the checkpoint in ``checkpoint_store``.
+        
+        The checkpoint is only updated once all the data in a page has been
+        consumed, and it's discarded once the last page has been consumed.
+        
+        Each datum is passed through ``datum_validator`` and then
+        ``datum_decoder``, if set, as it's consumed. Both are timed if
+        ``connection`` has a metrics sink.
+        
+        """
+        if checkpoint_store:
+            checkpoint = checkpoint_store.get_checkpoint()
+        else:
+            checkpoint = None
+
+        metrics_sink = get_metrics_sink(connection)
+
+        data_by_page = self._get_data_by_page(
+            path_info,
+            query_string_args,
+            connection,
+            checkpoint,
+            metrics_sink,
+            )
+        if self._prefetch_depth:
+            data_by_page = _prefetch(data_by_page, self._prefetch_depth)
+
+        for page_data, next_page_checkpoint, page_metrics in data_by_page:
+            if page_metrics:
+                page_data = _decode_data_with_metrics(
+                    page_data,
+                    datum_validator,
+                    datum_decoder,
+                    page_metrics,
+                    )
+            elif datum_validator or datum_decoder:
+                page_data = \
+                    _decode_data(page_data, datum_validator, datum_decoder)
+
             for datum in page_data:
                 yield datum
 
-    def _get_data_by_page(self, path_info, query_string_args, connection):
+            if page_metrics:
+                metrics_sink.record_page_retrieval(page_metrics)
+
+            if checkpoint_store:
+                _update_checkpoint(checkpoint_store, next_page_checkpoint)
+
+    def get_data_by_page(self, connection, path_info, query_string_args=None):
+        metrics_sink = get_metrics_sink(connection)
+
+        data_by_page = self._get_data_by_page(
+            path_info,
+            query_string_args,
+            connection,
+            metrics_sink=metrics_sink,
+            )
+        if self._prefetch_depth:
+            data_by_page = _prefetch(data_by_page, self._prefetch_depth)
+
+        for page_data, _, page_metrics in data_by_page:
+            yield page_data
+
+            if page_metrics:
+                metrics_sink.record_page_retrieval(page_metrics)
+
+    def _get_data_by_page(
+        self,
+        path_info,
+        query_string_args,
+        connection,
+        checkpoint=None,
+        metrics_sink=None,
+        ):
         if query_string_args:
             base_query_string_args = query_string_args.copy()
         else:
@@ -42,25 +132,55 @@ class PaginatedDataRetriever(object):
             base_query_string_args['count'] = self._page_size
 
         has_more_pages = True
-        next_request_offset_query_string_args = {}
+        next_request_offset_query_string_args = \
+            self._get_offset_query_string_args(checkpoint or {})
         while has_more_pages:
             query_string_args = base_query_string_args.copy()
             query_string_args.update(next_request_offset_query_string_args)
 
-            response = connection.send_get_request(path_info, query_string_args)
-            response = self._validate_response_data(response)
+            if metrics_sink:
+                request_start_time = get_current_time()
+                response = \
+                    connection.send_get_request(path_info, query_string_args)
+                validation_start_time = get_current_time()
+                response = self._validate_response_data(response)
+                validation_end_time = get_current_time()
+            else:
+                response = \
+                    connection.send_get_request(path_info, query_string_args)
+                response = self._validate_response_data(response)
+
+            has_more_pages = response['has-more']
+            if has_more_pages:
+                next_request_offset = \
+                    _filter_dict(response, self._response_offset_keys)
+            else:
+                next_request_offset = None
 
             response_data = response[self._response_data_key]
-            yield response_data
 
-            next_request_offset = \
-                _filter_dict(response, self._response_offset_keys)
-            next_request_offset_query_string_args = _translate_dict_keys(
-                next_request_offset,
-                self._offset_url_param_name_by_response_key,
-                )
+            if metrics_sink:
+                page_metrics = PageRetrievalMetrics(
+                    path_info,
+                    len(response_data),
+                    validation_start_time - request_start_time,
+                    validation_end_time - validation_start_time,
+                    0,
+                    )
+            else:
+                page_metrics = None
 
-            has_more_pages = response['has-more']
+            yield response_data, next_request_offset, page_metrics
+
+            next_request_offset_query_string_args = \
+                self._get_offset_query_string_args(next_request_offset or {})
+
+    def _get_offset_query_string_args(self, request_offset):
+        offset_query_string_args = _translate_dict_keys(
+            request_offset,
+            self._offset_url_param_name_by_response_key,
+            )
+        return offset_query_string_args
 
     def _validate_response_data(self, response_data):
         return self._schema(response_data)
@@ -76,6 +196,102 @@ class PaginatedDataRetriever(object):
 #{ Utils
 
 
+def _prefetch(iterable, depth):
+    """
+    Consume ``iterable`` in a background thread, keeping up to ``depth`` items
+    ready for the caller plus the one being produced.
+    
+    Any exception raised by ``iterable`` is re-raised to the caller, with its
+    original traceback, once the items produced before it have been consumed.
+    
+    """
+    queue = Queue(maxsize=depth)
+    stop_event = Event()
+
+    producer_thread = Thread(
+        target=_produce_prefetched_items,
+        args=(iterable, queue, stop_event),
+        )
+    producer_thread.daemon = True
+    producer_thread.start()
+
+    try:
+        while True:
+            item, exc_info = queue.get()
+            if item is _PREFETCH_END:
+                if exc_info:
+                    raise exc_info[0], exc_info[1], exc_info[2]
+                break
+            yield item
+    finally:
+        stop_event.set()
+
+
+_PREFETCH_END = object()
+
+
+def _produce_prefetched_items(iterable, queue, stop_event):
+    exc_info = None
+    try:
+        for item in iterable:
+            if not _put_prefetched_item(queue, (item, None), stop_event):
+                return
+    except BaseException:
+        exc_info = sys.exc_info()
+    finally:
+        # The consumer would block forever without the terminal item
+        _put_prefetched_item(queue, (_PREFETCH_END, exc_info), stop_event)
+
+
+def _put_prefetched_item(queue, queue_item, stop_event):
+    while not stop_event.is_set():
+        try:
+            queue.put(queue_item, timeout=_PREFETCH_QUEUE_PUT_TIMEOUT)
+        except Full:
+            continue
+        return True
+    return False
+
+
+def _decode_data(data, datum_validator, datum_decoder):
+    for datum in data:
+        if datum_validator:
+            datum = datum_validator(datum)
+        if datum_decoder:
+            datum = datum_decoder(datum)
+        yield datum
+
+
+def _decode_data_with_metrics(
+    data,
+    datum_validator,
+    datum_decoder,
+    page_metrics,
+    ):
+    for datum in data:
+        validation_start_time = get_current_time()
+        if datum_validator:
+            datum = datum_validator(datum)
+        decoding_start_time = get_current_time()
+        if datum_decoder:
+            datum = datum_decoder(datum)
+        decoding_end_time = get_current_time()
+
+        page_metrics.validation_duration += \
+            decoding_start_time - validation_start_time
+        page_metrics.decoding_duration += \
+            decoding_end_time - decoding_start_time
+
+        yield datum
+
+
+def _update_checkpoint(checkpoint_store, checkpoint):
+    if checkpoint:
+        checkpoint_store.set_checkpoint(checkpoint)
+    else:
+        checkpoint_store.delete_checkpoint()
+
+
 def _convert_to_camel_case(string):
     uppercase_matched_group = lambda m: m.groups()[0].upper()
     return _CAMEL_CASE_CONVERSION_RE.sub(uppercase_matched_group, string)
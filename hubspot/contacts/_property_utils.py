@@ -14,11 +14,98 @@
 #
 ##############################################################################
 
+from threading import Lock
+from time import time as get_current_time
+from weakref import WeakKeyDictionary
+from weakref import ref
+
+from hubspot.contacts.connections import _get_unwrapped_connection
 from hubspot.contacts.properties import get_all_properties
 
 
+class _PropertyTypeCache(object):
+    """
+    Cache for the type of each property in a portal, keyed by connection.
+    
+    Entries expire ``ttl`` seconds after they were retrieved; a ``ttl`` of zero
+    disables the cache. Entries are dropped along with their connection, and
+    connections which can't be weakly referenced are never cached.
+    
+    Definitions whose retrieval overlapped with an invalidation are not
+    cached, since they may predate it.
+    
+    Connections wrapped by
+    :class:`~hubspot.contacts.connections.RateLimitedPortalConnection` share
+    the entry of the connection they wrap.
+    
+    """
+
+    def __init__(self, ttl=0):
+        super(_PropertyTypeCache, self).__init__()
+
+        self.ttl = ttl
+
+        self._entries_by_connection = WeakKeyDictionary()
+        self._invalidation_count = 0
+        self._lock = Lock()
+
+    def get_property_type_by_property_name(self, connection):
+        cache_key = _get_unwrapped_connection(connection)
+        if not self.ttl or not _is_weakly_referenceable(cache_key):
+            return _retrieve_property_type_by_property_name(connection)
+
+        with self._lock:
+            entry = self._entries_by_connection.get(cache_key)
+            invalidation_count = self._invalidation_count
+
+        if entry:
+            expiry_time, property_type_by_property_name = entry
+            if get_current_time() < expiry_time:
+                return property_type_by_property_name
+
+        property_type_by_property_name = \
+            _retrieve_property_type_by_property_name(connection)
+        expiry_time = get_current_time() + self.ttl
+        with self._lock:
+            if invalidation_count == self._invalidation_count:
+                self._entries_by_connection[cache_key] = \
+                    (expiry_time, property_type_by_property_name)
+
+        return property_type_by_property_name
+
+    def invalidate(self, connection=None):
+        with self._lock:
+            self._invalidation_count += 1
+
+            if connection is None:
+                self._entries_by_connection.clear()
+            else:
+                cache_key = _get_unwrapped_connection(connection)
+                if _is_weakly_referenceable(cache_key):
+                    self._entries_by_connection.pop(cache_key, None)
+
+
+PROPERTY_TYPE_CACHE = _PropertyTypeCache()
+
+
 def get_property_type_by_property_name(connection):
+    property_type_by_property_name = \
+        PROPERTY_TYPE_CACHE.get_property_type_by_property_name(connection)
+    return property_type_by_property_name
+
+
+def _retrieve_property_type_by_property_name(connection):
     property_definitions = get_all_properties(connection)
     property_type_by_property_name = \
         {p.name: type(p) for p in property_definitions}
     return property_type_by_property_name
+
+
+def _is_weakly_referenceable(obj):
+    try:
+        ref(obj)
+    except TypeError:
+        is_weakly_referenceable = False
+    else:
+        is_weakly_referenceable = True
+    return is_weakly_referenceable
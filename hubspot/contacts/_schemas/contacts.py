@@ -16,7 +16,9 @@
 
 from voluptuous import All
 from voluptuous import Any
+from voluptuous import Invalid
 from voluptuous import Length
+from voluptuous import MultipleInvalid
 from voluptuous import Schema
 
 from hubspot.contacts._schemas._validators import AnyListItemValidates
@@ -58,3 +60,103 @@ CONTACT_SCHEMA = Schema(
     required=True,
     extra=True,
     )
+
+
+def validate_contact_data(contact_data):
+    """
+    Validate ``contact_data`` like :data:`CONTACT_SCHEMA` does, without the
+    overhead of walking a generic schema.
+    
+    The same :class:`~voluptuous.Invalid` exceptions are raised, although the
+    first error found is the only one reported.
+    
+    """
+    if not isinstance(contact_data, dict):
+        _raise_invalid('expected a dictionary', [])
+
+    for key in ('vid', 'properties', 'identity-profiles'):
+        if key not in contact_data:
+            _raise_invalid('required key not provided', [key])
+
+    if not isinstance(contact_data['vid'], int):
+        _raise_invalid('expected int for dictionary value', ['vid'])
+
+    properties_data = contact_data['properties']
+    if not isinstance(properties_data, dict):
+        _raise_invalid(
+            'expected a dictionary for dictionary value',
+            ['properties'],
+            )
+
+    property_values = {}
+    for property_name, property_value_data in properties_data.iteritems():
+        if not isinstance(property_name, unicode):
+            _raise_invalid(
+                'expected unicode for dictionary value',
+                ['properties'],
+                )
+        property_values[property_name] = \
+            _get_property_value(property_name, property_value_data)
+
+    _validate_identity_profiles_data(contact_data['identity-profiles'])
+
+    validated_contact_data = dict(contact_data, properties=property_values)
+    return validated_contact_data
+
+
+def _get_property_value(property_name, property_value_data):
+    path = ['properties', property_name]
+    if not isinstance(property_value_data, dict):
+        _raise_invalid('expected a dictionary for dictionary value', path)
+
+    if 'value' not in property_value_data:
+        _raise_invalid('required key not provided', path + ['value'])
+
+    property_value = property_value_data['value']
+    if not isinstance(property_value, unicode):
+        _raise_invalid(
+            'expected unicode for dictionary value',
+            path + ['value'],
+            )
+
+    return property_value
+
+
+def _validate_identity_profiles_data(identity_profiles_data):
+    path = ['identity-profiles']
+    if not isinstance(identity_profiles_data, list):
+        _raise_invalid('expected a list for dictionary value', path)
+
+    if not identity_profiles_data:
+        _raise_invalid(
+            'length of value must be at least 1 for dictionary value',
+            path,
+            )
+
+    for index, identity_profile_data in enumerate(identity_profiles_data):
+        profile_path = path + [index]
+        if not isinstance(identity_profile_data, dict):
+            _raise_invalid('expected a dictionary', profile_path)
+
+        for key in ('vid', 'identities'):
+            if key not in identity_profile_data:
+                _raise_invalid(
+                    'required key not provided',
+                    profile_path + [key],
+                    )
+
+        if not isinstance(identity_profile_data['vid'], int):
+            _raise_invalid(
+                'expected int for dictionary value',
+                profile_path + ['vid'],
+                )
+
+        if not isinstance(identity_profile_data['identities'], list):
+            _raise_invalid(
+                'expected a list for dictionary value',
+                profile_path + ['identities'],
+                )
+
+
+def _raise_invalid(message, path):
+    raise MultipleInvalid([Invalid(message, path)])
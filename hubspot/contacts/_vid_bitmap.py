@@ -0,0 +1,92 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+
+_PAGE_BIT_COUNT = 2 ** 16
+
+_PAGE_BYTE_COUNT = _PAGE_BIT_COUNT // 8
+
+
+class VidBitmap(object):
+    """
+    Set of contact VIDs stored as one bit per VID.
+    
+    The bits are kept in pages of 65,536 VIDs (8 KiB), which are only
+    allocated once a VID in their range is added. VIDs assigned sequentially
+    by HubSpot take one byte per eight VIDs, instead of the several dozen
+    bytes per VID taken by a :class:`set`, and sparse VIDs take one page each
+    at most, however high they are.
+    
+    """
+
+    def __init__(self, vids=()):
+        super(VidBitmap, self).__init__()
+
+        self._page_by_page_index = {}
+        self._vid_count = 0
+
+        for vid in vids:
+            self.add(vid)
+
+    def add(self, vid):
+        """
+        Add ``vid`` to the set.
+        
+        :return: Whether ``vid`` was not in the set already
+        :rtype: :class:`bool`
+        
+        """
+        page_index, byte_index, bit_mask = _get_bit_position(vid)
+
+        page = self._page_by_page_index.get(page_index)
+        if page is None:
+            page = bytearray(_PAGE_BYTE_COUNT)
+            self._page_by_page_index[page_index] = page
+
+        is_vid_new = not page[byte_index] & bit_mask
+        if is_vid_new:
+            page[byte_index] |= bit_mask
+            self._vid_count += 1
+        return is_vid_new
+
+    def __contains__(self, vid):
+        page_index, byte_index, bit_mask = _get_bit_position(vid)
+        page = self._page_by_page_index.get(page_index)
+        is_vid_contained = \
+            page is not None and bool(page[byte_index] & bit_mask)
+        return is_vid_contained
+
+    def __iter__(self):
+        for page_index in sorted(self._page_by_page_index):
+            page = self._page_by_page_index[page_index]
+            first_page_vid = page_index * _PAGE_BIT_COUNT
+            for byte_index, byte in enumerate(page):
+                if not byte:
+                    continue
+                for bit_index in xrange(8):
+                    if byte & (1 << bit_index):
+                        yield first_page_vid + byte_index * 8 + bit_index
+
+    def __len__(self):
+        return self._vid_count
+
+
+def _get_bit_position(vid):
+    if vid < 0:
+        raise ValueError('{!r} is not a valid VID'.format(vid))
+    page_index, page_bit_index = divmod(vid, _PAGE_BIT_COUNT)
+    byte_index, bit_index = divmod(page_bit_index, 8)
+    return page_index, byte_index, 1 << bit_index
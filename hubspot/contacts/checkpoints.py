@@ -0,0 +1,109 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Persistence of the pagination checkpoints used to resume the retrieval of
+contacts.
+
+A checkpoint is a dictionary with the pagination offsets returned by HubSpot
+along with the last page consumed (e.g., ``{'vid-offset': 1234}``). Functions
+retrieving contacts that are given a checkpoint store start from the
+checkpoint in it, if any, and keep it up-to-date as the contacts are
+consumed.
+
+"""
+
+from abc import ABCMeta
+from abc import abstractmethod
+from json import dump as json_serialize
+from json import load as json_deserialize
+from os import remove
+from os import rename
+from os.path import exists
+
+
+class CheckpointStore(object):
+    """
+    Abstract storage for the checkpoint of a single retrieval of contacts.
+    
+    A store must only be used for one kind of retrieval (e.g., all the
+    contacts in the portal) since the checkpoints from different HubSpot
+    API end-points aren't interchangeable.
+    
+    """
+
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def get_checkpoint(self):
+        """
+        Return the checkpoint previously set or ``None`` if there's none.
+        
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def set_checkpoint(self, checkpoint):
+        """
+        Replace the checkpoint in the store with ``checkpoint``.
+        
+        This is called once all the contacts in a page have been consumed.
+        
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def delete_checkpoint(self):
+        """
+        Discard the checkpoint in the store, if any.
+        
+        This is called once the retrieval has finished, so that the next one
+        starts from the beginning.
+        
+        """
+        pass  # pragma: no cover
+
+
+class FileCheckpointStore(CheckpointStore):
+    """
+    Checkpoint store backed by a JSON file at ``file_path``.
+    
+    The file is replaced atomically on POSIX systems, so the checkpoint isn't
+    lost if the process is killed whilst it's being updated.
+    
+    """
+
+    def __init__(self, file_path):
+        super(FileCheckpointStore, self).__init__()
+
+        self._file_path = file_path
+
+    def get_checkpoint(self):
+        if exists(self._file_path):
+            with open(self._file_path, 'rb') as checkpoint_file:
+                checkpoint = json_deserialize(checkpoint_file)
+        else:
+            checkpoint = None
+        return checkpoint
+
+    def set_checkpoint(self, checkpoint):
+        temporary_file_path = self._file_path + '.tmp'
+        with open(temporary_file_path, 'wb') as checkpoint_file:
+            json_serialize(checkpoint, checkpoint_file)
+        rename(temporary_file_path, self._file_path)
+
+    def delete_checkpoint(self):
+        if exists(self._file_path):
+            remove(self._file_path)
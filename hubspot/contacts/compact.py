@@ -0,0 +1,231 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Low-memory alternative to :class:`hubspot.contacts.Contact`.
+
+"""
+
+from hubspot.contacts import Contact
+
+
+class PropertyNameIndex(object):
+    """
+    Registry of the position assigned to each property name, shared by
+    :class:`CompactContact` instances.
+    
+    :param iterable property_names: The names of the properties to be
+        registered upfront
+    
+    Names are registered as they are found, so an index can be shared by
+    contacts with different properties.
+    
+    """
+
+    __slots__ = ('_property_names', '_position_by_property_name')
+
+    def __init__(self, property_names=()):
+        super(PropertyNameIndex, self).__init__()
+
+        self._property_names = []
+        self._position_by_property_name = {}
+
+        for property_name in property_names:
+            self.register_property_name(property_name)
+
+    def register_property_name(self, property_name):
+        """
+        Return the position of ``property_name``, registering it if necessary.
+        
+        """
+        position = self._position_by_property_name.get(property_name)
+        if position is None:
+            position = len(self._property_names)
+            self._property_names.append(property_name)
+            self._position_by_property_name[property_name] = position
+        return position
+
+    def get_position(self, property_name):
+        """
+        Return the position of ``property_name`` or ``None`` if it isn't
+        registered.
+        
+        """
+        return self._position_by_property_name.get(property_name)
+
+    def get_property_name(self, position):
+        """Return the name of the property registered at ``position``"""
+        return self._property_names[position]
+
+    def __len__(self):
+        return len(self._property_names)
+
+
+class CompactContact(object):
+    """
+    A HubSpot contact which takes a fraction of the memory taken by
+    :class:`~hubspot.contacts.Contact`.
+    
+    :param PropertyNameIndex property_name_index: The index to be shared with
+        other contacts, or ``None`` to use one exclusively for this contact
+    
+    The other arguments and attributes are the same as in
+    :class:`~hubspot.contacts.Contact`, except that :attr:`properties` is a
+    new dictionary each time it's accessed; changing it has no effect on the
+    contact, but a new dictionary may be assigned to it.
+    
+    Instead of a dictionary per contact, the property values are kept in a
+    tuple and their names are represented by their position in the shared
+    :class:`PropertyNameIndex`.
+    
+    """
+
+    __slots__ = (
+        'vid',
+        'email_address',
+        'related_contact_vids',
+        '_property_name_index',
+        '_property_positions_mask',
+        '_property_values',
+        )
+
+    def __init__(
+        self,
+        vid,
+        email_address,
+        properties,
+        related_contact_vids=(),
+        property_name_index=None,
+        ):
+        super(CompactContact, self).__init__()
+
+        self.vid = vid
+        self.email_address = email_address
+        self.related_contact_vids = related_contact_vids
+
+        if property_name_index is None:
+            property_name_index = PropertyNameIndex()
+        self._property_name_index = property_name_index
+        self.properties = properties
+
+    @classmethod
+    def init_from_contact(cls, contact, property_name_index=None):
+        """
+        Convert ``contact`` to a compact contact.
+        
+        :param hubspot.contacts.Contact contact: The contact to be converted
+        :param PropertyNameIndex property_name_index: The index to be shared
+            with other contacts
+        :rtype: :class:`CompactContact`
+        
+        """
+        compact_contact = cls(
+            contact.vid,
+            contact.email_address,
+            contact.properties,
+            contact.related_contact_vids,
+            property_name_index,
+            )
+        return compact_contact
+
+    def to_contact(self):
+        """
+        Convert this contact to a :class:`~hubspot.contacts.Contact`.
+        
+        """
+        contact = Contact(
+            self.vid,
+            self.email_address,
+            self.properties,
+            self.related_contact_vids,
+            )
+        return contact
+
+    @property
+    def properties(self):
+        property_name_index = self._property_name_index
+        properties = {}
+        for position, property_value in self._iter_positioned_values():
+            property_name = property_name_index.get_property_name(position)
+            properties[property_name] = property_value
+        return properties
+
+    @properties.setter
+    def properties(self, properties):
+        property_name_index = self._property_name_index
+        property_value_by_position = {}
+        for property_name, property_value in properties.iteritems():
+            position = \
+                property_name_index.register_property_name(property_name)
+            property_value_by_position[position] = property_value
+
+        property_positions = sorted(property_value_by_position)
+
+        property_positions_mask = 0
+        for position in property_positions:
+            property_positions_mask |= 1 << position
+
+        self._property_positions_mask = property_positions_mask
+        self._property_values = \
+            tuple(property_value_by_position[p] for p in property_positions)
+
+    def get_property_value(self, property_name, default=None):
+        """
+        Return the value of the property named ``property_name`` or
+        ``default`` if the contact doesn't have it.
+        
+        """
+        position = self._property_name_index.get_position(property_name)
+        if position is None:
+            return default
+
+        position_bit = 1 << position
+        if not self._property_positions_mask & position_bit:
+            return default
+
+        preceding_positions_mask = \
+            self._property_positions_mask & (position_bit - 1)
+        value_index = bin(preceding_positions_mask).count('1')
+        return self._property_values[value_index]
+
+    def _iter_positioned_values(self):
+        property_positions_mask = self._property_positions_mask
+        position = 0
+        for property_value in self._property_values:
+            while not property_positions_mask & (1 << position):
+                position += 1
+            yield position, property_value
+            position += 1
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactContact):
+            return NotImplemented
+        return self.to_contact() == other.to_contact()
+
+    def __ne__(self, other):
+        is_equal = self.__eq__(other)
+        if is_equal is NotImplemented:
+            return is_equal
+        return not is_equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}(vid={!r}, email_address={!r}, properties={!r})'.format(
+            self.__class__.__name__,
+            self.vid,
+            self.email_address,
+            self.properties,
+            )
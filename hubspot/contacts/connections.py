@@ -0,0 +1,261 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Connections to HubSpot with capabilities beyond those in
+:mod:`hubspot.connection`.
+
+Functions sending large request bodies (e.g.,
+:func:`~hubspot.contacts.save_contacts`) check whether the connection they're
+given has a ``send_serialized_post_request(url_path, body_serialization)``
+method (see :func:`can_send_serialized_bodies`), in which case they serialize
+the body themselves and pass it on as is. Otherwise, they fall back to
+``send_post_request()``.
+
+Requests to a portal can be kept within its rate limit by wrapping the
+connection in a :class:`RateLimitedPortalConnection`.
+
+"""
+
+from collections import deque
+from threading import Condition
+from time import time as get_current_time
+
+from hubspot.connection import PortalConnection
+
+
+class SerializedBodyPortalConnection(PortalConnection):
+    """
+    :class:`hubspot.connection.PortalConnection` which can send request bodies
+    that have been serialized to JSON already.
+    
+    """
+
+    def send_serialized_post_request(self, url_path, body_serialization):
+        """
+        Send a POST request to HubSpot with a body serialized to JSON.
+        
+        :param basestring url_path: The URL path to the endpoint
+        :param str body_serialization: The request's body message
+        :return: Decoded version of the ``JSON`` that HubSpot put in the body
+            of the response
+        
+        """
+        # PortalConnection has no public API for this, so its internals are
+        # used instead and hubspot-connection is pinned to 1.0.x in setup.py
+        response = self._session.request(
+            'POST',
+            self._API_URL + url_path,
+            params={'auditId': self._change_source},
+            auth=self._authentication_handler,
+            data=body_serialization,
+            headers={'content-type': 'application/json'},
+            )
+        response_body_deserialization = \
+            self._deserialize_response_body(response)
+        return response_body_deserialization
+
+
+class TokenBucketScheduler(object):
+    """
+    Scheduler for the requests sent to a portal, which keeps them within its
+    rate limit.
+    
+    :param float rate: The maximum sustained number of requests per second
+    :param int burst: The maximum number of requests that can be sent at once
+        after a period of inactivity
+    
+    A request can be sent when there's a token available in the bucket,
+    which holds up to ``burst`` tokens and gets ``rate`` new tokens per
+    second. Requests waiting for a token are served in turns across jobs,
+    and in the order in which they were made within each job, so a job
+    sending many requests concurrently doesn't hold up the rest.
+    
+    A scheduler is thread-safe and should be shared by all the
+    :class:`RateLimitedPortalConnection` instances for the same portal in a
+    process.
+    
+    """
+
+    def __init__(self, rate, burst=1):
+        super(TokenBucketScheduler, self).__init__()
+
+        if rate <= 0:
+            raise ValueError('The rate must be greater than zero')
+        if burst < 1:
+            raise ValueError('The burst must be at least one')
+
+        self._rate = float(rate)
+        self._burst = burst
+
+        self._token_count = float(burst)
+        self._last_refill_time = get_current_time()
+
+        self._condition = Condition()
+        self._tickets_by_job = {}
+        self._jobs_with_tickets = deque()
+
+    def acquire(self, job):
+        """
+        Block until ``job`` may send a request.
+        
+        :param job: The hashable identifier of the job sending the request
+        
+        """
+        ticket = object()
+        with self._condition:
+            self._enqueue_ticket(job, ticket)
+            try:
+                self._wait_for_token(ticket)
+            except BaseException:
+                # Don't let the ticket hold up the rest (e.g., on
+                # KeyboardInterrupt)
+                self._discard_ticket(job, ticket)
+                self._condition.notify_all()
+                raise
+
+            self._token_count -= 1
+            self._discard_ticket(job, ticket)
+            self._condition.notify_all()
+
+    def _wait_for_token(self, ticket):
+        while True:
+            is_ticket_next = self._get_next_ticket() is ticket
+            if is_ticket_next:
+                self._refill_tokens()
+                if 1 <= self._token_count:
+                    break
+                wait_timeout = (1 - self._token_count) / self._rate
+            else:
+                wait_timeout = None
+            self._condition.wait(wait_timeout)
+
+    def _enqueue_ticket(self, job, ticket):
+        job_tickets = self._tickets_by_job.get(job)
+        if job_tickets is None:
+            job_tickets = deque()
+            self._tickets_by_job[job] = job_tickets
+            self._jobs_with_tickets.append(job)
+        job_tickets.append(ticket)
+
+    def _get_next_ticket(self):
+        next_job = self._jobs_with_tickets[0]
+        return self._tickets_by_job[next_job][0]
+
+    def _discard_ticket(self, job, ticket):
+        job_tickets = self._tickets_by_job[job]
+        job_tickets.remove(ticket)
+
+        # The job goes to the back of the queue to let the others go first
+        self._jobs_with_tickets.remove(job)
+        if job_tickets:
+            self._jobs_with_tickets.append(job)
+        else:
+            del self._tickets_by_job[job]
+
+    def _refill_tokens(self):
+        current_time = get_current_time()
+        elapsed_time = max(current_time - self._last_refill_time, 0)
+        self._token_count = min(
+            self._burst,
+            self._token_count + elapsed_time * self._rate,
+            )
+        self._last_refill_time = current_time
+
+
+class RateLimitedPortalConnection(object):
+    """
+    Wrapper for a connection to HubSpot which waits for ``scheduler`` to
+    allow each request.
+    
+    :param connection: The connection to be wrapped
+    :param TokenBucketScheduler scheduler: The scheduler shared by all the
+        connections to the same portal
+    
+    Each wrapper is a separate job for ``scheduler``, so a wrapper should be
+    created per job (e.g., per export or synchronization) around the same
+    connection. Functions retrieving data page by page or sending it in
+    batches are slowed down accordingly, since each request blocks until
+    it's allowed.
+    
+    The wrapper supports ``send_serialized_post_request()`` if and only if
+    ``connection`` does. The property definitions cache is shared with
+    ``connection`` and the other wrappers around it, so that changes made to
+    the properties through one wrapper are seen by the rest, but any other
+    per-connection setting (e.g., the metrics sink) must be configured on
+    the wrapper.
+    
+    """
+
+    def __init__(self, connection, scheduler):
+        super(RateLimitedPortalConnection, self).__init__()
+
+        self._connection = connection
+        self._scheduler = scheduler
+
+        if can_send_serialized_bodies(connection):
+            self.send_serialized_post_request = \
+                self._send_serialized_post_request
+
+    def send_get_request(self, url_path, query_string_args=None):
+        self._scheduler.acquire(self)
+        return self._connection.send_get_request(url_path, query_string_args)
+
+    def send_post_request(self, url_path, body_deserialization):
+        self._scheduler.acquire(self)
+        return self._connection.send_post_request(
+            url_path,
+            body_deserialization,
+            )
+
+    def send_put_request(self, url_path, body_deserialization):
+        self._scheduler.acquire(self)
+        return self._connection.send_put_request(
+            url_path,
+            body_deserialization,
+            )
+
+    def send_delete_request(self, url_path):
+        self._scheduler.acquire(self)
+        return self._connection.send_delete_request(url_path)
+
+    def _send_serialized_post_request(self, url_path, body_serialization):
+        self._scheduler.acquire(self)
+        return self._connection.send_serialized_post_request(
+            url_path,
+            body_serialization,
+            )
+
+    def __enter__(self):
+        self._connection.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._connection.__exit__(exc_type, exc_value, traceback)
+
+
+def can_send_serialized_bodies(connection):
+    """
+    Report whether ``connection`` has a ``send_serialized_post_request()``
+    method.
+    
+    """
+    return hasattr(connection, 'send_serialized_post_request')
+
+
+def _get_unwrapped_connection(connection):
+    while isinstance(connection, RateLimitedPortalConnection):
+        connection = connection._connection
+    return connection
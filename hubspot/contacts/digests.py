@@ -0,0 +1,102 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Persistence of the digests of the contacts saved, used to skip the contacts
+that haven't changed since they were last saved.
+
+A digest is computed from the data sent to HubSpot for each contact (i.e.,
+its email address and properties), so changes made to a contact directly in
+HubSpot don't cause it to be saved again.
+
+"""
+
+from abc import ABCMeta
+from abc import abstractmethod
+from sqlite3 import connect as connect_to_sqlite_database
+
+
+class ContactDigestStore(object):
+    """
+    Abstract storage for the digest of the last version of each contact
+    saved, keyed by the contact's email address.
+    
+    """
+
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def get_digest(self, email_address):
+        """
+        Return the digest for the contact whose email address is
+        ``email_address`` or ``None`` if it's not in the store.
+        
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def set_digests(self, digest_by_email_address):
+        """
+        Add the digests in ``digest_by_email_address`` to the store,
+        replacing the existing digests for the same email addresses.
+        
+        This is called once each batch of contacts has been sent.
+        
+        """
+        pass  # pragma: no cover
+
+
+class SQLiteContactDigestStore(ContactDigestStore):
+    """
+    Contact digest store backed by the SQLite database at ``database_path``.
+    
+    The table is created if it doesn't exist. The digests for each batch of
+    contacts are committed at once, as soon as the batch has been sent.
+    
+    """
+
+    def __init__(self, database_path):
+        super(SQLiteContactDigestStore, self).__init__()
+
+        self._database_connection = connect_to_sqlite_database(database_path)
+        self._create_table()
+
+    def get_digest(self, email_address):
+        cursor = self._database_connection.execute(
+            'SELECT digest FROM contact_digests WHERE email_address = ?',
+            (email_address,),
+            )
+        digest_row = cursor.fetchone()
+        digest = str(digest_row[0]) if digest_row else None
+        return digest
+
+    def set_digests(self, digest_by_email_address):
+        with self._database_connection:
+            self._database_connection.executemany(
+                'INSERT OR REPLACE INTO contact_digests '
+                '(email_address, digest) VALUES (?, ?)',
+                digest_by_email_address.items(),
+                )
+
+    def close(self):
+        """Close the connection to the database"""
+        self._database_connection.close()
+
+    def _create_table(self):
+        with self._database_connection:
+            self._database_connection.execute(
+                'CREATE TABLE IF NOT EXISTS contact_digests '
+                '(email_address TEXT PRIMARY KEY, digest TEXT NOT NULL)',
+                )
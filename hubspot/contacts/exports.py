@@ -0,0 +1,145 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Export of contacts to newline-delimited JSON (NDJSON) files.
+
+Each line in an export holds one contact as a JSON object with the keys
+``vid``, ``email_address``, ``properties`` and ``related_contact_vids``.
+Property values that JSON can't represent are tagged with their type so that
+they can be loaded back losslessly:
+
+- :class:`~decimal.Decimal`: ``{"$decimal": "1.01"}``
+- :class:`~datetime.date`: ``{"$date": "2014-04-04"}``
+- :class:`~datetime.datetime`: ``{"$datetime": "2014-04-04T10:28:00.140000"}``
+
+"""
+
+from gzip import GzipFile
+
+from hubspot.contacts._constants import BATCH_RETRIEVAL_SIZE_LIMIT
+from hubspot.contacts._contact_serialization import deserialize_contact
+from hubspot.contacts._contact_serialization import serialize_contact
+from hubspot.contacts.generic_utils import ipaginate
+from hubspot.contacts.lists import get_all_contacts
+from hubspot.contacts.lists import get_all_contacts_by_last_update
+
+
+_GZIP_MAGIC_NUMBER = '\x1f\x8b'
+
+
+def export_all_contacts(
+    connection,
+    file_path,
+    property_names=(),
+    compress=False,
+    ):
+    """
+    Write all the contacts in the portal to the file at ``file_path``.
+    
+    :param iterable property_names: The names of the properties to be
+        retrieved and exported for each contact
+    :param bool compress: Whether to compress the file with gzip
+    :return: The number of contacts exported
+    :rtype: :class:`int`
+    :raises hubspot.connection.exc.HubspotException:
+    
+    The contacts are written as they are retrieved, so memory use doesn't
+    grow with the number of contacts in the portal. The file is flushed after
+    each page of contacts.
+    
+    """
+    contacts = get_all_contacts(connection, property_names)
+    contact_count = _export_contacts(contacts, file_path, compress)
+    return contact_count
+
+
+def export_all_contacts_by_last_update(
+    connection,
+    file_path,
+    property_names=(),
+    cutoff_datetime=None,
+    compress=False,
+    ):
+    """
+    Write all the contacts in the portal to the file at ``file_path``, from
+    the most recently updated to the least recently updated.
+    
+    :param iterable property_names: The names of the properties to be
+        retrieved and exported for each contact
+    :param datetime cutoff_datetime: The least recent update date to export
+    :param bool compress: Whether to compress the file with gzip
+    :return: The number of contacts exported
+    :rtype: :class:`int`
+    :raises hubspot.connection.exc.HubspotException:
+    
+    See :func:`export_all_contacts`.
+    
+    """
+    contacts = get_all_contacts_by_last_update(
+        connection,
+        property_names,
+        cutoff_datetime,
+        )
+    contact_count = _export_contacts(contacts, file_path, compress)
+    return contact_count
+
+
+def load_contacts(file_path):
+    """
+    Load the contacts exported to the file at ``file_path``.
+    
+    :return: An iterator for :class:`~hubspot.contacts.Contact` instances
+    
+    Compressed exports are detected automatically. The contacts are read
+    lazily, so the file must not be changed until the iterator is exhausted.
+    
+    """
+    with _open_export_file_for_reading(file_path) as export_file:
+        for contact_line in export_file:
+            contact = deserialize_contact(contact_line)
+            yield contact
+
+
+def _export_contacts(contacts, file_path, compress):
+    contact_count = 0
+    with _open_export_file_for_writing(file_path, compress) as export_file:
+        for contacts_page in ipaginate(contacts, BATCH_RETRIEVAL_SIZE_LIMIT):
+            for contact in contacts_page:
+                export_file.write(serialize_contact(contact))
+                export_file.write('\n')
+            export_file.flush()
+
+            contact_count += len(contacts_page)
+    return contact_count
+
+
+def _open_export_file_for_writing(file_path, compress):
+    if compress:
+        export_file = GzipFile(file_path, 'wb')
+    else:
+        export_file = open(file_path, 'wb')
+    return export_file
+
+
+def _open_export_file_for_reading(file_path):
+    with open(file_path, 'rb') as export_file:
+        magic_number = export_file.read(len(_GZIP_MAGIC_NUMBER))
+
+    if magic_number == _GZIP_MAGIC_NUMBER:
+        export_file = GzipFile(file_path, 'rb')
+    else:
+        export_file = open(file_path, 'rb')
+    return export_file
@@ -23,13 +23,27 @@ from uuid import uuid4 as get_uuid4
 
 from hubspot.contacts.exc import HubspotPropertyValueError
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 _EPOCH_DATETIME = datetime(1970, 1, 1)
 
 _EPOCH_DATE = date.fromordinal(_EPOCH_DATETIME.toordinal())
 
+_MILLISECONDS_PER_DAY = 24 * 60 * 60 * 1000
+
 
 def ipaginate(iterable, page_size):
+    # Lists are sliced directly, which is much cheaper than consuming them
+    # item by item
+    if isinstance(iterable, list):
+        for page_start in xrange(0, len(iterable), page_size):
+            yield iterable[page_start:page_start + page_size]
+        return
+
     if not isgenerator(iterable):
         iterable = iter(iterable)
 
@@ -46,6 +60,36 @@ def _get_next_page_iterable_as_list(iterable, page_size):
     return next_page_iterable
 
 
+def ipaginate_by_size(iterable, page_size, page_byte_size, get_item_byte_size):
+    """
+    Split ``iterable`` in pages of up to ``page_size`` items whose combined
+    size is up to ``page_byte_size`` bytes.
+    
+    :param callable get_item_byte_size: Function returning the size of the
+        item passed to it, in bytes
+    
+    An item larger than ``page_byte_size`` on its own is put in a page by
+    itself.
+    
+    """
+    page = []
+    page_items_byte_size = 0
+    for item in iterable:
+        item_byte_size = get_item_byte_size(item)
+        is_page_full = len(page) == page_size or \
+            page_byte_size < page_items_byte_size + item_byte_size
+        if page and is_page_full:
+            yield page
+            page = []
+            page_items_byte_size = 0
+
+        page.append(item)
+        page_items_byte_size += item_byte_size
+
+    if page:
+        yield page
+
+
 def convert_timestamp_in_milliseconds_to_datetime(timestamp_milliseconds):
     timestamp_milliseconds = int(timestamp_milliseconds)
     time_since_epoch = timedelta(milliseconds=timestamp_milliseconds)
@@ -60,6 +104,77 @@ def convert_timestamp_in_milliseconds_to_date(timestamp_milliseconds):
     return timestamp_date
 
 
+def convert_timestamps_in_milliseconds_to_datetimes(timestamps_milliseconds):
+    """
+    Convert a column of timestamps like
+    :func:`convert_timestamp_in_milliseconds_to_datetime` does, keeping any
+    ``None`` in it.
+    
+    The conversion is vectorized with NumPy, if it's available.
+    
+    """
+    if numpy:
+        datetimes = _convert_timestamps_in_milliseconds_with_numpy(
+            timestamps_milliseconds,
+            'datetime64[ms]',
+            )
+    else:
+        epoch_datetime = _EPOCH_DATETIME
+        datetimes = [
+            epoch_datetime + timedelta(milliseconds=int(t))
+            if t is not None else None
+            for t in timestamps_milliseconds
+            ]
+    return datetimes
+
+
+def convert_timestamps_in_milliseconds_to_dates(timestamps_milliseconds):
+    """
+    Convert a column of timestamps like
+    :func:`convert_timestamp_in_milliseconds_to_date` does, keeping any
+    ``None`` in it.
+    
+    The conversion is vectorized with NumPy, if it's available.
+    
+    """
+    if numpy:
+        dates = _convert_timestamps_in_milliseconds_with_numpy(
+            timestamps_milliseconds,
+            'datetime64[D]',
+            )
+    else:
+        epoch_date = _EPOCH_DATE
+        dates = [
+            epoch_date + timedelta(int(t) // _MILLISECONDS_PER_DAY)
+            if t is not None else None
+            for t in timestamps_milliseconds
+            ]
+    return dates
+
+
+def _convert_timestamps_in_milliseconds_with_numpy(
+    timestamps_milliseconds,
+    datetime64_type,
+    ):
+    timestamps_milliseconds = list(timestamps_milliseconds)
+    non_null_indices = \
+        [i for i, t in enumerate(timestamps_milliseconds) if t is not None]
+
+    timestamps_array = numpy.fromiter(
+        (int(timestamps_milliseconds[i]) for i in non_null_indices),
+        numpy.int64,
+        len(non_null_indices),
+        )
+    if datetime64_type == 'datetime64[D]':
+        timestamps_array //= _MILLISECONDS_PER_DAY
+    converted_values = timestamps_array.astype(datetime64_type).tolist()
+
+    values = [None] * len(timestamps_milliseconds)
+    for index, converted_value in zip(non_null_indices, converted_values):
+        values[index] = converted_value
+    return values
+
+
 def paginate(iterable, page_size):
     return list(ipaginate(iterable, page_size))
 
@@ -0,0 +1,125 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Timings and sizes of the requests sent to HubSpot, and of the processing of
+their responses.
+
+Metrics are only collected for the connections that have been given a
+:class:`MetricsSink` with :func:`configure_metrics_sink`. Nothing is timed
+for the rest.
+
+"""
+
+from abc import ABCMeta
+from abc import abstractmethod
+from threading import Lock
+from weakref import WeakKeyDictionary
+
+from pyrecord import Record
+
+
+PageRetrievalMetrics = Record.create_type(
+    'PageRetrievalMetrics',
+    'url_path',
+    'item_count',
+    'request_duration',
+    'validation_duration',
+    'decoding_duration',
+    )
+
+
+BatchSendingMetrics = Record.create_type(
+    'BatchSendingMetrics',
+    'url_path',
+    'item_count',
+    'byte_size',
+    'request_duration',
+    'validation_duration',
+    )
+
+
+class MetricsSink(object):
+    """
+    Abstract recipient of the metrics for the requests sent through a
+    connection.
+    
+    The methods may be called from different threads (e.g., when pages are
+    prefetched or batches are sent concurrently), so implementations must be
+    thread-safe.
+    
+    """
+
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def record_page_retrieval(self, page_retrieval_metrics):
+        """
+        Record the :class:`PageRetrievalMetrics` for a page of data.
+        
+        This is called once all the items in the page have been consumed.
+        
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def record_batch_sending(self, batch_sending_metrics):
+        """
+        Record the :class:`BatchSendingMetrics` for a batch of data.
+        
+        This is called once the batch has been sent successfully.
+        
+        """
+        pass  # pragma: no cover
+
+
+def configure_metrics_sink(connection, metrics_sink):
+    """
+    Send the metrics for the requests made through ``connection`` to
+    ``metrics_sink``.
+    
+    :param MetricsSink metrics_sink: The sink for the metrics, or ``None`` to
+        stop collecting them
+    
+    The sink is dropped along with ``connection``, so ``connection`` must
+    support weak references.
+    
+    """
+    with _METRICS_SINK_BY_CONNECTION_LOCK:
+        if metrics_sink is None:
+            _METRICS_SINK_BY_CONNECTION.pop(connection, None)
+        else:
+            _METRICS_SINK_BY_CONNECTION[connection] = metrics_sink
+
+
+def get_metrics_sink(connection):
+    """
+    Return the :class:`MetricsSink` for ``connection`` or ``None`` if it
+    hasn't got one.
+    
+    """
+    with _METRICS_SINK_BY_CONNECTION_LOCK:
+        try:
+            metrics_sink = _METRICS_SINK_BY_CONNECTION.get(connection)
+        except TypeError:
+            # The connection can't be weakly referenced, so it can't have
+            # been given a sink
+            metrics_sink = None
+    return metrics_sink
+
+
+_METRICS_SINK_BY_CONNECTION = WeakKeyDictionary()
+
+_METRICS_SINK_BY_CONNECTION_LOCK = Lock()
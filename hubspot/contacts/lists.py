@@ -14,28 +14,47 @@
 #
 ##############################################################################
 
+from array import array
+from collections import MutableMapping
 from collections import defaultdict
 from decimal import Decimal
+from functools import partial
+from itertools import chain
+from json import dumps as json_serialize
 from json import loads as json_deserialize
+from time import time as get_current_time
 
 from pyrecord import Record
 
 from hubspot.contacts import Contact
+from hubspot.contacts._concurrency import map_concurrently
+from hubspot.contacts._concurrency import require_valid_concurrency
 from hubspot.contacts._constants import BATCH_SAVING_SIZE_LIMIT
 from hubspot.contacts._constants import CONTACTS_API_SCRIPT_NAME
 from hubspot.contacts._data_retrieval import PaginatedDataRetriever
 from hubspot.contacts._property_utils import get_property_type_by_property_name
 from hubspot.contacts._schemas.contacts import CONTACT_SCHEMA
+from hubspot.contacts._schemas.contacts import validate_contact_data
 from hubspot.contacts._schemas.lists import \
     CONTACT_LIST_MEMBERSHIP_UPDATE_SCHEMA
 from hubspot.contacts._schemas.lists import CONTACT_LIST_SCHEMA
+from hubspot.contacts._vid_bitmap import VidBitmap
+from hubspot.contacts.compact import CompactContact
+from hubspot.contacts.compact import PropertyNameIndex
+from hubspot.contacts.connections import can_send_serialized_bodies
 from hubspot.contacts.generic_utils import \
     convert_date_to_timestamp_in_milliseconds
 from hubspot.contacts.generic_utils import \
     convert_timestamp_in_milliseconds_to_date
 from hubspot.contacts.generic_utils import \
     convert_timestamp_in_milliseconds_to_datetime
+from hubspot.contacts.generic_utils import \
+    convert_timestamps_in_milliseconds_to_dates
+from hubspot.contacts.generic_utils import \
+    convert_timestamps_in_milliseconds_to_datetimes
 from hubspot.contacts.generic_utils import ipaginate
+from hubspot.contacts.instrumentation import BatchSendingMetrics
+from hubspot.contacts.instrumentation import get_metrics_sink
 from hubspot.contacts.properties import BooleanProperty
 from hubspot.contacts.properties import DateProperty
 from hubspot.contacts.properties import DatetimeProperty
@@ -56,6 +75,14 @@ _PROPERTY_VALUE_CONVERTER_BY_PROPERTY_TYPE = defaultdict(
     )
 
 
+_PROPERTY_COLUMN_CONVERTER_BY_VALUE_CONVERTER = {
+    convert_timestamp_in_milliseconds_to_date:
+        convert_timestamps_in_milliseconds_to_dates,
+    convert_timestamp_in_milliseconds_to_datetime:
+        convert_timestamps_in_milliseconds_to_datetimes,
+    }
+
+
 ContactList = Record.create_type(
     'ContactList',
     'id',
@@ -64,6 +91,192 @@ ContactList = Record.create_type(
     )
 
 
+ContactListMembershipUpdateResult = Record.create_type(
+    'ContactListMembershipUpdateResult',
+    'batch_index',
+    'updated_contact_vids',
+    )
+
+
+ContactListMembershipSyncResult = Record.create_type(
+    'ContactListMembershipSyncResult',
+    'added_contact_vids',
+    'removed_contact_vids',
+    )
+
+
+ContactColumnBatch = Record.create_type(
+    'ContactColumnBatch',
+    'vids',
+    'email_addresses',
+    'property_columns',
+    )
+
+
+ContactPropertyColumn = Record.create_type(
+    'ContactPropertyColumn',
+    'values',
+    'null_bitmap',
+    )
+
+
+class ContactDecoder(object):
+    """
+    Type-caster for the property values of contacts retrieved from HubSpot.
+    
+    :param dict property_type_by_property_name: The
+        :class:`~hubspot.contacts.properties.Property` specialization for each
+        of the properties to be decoded
+    
+    The converter for each property is looked up once, when the decoder is
+    initialized, so a decoder can be reused across calls to the functions
+    retrieving contacts. Values of properties missing from
+    ``property_type_by_property_name`` are discarded.
+    
+    """
+
+    def __init__(self, property_type_by_property_name):
+        super(ContactDecoder, self).__init__()
+
+        self._converter_by_property_name = {
+            property_name: _PROPERTY_VALUE_CONVERTER_BY_PROPERTY_TYPE[type_]
+            for property_name, type_ in property_type_by_property_name.items()
+            }
+
+    def decode_properties(self, property_values):
+        """
+        Type-cast the raw ``property_values`` of a contact.
+        
+        :param dict property_values: The raw value of each property, by
+            property name
+        :rtype: :class:`dict`
+        
+        Empty values are discarded.
+        
+        """
+        converter_by_property_name = self._converter_by_property_name
+
+        properties = {}
+        for property_name, property_value in property_values.iteritems():
+            converter = converter_by_property_name.get(property_name)
+            if converter and property_value:
+                properties[property_name] = converter(property_value)
+        return properties
+
+    def decode_properties_lazily(self, property_values):
+        """
+        Like :meth:`decode_properties`, but deferring the type-casting of
+        each value until it's first accessed.
+        
+        :rtype: :class:`LazyContactProperties`
+        
+        """
+        converter_by_property_name = self._converter_by_property_name
+
+        raw_property_values = {}
+        for property_name, property_value in property_values.iteritems():
+            if property_name in converter_by_property_name and property_value:
+                raw_property_values[property_name] = property_value
+
+        properties = LazyContactProperties(
+            raw_property_values,
+            converter_by_property_name,
+            )
+        return properties
+
+    def decode_property_column(self, property_name, raw_values):
+        """
+        Type-cast the raw values of the property named ``property_name``
+        across several contacts.
+        
+        :param list raw_values: The raw value of the property for each
+            contact, or ``None`` for contacts without it
+        :return: The type-cast values, with ``None`` in place of the empty
+            values
+        :rtype: :class:`list`
+        
+        Dates and datetimes are converted by column, with NumPy if it's
+        available.
+        
+        """
+        converter = self._converter_by_property_name[property_name]
+        column_converter = \
+            _PROPERTY_COLUMN_CONVERTER_BY_VALUE_CONVERTER.get(converter)
+        if column_converter:
+            values = column_converter([v or None for v in raw_values])
+        else:
+            values = [converter(v) if v else None for v in raw_values]
+        return values
+
+    def __contains__(self, property_name):
+        return property_name in self._converter_by_property_name
+
+
+class LazyContactProperties(MutableMapping):
+    """
+    Mapping of property names to values which type-casts each raw value the
+    first time it's accessed.
+    
+    The type-cast values are memoized, so each value is type-cast once at
+    most. Values set on the mapping are stored as is.
+    
+    """
+
+    def __init__(self, raw_property_values, converter_by_property_name):
+        super(LazyContactProperties, self).__init__()
+
+        self._raw_property_values = raw_property_values
+        self._converter_by_property_name = converter_by_property_name
+        self._property_values = {}
+
+    def __getitem__(self, property_name):
+        try:
+            property_value = self._property_values[property_name]
+        except KeyError:
+            raw_property_value = self._raw_property_values[property_name]
+            converter = self._converter_by_property_name[property_name]
+            property_value = converter(raw_property_value)
+            self._property_values[property_name] = property_value
+        return property_value
+
+    def __setitem__(self, property_name, property_value):
+        self._raw_property_values[property_name] = property_value
+        self._property_values[property_name] = property_value
+
+    def __delitem__(self, property_name):
+        del self._raw_property_values[property_name]
+        self._property_values.pop(property_name, None)
+
+    def __iter__(self):
+        return iter(self._raw_property_values)
+
+    def __len__(self):
+        return len(self._raw_property_values)
+
+    def __contains__(self, property_name):
+        return property_name in self._raw_property_values
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, dict(self))
+
+
+def get_contact_decoder(connection):
+    """
+    Get a :class:`ContactDecoder` for all the properties in the portal.
+    
+    :rtype: :class:`ContactDecoder`
+    :raises hubspot.connection.exc.HubspotException:
+    
+    The decoder can be passed to the functions retrieving contacts so that
+    they don't retrieve the property definitions themselves.
+    
+    """
+    property_type_by_property_name = \
+        get_property_type_by_property_name(connection)
+    contact_decoder = ContactDecoder(property_type_by_property_name)
+    return contact_decoder
+
+
 def create_static_contact_list(contact_list_name, connection):
     """
     Create a static contact list named ``contact_list_name``.
@@ -98,9 +311,12 @@ def get_all_contact_lists(connection):
     
     """
     data_retriever = PaginatedDataRetriever('lists', ['offset'])
-    contact_lists_data = \
-        data_retriever.get_data(connection, _CONTACT_LIST_COLLECTION_URL_PATH)
-    contact_lists = _build_contact_lists_from_data(contact_lists_data)
+    contact_lists = data_retriever.get_data(
+        connection,
+        _CONTACT_LIST_COLLECTION_URL_PATH,
+        datum_validator=CONTACT_LIST_SCHEMA,
+        datum_decoder=_build_contact_list_from_validated_data,
+        )
     return contact_lists
 
 
@@ -122,14 +338,13 @@ def delete_contact_list(contact_list_id, connection):
     connection.send_delete_request(url_path)
 
 
-def _build_contact_lists_from_data(contact_lists_data):
-    for contact_list_data in contact_lists_data:
-        contact_list = _build_contact_list_from_data(contact_list_data)
-        yield contact_list
-
-
 def _build_contact_list_from_data(contact_list_data):
     contact_list_data = CONTACT_LIST_SCHEMA(contact_list_data)
+    contact_list = _build_contact_list_from_validated_data(contact_list_data)
+    return contact_list
+
+
+def _build_contact_list_from_validated_data(contact_list_data):
     contact_list = ContactList(
         contact_list_data['listId'],
         contact_list_data['name'],
@@ -138,77 +353,324 @@ def _build_contact_list_from_data(contact_list_data):
     return contact_list
 
 
-def add_contacts_to_list(contact_list, contacts, connection):
+def add_contacts_to_list(
+    contact_list,
+    contacts,
+    connection,
+    worker_count=1,
+    max_batches_in_flight=None,
+    ):
     """
     Add ``contacts`` to ``contact_list``.
     
     :param ContactList contact_list: The list to which ``contacts`` must be
         added
     :param iterator contacts: The contacts to add to ``contact_list``
+    :param int worker_count: The number of threads sending batches
+    :param int max_batches_in_flight: The maximum number of batches that have
+        been taken from ``contacts`` but not sent yet; twice ``worker_count``
+        by default
     :return: The VIDs corresponding to the contacts that were successfully
         added to the list
     :raises hubspot.connection.exc.HubspotException:
+    :raises ValueError: If ``worker_count`` or ``max_batches_in_flight`` is
+        lower than one
+    
+    If ``worker_count`` is greater than one, the batches are sent from a pool
+    of threads which share ``connection``, so it must be safe to use it
+    concurrently. The VIDs are returned in the same order regardless.
     
     End-point documentation:
     http://developers.hubspot.com/docs/methods/lists/add_contact_to_list
     
     """
-    path_info = '/lists/{}/add'.format(contact_list.id)
-    updated_contact_vids = _update_contact_list_membership(
-        CONTACTS_API_SCRIPT_NAME + path_info,
+    updated_contact_vids_by_batch = add_contacts_to_list_by_batch(
+        contact_list,
         contacts,
         connection,
+        worker_count,
+        max_batches_in_flight,
         )
+    updated_contact_vids = \
+        _join_updated_contact_vids_batches(updated_contact_vids_by_batch)
     return updated_contact_vids
 
 
-def remove_contacts_from_list(contact_list, contacts, connection):
+def add_contacts_to_list_by_batch(
+    contact_list,
+    contacts,
+    connection,
+    worker_count=1,
+    max_batches_in_flight=None,
+    ):
+    """
+    Add ``contacts`` to ``contact_list``, reporting the outcome of each batch
+    as soon as it's sent.
+    
+    :return: An iterator of :class:`ContactListMembershipUpdateResult`
+        instances, in the order in which the batches are sent
+    :raises hubspot.connection.exc.HubspotException:
+    
+    The arguments are the same as in :func:`add_contacts_to_list`. Requests
+    are sent as the iterator is consumed, so the VIDs updated don't have to
+    be held in memory all at once.
+    
+    """
+    require_valid_concurrency(worker_count, max_batches_in_flight)
+
+    path_info = '/lists/{}/add'.format(contact_list.id)
+    updated_contact_vids_by_batch = _update_contact_list_membership(
+        CONTACTS_API_SCRIPT_NAME + path_info,
+        (c.vid for c in contacts),
+        connection,
+        worker_count,
+        max_batches_in_flight,
+        )
+    return updated_contact_vids_by_batch
+
+
+def remove_contacts_from_list(
+    contact_list,
+    contacts,
+    connection,
+    worker_count=1,
+    max_batches_in_flight=None,
+    ):
     """
     Remove ``contacts`` from ``contact_list``.
     
     :param ContactList contact_list: The list from which ``contacts`` must be
         removed
     :param iterator contacts: The contacts to remove from ``contact_list``
+    :param int worker_count: The number of threads sending batches
+    :param int max_batches_in_flight: The maximum number of batches that have
+        been taken from ``contacts`` but not sent yet; twice ``worker_count``
+        by default
     :return: The VIDs corresponding to the contacts that were successfully
         removed from the list
     :raises hubspot.connection.exc.HubspotException:
     
+    Batches are sent concurrently as in :func:`add_contacts_to_list`.
+    
     End-point documentation:
     http://developers.hubspot.com/docs/methods/lists/remove_contact_from_list
     
     """
-    path_info = '/lists/{}/remove'.format(contact_list.id)
-    updated_contact_vids = _update_contact_list_membership(
-        CONTACTS_API_SCRIPT_NAME + path_info,
+    updated_contact_vids_by_batch = remove_contacts_from_list_by_batch(
+        contact_list,
         contacts,
         connection,
+        worker_count,
+        max_batches_in_flight,
         )
+    updated_contact_vids = \
+        _join_updated_contact_vids_batches(updated_contact_vids_by_batch)
     return updated_contact_vids
 
 
-def _update_contact_list_membership(endpoint_url_path, contacts, connection):
-    updated_contact_vids = []
+def remove_contacts_from_list_by_batch(
+    contact_list,
+    contacts,
+    connection,
+    worker_count=1,
+    max_batches_in_flight=None,
+    ):
+    """
+    Remove ``contacts`` from ``contact_list``, reporting the outcome of each
+    batch as soon as it's sent.
+    
+    :return: An iterator of :class:`ContactListMembershipUpdateResult`
+        instances, in the order in which the batches are sent
+    :raises hubspot.connection.exc.HubspotException:
+    
+    This is the counterpart to :func:`add_contacts_to_list_by_batch`.
+    
+    """
+    require_valid_concurrency(worker_count, max_batches_in_flight)
+
+    path_info = '/lists/{}/remove'.format(contact_list.id)
+    updated_contact_vids_by_batch = _update_contact_list_membership(
+        CONTACTS_API_SCRIPT_NAME + path_info,
+        (c.vid for c in contacts),
+        connection,
+        worker_count,
+        max_batches_in_flight,
+        )
+    return updated_contact_vids_by_batch
+
+
+def sync_static_list_membership(contact_list, desired_vids, connection):
+    """
+    Make the contacts whose VIDs are ``desired_vids`` the only members of
+    ``contact_list``.
+    
+    :param ContactList contact_list: The static list whose membership must be
+        updated
+    :param iterable desired_vids: The VIDs of all the contacts that must be
+        in ``contact_list``
+    :rtype: :class:`ContactListMembershipSyncResult`
+    :raises hubspot.connection.exc.HubspotException:
+    
+    The VIDs of the current members of ``contact_list`` are retrieved first
+    with :func:`iter_contact_vids`, so that only the contacts that must be
+    added or removed are sent to HubSpot. Contacts are added before any is
+    removed, and the VIDs in each request are sorted in ascending order.
+    
+    The VIDs are kept in paged bitmaps rather than sets, so contiguous VIDs
+    take one bit each and a VID far from the rest takes one 8 KiB page.
+    
+    """
+    current_vids_chunks = iter_contact_vids(connection, contact_list)
+    current_vids = VidBitmap(chain.from_iterable(current_vids_chunks))
+    desired_vids = VidBitmap(desired_vids)
+
+    path_info_prefix = '/lists/{}/'.format(contact_list.id)
+    added_contact_vids = _join_updated_contact_vids_batches(
+        _update_contact_list_membership(
+            CONTACTS_API_SCRIPT_NAME + path_info_prefix + 'add',
+            (vid for vid in desired_vids if vid not in current_vids),
+            connection,
+            ),
+        )
+    removed_contact_vids = _join_updated_contact_vids_batches(
+        _update_contact_list_membership(
+            CONTACTS_API_SCRIPT_NAME + path_info_prefix + 'remove',
+            (vid for vid in current_vids if vid not in desired_vids),
+            connection,
+            ),
+        )
+
+    sync_result = ContactListMembershipSyncResult(
+        added_contact_vids,
+        removed_contact_vids,
+        )
+    return sync_result
+
+
+def _update_contact_list_membership(
+    endpoint_url_path,
+    contact_vids,
+    connection,
+    worker_count=1,
+    max_batches_in_flight=None,
+    ):
+    contact_vids_batches = \
+        enumerate(ipaginate(contact_vids, BATCH_SAVING_SIZE_LIMIT))
+    send_contact_vids_batch = partial(
+        _send_contact_list_membership_update,
+        endpoint_url_path,
+        connection,
+        get_metrics_sink(connection),
+        )
+
+    if worker_count == 1:
+        for contact_vids_batch in contact_vids_batches:
+            yield send_contact_vids_batch(contact_vids_batch)
+        return
+
+    if max_batches_in_flight is None:
+        max_batches_in_flight = worker_count * 2
+
+    sent_contact_vids_batches = map_concurrently(
+        send_contact_vids_batch,
+        contact_vids_batches,
+        worker_count,
+        max_batches_in_flight,
+        )
+    for _, batch_result, exception in sent_contact_vids_batches:
+        if exception:
+            raise exception
+        yield batch_result
+
+
+def _send_contact_list_membership_update(
+    endpoint_url_path,
+    connection,
+    metrics_sink,
+    indexed_contact_vids_batch,
+    ):
+    batch_index, contact_vids_batch = indexed_contact_vids_batch
+    if can_send_serialized_bodies(connection):
+        request_body_serialization = \
+            '{"vids": [%s]}' % ', '.join(map(str, contact_vids_batch))
+        send_request = partial(
+            connection.send_serialized_post_request,
+            endpoint_url_path,
+            request_body_serialization,
+            )
+    else:
+        request_body_serialization = None
+        send_request = partial(
+            connection.send_post_request,
+            endpoint_url_path,
+            {'vids': contact_vids_batch},
+            )
+
+    if metrics_sink:
+        request_start_time = get_current_time()
+        response_data = send_request()
+        validation_start_time = get_current_time()
+        response_data = CONTACT_LIST_MEMBERSHIP_UPDATE_SCHEMA(response_data)
+        validation_end_time = get_current_time()
 
-    contacts_batches = ipaginate(contacts, BATCH_SAVING_SIZE_LIMIT)
-    for contacts_batch in contacts_batches:
-        contact_vids = [c.vid for c in contacts_batch]
-        response_data = connection.send_post_request(
+        if request_body_serialization is None:
+            request_body_serialization = \
+                json_serialize({'vids': contact_vids_batch})
+        batch_sending_metrics = BatchSendingMetrics(
             endpoint_url_path,
-            {'vids': contact_vids},
+            len(contact_vids_batch),
+            len(request_body_serialization),
+            validation_start_time - request_start_time,
+            validation_end_time - validation_start_time,
             )
+        metrics_sink.record_batch_sending(batch_sending_metrics)
+    else:
+        response_data = send_request()
         response_data = CONTACT_LIST_MEMBERSHIP_UPDATE_SCHEMA(response_data)
 
-        updated_contact_vids.extend(response_data['updated'])
+    batch_result = ContactListMembershipUpdateResult(
+        batch_index,
+        response_data['updated'],
+        )
+    return batch_result
+
 
+def _join_updated_contact_vids_batches(batch_results):
+    batch_results = sorted(batch_results, key=lambda r: r.batch_index)
+
+    updated_contact_vids = []
+    for batch_result in batch_results:
+        updated_contact_vids.extend(batch_result.updated_contact_vids)
     return updated_contact_vids
 
 
-def get_all_contacts(connection, property_names=()):
+def get_all_contacts(
+    connection,
+    property_names=(),
+    prefetch_depth=0,
+    strict_validation=True,
+    contact_decoder=None,
+    checkpoint_store=None,
+    compact=False,
+    lazy_decoding=False,
+    ):
     """
     Get all the contacts in the portal.
     
     :param property_names: The names of the properties to be retrieved for each
         contact
+    :param int prefetch_depth: The number of retrieved pages to queue ahead
+        of time from a background thread
+    :param bool strict_validation: Whether to validate each contact against
+        the full schema instead of the equivalent, faster validator
+    :param ContactDecoder contact_decoder: The decoder for the property
+        values, or ``None`` to make one from the properties in the portal
+    :param hubspot.contacts.checkpoints.CheckpointStore checkpoint_store:
+        The store for the checkpoint from which to resume the retrieval
+    :param bool compact: Whether to return
+        :class:`~hubspot.contacts.compact.CompactContact` instances instead
+    :param bool lazy_decoding: Whether to defer the type-casting of each
+        property value until it's first accessed
     :return: An iterator with :class:`Contact` instances
     :raises hubspot.connection.exc.HubspotException:
     
@@ -220,6 +682,42 @@ def get_all_contacts(connection, property_names=()):
     is used, and from there on subsequent requests may be sent as the iterator
     is consumed.
     
+    If ``prefetch_depth`` is set, pages are retrieved in a background thread
+    while the contacts in the previous page are consumed, so that the latency
+    of the requests overlaps with the processing of the contacts. Up to
+    ``prefetch_depth`` pages are queued, plus the one being retrieved, so at
+    most ``prefetch_depth + 1`` pages are held in memory ahead of the consumer.
+    Any exception raised whilst retrieving a page is re-raised when the
+    contacts in that page are due.
+    
+    ``connection`` is used from that background thread, so it must be safe to
+    use it concurrently with the calling thread.
+    
+    Each contact in the response is validated before it's used. By default,
+    this is done with a general-purpose schema; setting ``strict_validation``
+    to ``False`` uses a hand-written validator instead, which enforces the same
+    constraints at a fraction of the cost but only reports the first error
+    found.
+    
+    The property definitions in the portal are retrieved in order to
+    type-cast the property values in each contact, unless ``contact_decoder``
+    is set. A decoder from :func:`get_contact_decoder` can be reused across
+    calls in order to avoid this.
+    
+    If ``checkpoint_store`` is set, the retrieval starts from the page after
+    the last one consumed in a previous, unfinished retrieval. The checkpoint
+    in the store is updated once all the contacts in a page have been
+    consumed, and it's discarded once all the contacts have been retrieved.
+    
+    Setting ``compact`` reduces the memory used by the contacts retrieved,
+    which matters when many of them are held at once. All the contacts
+    share the same :class:`~hubspot.contacts.compact.PropertyNameIndex`.
+    
+    Setting ``lazy_decoding`` makes the properties of each contact a
+    :class:`LazyContactProperties` mapping, which saves the cost of
+    type-casting the values that are never read. It has no effect on compact
+    contacts.
+    
     Generally speaking, the contacts returned, their order and their properties
     are determined by HubSpot, with the following exceptions:
     
@@ -236,6 +734,12 @@ def get_all_contacts(connection, property_names=()):
         '/lists/all/contacts/all',
         connection,
         property_names,
+        prefetch_depth,
+        strict_validation,
+        contact_decoder,
+        checkpoint_store,
+        compact,
+        lazy_decoding,
         )
     return all_contacts
 
@@ -244,6 +748,12 @@ def get_all_contacts_by_last_update(
     connection,
     property_names=(),
     cutoff_datetime=None,
+    prefetch_depth=0,
+    strict_validation=True,
+    contact_decoder=None,
+    checkpoint_store=None,
+    compact=False,
+    lazy_decoding=False,
     ):
     """
     Get all the contacts in the portal, starting with the most recently updated
@@ -253,6 +763,18 @@ def get_all_contacts_by_last_update(
         contact
     :param datetime.datetime cutoff_datetime: The minimum datetime for the last
         update to any contact returned
+    :param int prefetch_depth: The number of retrieved pages to queue ahead
+        of time from a background thread (see :func:`get_all_contacts`)
+    :param bool strict_validation: Whether to validate each contact against
+        the full schema instead of the equivalent, faster validator
+    :param ContactDecoder contact_decoder: The decoder for the property
+        values, or ``None`` to make one from the properties in the portal
+    :param hubspot.contacts.checkpoints.CheckpointStore checkpoint_store:
+        The store for the checkpoint from which to resume the retrieval
+    :param bool compact: Whether to return
+        :class:`~hubspot.contacts.compact.CompactContact` instances instead
+    :param bool lazy_decoding: Whether to defer the type-casting of each
+        property value until it's first accessed
     :return: An iterator with :class:`Contact` instances
     :raises hubspot.connection.exc.HubspotException:
     
@@ -260,6 +782,11 @@ def get_all_contacts_by_last_update(
     time or later are returned. If unset, all the contacts are returned and
     sorted by their last update (most recent first).
     
+    Contacts that appear more than once in the response are only returned
+    once, unless the retrieval is resumed from a checkpoint: The contacts
+    returned before the checkpoint aren't persisted with it, so they may be
+    returned again after resuming.
+    
     Apart from the special considerations given to the contacts' last update
     date, this behaves exactly like :func:`get_all_contacts`. But because this
     uses a different HubSpot API end-point, the output may be slightly
@@ -276,6 +803,12 @@ def get_all_contacts_by_last_update(
         connection,
         property_names,
         cutoff_datetime,
+        prefetch_depth,
+        strict_validation,
+        contact_decoder,
+        checkpoint_store,
+        compact,
+        lazy_decoding,
         )
 
 
@@ -284,6 +817,12 @@ def get_all_contacts_from_list_by_added_date(
     connection,
     property_names=(),
     cutoff_datetime=None,
+    prefetch_depth=0,
+    strict_validation=True,
+    contact_decoder=None,
+    checkpoint_store=None,
+    compact=False,
+    lazy_decoding=False,
     ):
     """
     Get all the contacts in ``contact_list``, starting with the most recently
@@ -292,6 +831,18 @@ def get_all_contacts_from_list_by_added_date(
     :param ContactList contact_list: The list whose contacts should be retrieved
     :param property_names: The names of the properties to be retrieved for each
         contact
+    :param int prefetch_depth: The number of retrieved pages to queue ahead
+        of time from a background thread (see :func:`get_all_contacts`)
+    :param bool strict_validation: Whether to validate each contact against
+        the full schema instead of the equivalent, faster validator
+    :param ContactDecoder contact_decoder: The decoder for the property
+        values, or ``None`` to make one from the properties in the portal
+    :param hubspot.contacts.checkpoints.CheckpointStore checkpoint_store:
+        The store for the checkpoint from which to resume the retrieval
+    :param bool compact: Whether to return
+        :class:`~hubspot.contacts.compact.CompactContact` instances instead
+    :param bool lazy_decoding: Whether to defer the type-casting of each
+        property value until it's first accessed
     :return: An iterator with :class:`Contact` instances
     :raises hubspot.connection.exc.HubspotException:
     
@@ -299,6 +850,10 @@ def get_all_contacts_from_list_by_added_date(
     later are returned. If unset, all the contacts in the list are returned and
     sorted by the time they were added (most recent first).
     
+    Duplicated contacts are discarded as in
+    :func:`get_all_contacts_by_last_update`, so the same caveat applies when
+    resuming from a checkpoint.
+    
     Apart from the special considerations given to the time the contact was
     added to the list, this function behaves exactly like
     :func:`get_all_contacts_from_list`. But because this uses a different
@@ -313,6 +868,12 @@ def get_all_contacts_from_list_by_added_date(
         connection,
         property_names,
         cutoff_datetime,
+        prefetch_depth,
+        strict_validation,
+        contact_decoder,
+        checkpoint_store,
+        compact,
+        lazy_decoding,
         )
 
 
@@ -321,48 +882,113 @@ def _get_contacts_from_all_pages_by_recency(
     connection,
     property_names=(),
     cutoff_datetime=None,
+    prefetch_depth=0,
+    strict_validation=True,
+    contact_decoder=None,
+    checkpoint_store=None,
+    compact=False,
+    lazy_decoding=False,
     ):
-    contacts_data = _get_contacts_data(
-        connection,
-        '/lists/{}/contacts/recent'.format(contact_list_id),
-        ('vid-offset', 'time-offset'),
-        property_names,
-        )
+    contacts_and_added_at_timestamps = \
+        _get_contacts_and_added_at_timestamps_by_recency(
+            contact_list_id,
+            connection,
+            property_names,
+            cutoff_datetime,
+            prefetch_depth,
+            strict_validation,
+            contact_decoder,
+            checkpoint_store,
+            compact,
+            lazy_decoding,
+            )
+    for contact, _ in contacts_and_added_at_timestamps:
+        yield contact
+
 
+def _get_contacts_and_added_at_timestamps_by_recency(
+    contact_list_id,
+    connection,
+    property_names=(),
+    cutoff_datetime=None,
+    prefetch_depth=0,
+    strict_validation=True,
+    contact_decoder=None,
+    checkpoint_store=None,
+    compact=False,
+    lazy_decoding=False,
+    ):
     if cutoff_datetime:
         cutoff_timestamp = \
             convert_date_to_timestamp_in_milliseconds(cutoff_datetime)
     else:
         cutoff_timestamp = None
 
-    property_type_by_property_name = \
-        get_property_type_by_property_name(connection)
-
-    seen_contact_vids = set()
-    for contact_data in contacts_data:
-        contact = _build_contact_from_data(
-            contact_data,
-            property_type_by_property_name,
-            )
+    contact_decoder = contact_decoder or get_contact_decoder(connection)
+    build_contact = partial(
+        _build_contact_from_validated_data,
+        contact_decoder=contact_decoder,
+        contact_factory=_get_contact_factory(compact, property_names),
+        lazy_decoding=lazy_decoding,
+        )
+    all_contacts_and_added_at_timestamps = _get_contacts_data(
+        connection,
+        '/lists/{}/contacts/recent'.format(contact_list_id),
+        ('vid-offset', 'time-offset'),
+        property_names,
+        prefetch_depth,
+        checkpoint_store,
+        _get_contact_data_validator(strict_validation),
+        partial(_build_contact_and_added_at_timestamp, build_contact),
+        )
 
-        if contact.vid in seen_contact_vids:
+    seen_contact_vids = VidBitmap()
+    for contact, added_at_timestamp in all_contacts_and_added_at_timestamps:
+        if not seen_contact_vids.add(contact.vid):
             continue
 
-        seen_contact_vids.add(contact.vid)
-
-        if cutoff_timestamp and contact_data['addedAt'] < cutoff_timestamp:
+        if cutoff_timestamp and added_at_timestamp < cutoff_timestamp:
+            if checkpoint_store:
+                checkpoint_store.delete_checkpoint()
             raise StopIteration()
 
-        yield contact
+        yield contact, added_at_timestamp
 
 
-def get_all_contacts_from_list(connection, contact_list, property_names=()):
+def _build_contact_and_added_at_timestamp(build_contact, contact_data):
+    contact = build_contact(contact_data)
+    return contact, contact_data['addedAt']
+
+
+def get_all_contacts_from_list(
+    connection,
+    contact_list,
+    property_names=(),
+    prefetch_depth=0,
+    strict_validation=True,
+    contact_decoder=None,
+    checkpoint_store=None,
+    compact=False,
+    lazy_decoding=False,
+    ):
     """
     Get all the contacts in ``contact_list``.
     
     :param ContactList contact_list: The list whose contacts should be retrieved
     :param property_names: The names of the properties to be retrieved for each
         contact
+    :param int prefetch_depth: The number of retrieved pages to queue ahead
+        of time from a background thread (see :func:`get_all_contacts`)
+    :param bool strict_validation: Whether to validate each contact against
+        the full schema instead of the equivalent, faster validator
+    :param ContactDecoder contact_decoder: The decoder for the property
+        values, or ``None`` to make one from the properties in the portal
+    :param hubspot.contacts.checkpoints.CheckpointStore checkpoint_store:
+        The store for the checkpoint from which to resume the retrieval
+    :param bool compact: Whether to return
+        :class:`~hubspot.contacts.compact.CompactContact` instances instead
+    :param bool lazy_decoding: Whether to defer the type-casting of each
+        property value until it's first accessed
     :return: An iterator with :class:`Contact` instances
     :raises hubspot.connection.exc.HubspotException:
     
@@ -378,52 +1004,267 @@ def get_all_contacts_from_list(connection, contact_list, property_names=()):
         '/lists/{}/contacts/all'.format(contact_list.id),
         connection,
         property_names,
+        prefetch_depth,
+        strict_validation,
+        contact_decoder,
+        checkpoint_store,
+        compact,
+        lazy_decoding,
         )
     return contacts_from_list
 
 
-def _get_contacts_from_all_pages(path_info, connection, property_names):
-    property_type_by_property_name = \
-        get_property_type_by_property_name(connection)
+def iter_contact_vids(connection, contact_list=None, prefetch_depth=0):
+    """
+    Get the VIDs of all the contacts in ``contact_list`` or the portal.
+    
+    :param ContactList contact_list: The list whose contacts' VIDs should be
+        retrieved, or ``None`` to retrieve those of all the contacts
+    :param int prefetch_depth: The number of retrieved pages to queue ahead
+        of time from a background thread (see :func:`get_all_contacts`)
+    :return: An iterator with an :class:`array.array` of VIDs per page
+    :raises hubspot.connection.exc.HubspotException:
+    
+    This is a cheaper alternative to :func:`get_all_contacts` and
+    :func:`get_all_contacts_from_list` for when only the VIDs are needed: The
+    property definitions are not retrieved, and no contact is built or fully
+    validated. Use :func:`itertools.chain.from_iterable` to iterate over the
+    VIDs individually.
+    
+    """
+    data_retriever = PaginatedDataRetriever(
+        'contacts',
+        ['vid-offset'],
+        prefetch_depth=prefetch_depth,
+        )
+    contacts_data_by_page = data_retriever.get_data_by_page(
+        connection,
+        _get_all_contacts_url_path(contact_list),
+        )
+    for contacts_data in contacts_data_by_page:
+        yield array('l', [c['vid'] for c in contacts_data])
+
+
+def iter_contact_column_batches(
+    connection,
+    property_names=(),
+    contact_list=None,
+    prefetch_depth=0,
+    contact_decoder=None,
+    ):
+    """
+    Get all the contacts in ``contact_list`` or the portal in columns, a page
+    at a time.
+    
+    :param iterable property_names: The names of the properties to be
+        retrieved for each contact
+    :param ContactList contact_list: The list whose contacts should be
+        retrieved, or ``None`` to retrieve all the contacts
+    :param int prefetch_depth: The number of retrieved pages to queue ahead
+        of time from a background thread (see :func:`get_all_contacts`)
+    :param ContactDecoder contact_decoder: The decoder for the property values
+        or ``None`` to get one for the properties in the portal
+    :return: An iterator with a :class:`ContactColumnBatch` per page
+    :raises hubspot.connection.exc.HubspotException:
+    
+    This is an alternative to :func:`get_all_contacts` and
+    :func:`get_all_contacts_from_list` for when the contacts are to be
+    analyzed by column: The columns are built straight from the data in
+    each page, without building a :class:`~hubspot.contacts.Contact` or a
+    dictionary of properties per contact. The data isn't validated.
+    
+    Only the properties known to ``contact_decoder`` get a column.
+    
+    """
+    contact_decoder = contact_decoder or get_contact_decoder(connection)
+    column_property_names = [n for n in property_names if n in contact_decoder]
+
+    if property_names:
+        query_string_args = {'property': property_names}
+    else:
+        query_string_args = None
+
+    data_retriever = PaginatedDataRetriever(
+        'contacts',
+        ['vid-offset'],
+        prefetch_depth=prefetch_depth,
+        )
+    contacts_data_by_page = data_retriever.get_data_by_page(
+        connection,
+        _get_all_contacts_url_path(contact_list),
+        query_string_args,
+        )
+    for contacts_data in contacts_data_by_page:
+        contact_column_batch = _build_contact_column_batch(
+            contacts_data,
+            column_property_names,
+            contact_decoder,
+            )
+        yield contact_column_batch
+
+
+def _get_all_contacts_url_path(contact_list):
+    if contact_list:
+        path_info = '/lists/{}/contacts/all'.format(contact_list.id)
+    else:
+        path_info = '/lists/all/contacts/all'
+    return CONTACTS_API_SCRIPT_NAME + path_info
 
-    contacts_data = _get_contacts_data(
+
+def _build_contact_column_batch(
+    contacts_data,
+    property_names,
+    contact_decoder,
+    ):
+    vids = array('l')
+    email_addresses = []
+    raw_values_by_property_name = {n: [] for n in property_names}
+    property_names_and_raw_values = raw_values_by_property_name.items()
+    for contact_data in contacts_data:
+        vids.append(contact_data['vid'])
+
+        canonical_profile_data, _ = \
+            _get_profiles_data_from_contact_data(contact_data)
+        email_addresses.append(
+            _get_email_address_from_contact_profile_data(
+                canonical_profile_data,
+                ),
+            )
+
+        properties_data = contact_data['properties']
+        for property_name, raw_values in property_names_and_raw_values:
+            property_value_data = properties_data.get(property_name)
+            if property_value_data:
+                raw_values.append(property_value_data['value'])
+            else:
+                raw_values.append(None)
+
+    property_columns = {}
+    for property_name, raw_values in property_names_and_raw_values:
+        values = \
+            contact_decoder.decode_property_column(property_name, raw_values)
+        property_columns[property_name] = ContactPropertyColumn(
+            values,
+            _get_null_bitmap(values),
+            )
+
+    contact_column_batch = \
+        ContactColumnBatch(vids, email_addresses, property_columns)
+    return contact_column_batch
+
+
+def _get_null_bitmap(values):
+    null_bitmap = bytearray((len(values) + 7) // 8)
+    for index, value in enumerate(values):
+        if value is None:
+            null_bitmap[index // 8] |= 1 << (index % 8)
+    return null_bitmap
+
+
+def _get_contacts_from_all_pages(
+    path_info,
+    connection,
+    property_names,
+    prefetch_depth=0,
+    strict_validation=True,
+    contact_decoder=None,
+    checkpoint_store=None,
+    compact=False,
+    lazy_decoding=False,
+    ):
+    contact_decoder = contact_decoder or get_contact_decoder(connection)
+
+    contacts = _get_contacts_data(
         connection,
         path_info,
         ['vid-offset'],
         property_names,
+        prefetch_depth,
+        checkpoint_store,
+        _get_contact_data_validator(strict_validation),
+        partial(
+            _build_contact_from_validated_data,
+            contact_decoder=contact_decoder,
+            contact_factory=_get_contact_factory(compact, property_names),
+            lazy_decoding=lazy_decoding,
+            ),
         )
-
-    contacts = \
-        _build_contacts_from_data(contacts_data, property_type_by_property_name)
     return contacts
 
 
-def _get_contacts_data(connection, path_info, pagination_keys, property_names):
+def _get_contacts_data(
+    connection,
+    path_info,
+    pagination_keys,
+    property_names,
+    prefetch_depth=0,
+    checkpoint_store=None,
+    contact_data_validator=None,
+    contact_data_decoder=None,
+    ):
     if property_names:
         query_string_args = {'property': property_names}
     else:
         query_string_args = None
 
-    data_retriever = PaginatedDataRetriever('contacts', pagination_keys)
+    data_retriever = PaginatedDataRetriever(
+        'contacts',
+        pagination_keys,
+        prefetch_depth=prefetch_depth,
+        )
     url_path = CONTACTS_API_SCRIPT_NAME + path_info
-    contacts_data = \
-        data_retriever.get_data(connection, url_path, query_string_args)
+    contacts_data = data_retriever.get_data(
+        connection,
+        url_path,
+        query_string_args,
+        checkpoint_store,
+        contact_data_validator,
+        contact_data_decoder,
+        )
     return contacts_data
 
 
-def _build_contacts_from_data(contacts_data, property_type_by_property_name):
-    for contact_data in contacts_data:
-        contact = _build_contact_from_data(
-            contact_data,
-            property_type_by_property_name,
-            )
+def _get_contact_data_validator(strict_validation):
+    if strict_validation:
+        contact_data_validator = CONTACT_SCHEMA
+    else:
+        contact_data_validator = validate_contact_data
+    return contact_data_validator
 
-        yield contact
 
+def _get_contact_factory(compact, property_names):
+    if compact:
+        property_name_index = PropertyNameIndex(property_names)
+        contact_factory = \
+            partial(CompactContact, property_name_index=property_name_index)
+    else:
+        contact_factory = Contact
+    return contact_factory
+
+
+def _build_contact_from_data(
+    contact_data,
+    contact_decoder,
+    contact_data_validator=CONTACT_SCHEMA,
+    contact_factory=Contact,
+    lazy_decoding=False,
+    ):
+    contact_data = contact_data_validator(contact_data)
+    contact = _build_contact_from_validated_data(
+        contact_data,
+        contact_decoder,
+        contact_factory,
+        lazy_decoding,
+        )
+    return contact
 
-def _build_contact_from_data(contact_data, property_type_by_property_name):
-    contact_data = CONTACT_SCHEMA(contact_data)
 
+def _build_contact_from_validated_data(
+    contact_data,
+    contact_decoder,
+    contact_factory=Contact,
+    lazy_decoding=False,
+    ):
     canonical_profile_data, related_profiles_data = \
         _get_profiles_data_from_contact_data(contact_data)
     email_address = \
@@ -431,15 +1272,13 @@ def _build_contact_from_data(contact_data, property_type_by_property_name):
     related_contact_vids = \
         _get_contact_vids_from_contact_profiles_data(related_profiles_data)
 
-    properties = {}
-    for property_name, property_value in contact_data['properties'].items():
-        property_type = property_type_by_property_name.get(property_name)
-        if property_type and property_value:
-            converter = \
-                _PROPERTY_VALUE_CONVERTER_BY_PROPERTY_TYPE[property_type]
-            properties[property_name] = converter(property_value)
+    if lazy_decoding:
+        decode_properties = contact_decoder.decode_properties_lazily
+    else:
+        decode_properties = contact_decoder.decode_properties
+    properties = decode_properties(contact_data['properties'])
 
-    contact = Contact(
+    contact = contact_factory(
         contact_data['vid'],
         email_address,
         properties,
@@ -110,6 +110,8 @@ def create_property(property_, connection):
         request_body_deserialization,
     )
 
+    invalidate_property_definitions_cache(connection)
+
     property_data = CREATE_PROPERTY_RESPONSE_SCHEMA(response_data)
     created_property = _build_property_from_data(property_data)
     return created_property
@@ -130,6 +132,52 @@ def delete_property(property_name, connection):
     url_path = CONTACTS_API_SCRIPT_NAME + '/properties/' + property_name
     connection.send_delete_request(url_path)
 
+    invalidate_property_definitions_cache(connection)
+
+
+def configure_property_definitions_cache(ttl):
+    """
+    Cache the property definitions used to type-cast contact property values.
+    
+    :param int ttl: The number of seconds for which the property definitions
+        retrieved from a portal remain valid, or ``0`` to disable the cache
+    :return: ``None``
+    
+    Functions that need the type of each property (e.g.,
+    :func:`hubspot.contacts.save_contacts` or
+    :func:`hubspot.contacts.lists.get_all_contacts`) retrieve all the
+    property definitions in the portal every time they are called, unless this
+    cache is enabled.
+    
+    The cache is shared by the whole process and entries are kept per
+    connection, so connections to different portals can be used at the same
+    time. The cache is disabled by default.
+    
+    """
+    from hubspot.contacts._property_utils import PROPERTY_TYPE_CACHE
+
+    PROPERTY_TYPE_CACHE.ttl = ttl
+    PROPERTY_TYPE_CACHE.invalidate()
+
+
+def invalidate_property_definitions_cache(connection=None):
+    """
+    Discard the cached property definitions for ``connection``.
+    
+    :param connection: The connection whose cached property definitions must
+        be discarded, or ``None`` to discard those for all the connections
+    :return: ``None``
+    
+    This is done automatically by :func:`create_property` and
+    :func:`delete_property`, but property definitions changed by other means
+    (e.g., directly on HubSpot) are only picked up once their cache entry
+    expires or is discarded with this function.
+    
+    """
+    from hubspot.contacts._property_utils import PROPERTY_TYPE_CACHE
+
+    PROPERTY_TYPE_CACHE.invalidate(connection)
+
 
 def _build_property_from_data(property_data):
     property_type_name = property_data['type']
@@ -18,7 +18,10 @@ from collections import defaultdict
 from datetime import datetime
 from decimal import Decimal
 from decimal import InvalidOperation
+from hashlib import sha1
 from json import dumps as json_serialize
+from json.encoder import encode_basestring_ascii as json_serialize_string
+from operator import itemgetter
 
 from hubspot.contacts.exc import HubspotPropertyValueError
 from hubspot.contacts.generic_utils import \
@@ -40,6 +43,143 @@ def format_contacts_data_for_saving(contacts, property_type_by_property_name):
     return contacts_data
 
 
+class ContactsEncoder(object):
+    """
+    Serializer of contacts into the JSON body of a request to save them.
+    
+    :param dict property_type_by_property_name: The
+        :class:`~hubspot.contacts.properties.Property` specialization for each
+        of the properties to be encoded
+    
+    The output is the same as serializing the output of
+    :func:`format_contacts_data_for_saving`, but the JSON around each property
+    value is serialized once, when the encoder is initialized, and no
+    intermediate dictionary is built.
+    
+    """
+
+    def __init__(self, property_type_by_property_name):
+        super(ContactsEncoder, self).__init__()
+
+        self._property_encoder_by_property_name = {
+            property_name: _compile_property_encoder(property_name, type_)
+            for property_name, type_ in property_type_by_property_name.items()
+            }
+
+    def encode_contacts(self, contacts):
+        """
+        Return the JSON serialization of ``contacts``.
+        
+        :rtype: :class:`str`
+        :raises hubspot.contacts.exc.HubspotPropertyValueError: If one of the
+            property values on a contact is invalid
+        
+        """
+        encoded_contacts = [self.encode_contact(c) for c in contacts]
+        return '[' + ', '.join(encoded_contacts) + ']'
+
+    def encode_contact(self, contact):
+        """
+        Return the JSON serialization of ``contact`` on its own.
+        
+        :rtype: :class:`str`
+        :raises hubspot.contacts.exc.HubspotPropertyValueError: If one of the
+            property values on the contact is invalid
+        
+        """
+        property_encoder_by_property_name = \
+            self._property_encoder_by_property_name
+
+        encoded_properties = []
+        for property_name, property_value in contact.properties.items():
+            property_encoder = property_encoder_by_property_name[property_name]
+            encoded_properties.append(property_encoder(property_value))
+
+        if contact.email_address is None:
+            encoded_email_address = 'null'
+        else:
+            encoded_email_address = \
+                json_serialize_string(contact.email_address)
+
+        encoded_contact = '{"email": %s, "properties": [%s]}' % (
+            encoded_email_address,
+            ', '.join(encoded_properties),
+            )
+        return encoded_contact
+
+
+def _compile_property_encoder(property_name, property_type):
+    encoded_property_prefix = \
+        '{"property": %s, "value": ' % json_serialize_string(property_name)
+    encoded_empty_property = encoded_property_prefix + '""}'
+
+    converter = _PROPERTY_VALUE_CONVERTER_BY_PROPERTY_TYPE[property_type]
+    if converter is _json_serialize_to_boolean:
+        encoded_true_property = encoded_property_prefix + '"true"}'
+        encoded_false_property = encoded_property_prefix + '"false"}'
+
+        def encode_property(property_value):
+            if property_value is None:
+                encoded_property = encoded_empty_property
+            elif property_value:
+                encoded_property = encoded_true_property
+            else:
+                encoded_property = encoded_false_property
+            return encoded_property
+
+    else:
+        if converter is _identity:
+            converter = unicode
+        else:
+            converter = _compose(unicode, converter)
+
+        def encode_property(property_value):
+            if property_value is None:
+                encoded_property = encoded_empty_property
+            else:
+                encoded_property_value = \
+                    json_serialize_string(converter(property_value))
+                encoded_property = \
+                    encoded_property_prefix + encoded_property_value + '}'
+            return encoded_property
+
+    return encode_property
+
+
+def _compose(outer_function, inner_function):
+    return lambda value: outer_function(inner_function(value))
+
+
+def get_contact_data_byte_size(contact_data):
+    """
+    Return the number of bytes taken by ``contact_data`` in the body of a
+    request with a batch of contacts.
+    
+    """
+    # The separator between items in a serialized list is two bytes long
+    contact_data_byte_size = len(json_serialize(contact_data)) + 2
+    return contact_data_byte_size
+
+
+def get_contact_digest(contact, property_type_by_property_name):
+    """
+    Return a digest of the data sent to HubSpot to save ``contact``, which
+    doesn't depend on the order of its properties.
+    
+    :rtype: :class:`str`
+    :raises hubspot.contacts.exc.HubspotPropertyValueError: If one of the
+        property values on the contact is invalid
+    
+    """
+    contact_data = _format_contact_data_for_saving(
+        contact,
+        property_type_by_property_name,
+        )
+    contact_data['properties'].sort(key=itemgetter('property'))
+    contact_data_serialization = json_serialize(contact_data, sort_keys=True)
+    return sha1(contact_data_serialization).hexdigest()
+
+
 def _format_contact_data_for_saving(contact, property_type_by_property_name):
     properties_data = _format_contact_properties_for_saving(
         contact.properties,
@@ -0,0 +1,228 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Incremental synchronization of the contacts in the portal with a local store.
+
+"""
+
+from abc import ABCMeta
+from abc import abstractmethod
+from sqlite3 import connect as connect_to_sqlite_database
+
+from pyrecord import Record
+
+from hubspot.contacts._contact_serialization import deserialize_contact
+from hubspot.contacts._contact_serialization import serialize_contact
+from hubspot.contacts.generic_utils import \
+    convert_date_to_timestamp_in_milliseconds
+from hubspot.contacts.generic_utils import \
+    convert_timestamp_in_milliseconds_to_datetime
+from hubspot.contacts.lists import \
+    _get_contacts_and_added_at_timestamps_by_recency
+
+
+ContactsSyncResult = Record.create_type(
+    'ContactsSyncResult',
+    'new_contact_count',
+    'changed_contact_count',
+    'watermark',
+    )
+
+
+class ContactStore(object):
+    """
+    Abstract local copy of the contacts in a portal.
+    
+    Besides the contacts, the store keeps the watermark for the last
+    synchronization: The time of the most recent update to any contact
+    retrieved from HubSpot.
+    
+    """
+
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def get_contact(self, contact_vid):
+        """
+        Return the contact whose VID is ``contact_vid`` or ``None`` if it
+        isn't in the store.
+        
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def save_contact(self, contact):
+        """
+        Add ``contact`` to the store, replacing the contact with the same VID
+        if any.
+        
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def get_watermark(self):
+        """
+        Return the watermark as a :class:`~datetime.datetime` or ``None`` if
+        the contacts have never been synchronized.
+        
+        """
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def set_watermark(self, watermark):
+        """
+        Replace the watermark with ``watermark``.
+        
+        This is called at the end of each synchronization, once all the
+        contacts retrieved have been saved.
+        
+        """
+        pass  # pragma: no cover
+
+
+class SQLiteContactStore(ContactStore):
+    """
+    Contact store backed by the SQLite database at ``database_path``.
+    
+    The tables are created if they don't exist. The contacts saved are only
+    committed along with the watermark, so an interrupted synchronization
+    leaves the database unchanged.
+    
+    """
+
+    def __init__(self, database_path):
+        super(SQLiteContactStore, self).__init__()
+
+        self._database_connection = connect_to_sqlite_database(database_path)
+        self._create_tables()
+
+    def get_contact(self, contact_vid):
+        cursor = self._database_connection.execute(
+            'SELECT data FROM contacts WHERE vid = ?',
+            (contact_vid,),
+            )
+        contact_row = cursor.fetchone()
+        if contact_row:
+            contact = deserialize_contact(contact_row[0])
+        else:
+            contact = None
+        return contact
+
+    def save_contact(self, contact):
+        self._database_connection.execute(
+            'INSERT OR REPLACE INTO contacts (vid, data) VALUES (?, ?)',
+            (contact.vid, serialize_contact(contact)),
+            )
+
+    def get_watermark(self):
+        cursor = self._database_connection.execute(
+            'SELECT added_at FROM watermark',
+            )
+        watermark_row = cursor.fetchone()
+        if watermark_row:
+            watermark = \
+                convert_timestamp_in_milliseconds_to_datetime(watermark_row[0])
+        else:
+            watermark = None
+        return watermark
+
+    def set_watermark(self, watermark):
+        watermark_timestamp = \
+            convert_date_to_timestamp_in_milliseconds(watermark)
+        with self._database_connection:
+            self._database_connection.execute('DELETE FROM watermark')
+            self._database_connection.execute(
+                'INSERT INTO watermark (added_at) VALUES (?)',
+                (watermark_timestamp,),
+                )
+
+    def close(self):
+        """Close the connection to the database"""
+        self._database_connection.close()
+
+    def _create_tables(self):
+        with self._database_connection:
+            self._database_connection.execute(
+                'CREATE TABLE IF NOT EXISTS contacts '
+                '(vid INTEGER PRIMARY KEY, data TEXT NOT NULL)',
+                )
+            self._database_connection.execute(
+                'CREATE TABLE IF NOT EXISTS watermark '
+                '(added_at INTEGER NOT NULL)',
+                )
+
+
+def sync_contacts(connection, contact_store, property_names=()):
+    """
+    Save the contacts updated since the last synchronization in
+    ``contact_store``.
+    
+    :param ContactStore contact_store: The local copy of the contacts
+    :param iterable property_names: The names of the properties to be
+        retrieved for each contact
+    :rtype: :class:`ContactsSyncResult`
+    :raises hubspot.connection.exc.HubspotException:
+    
+    Only the contacts updated at or after the watermark in ``contact_store``
+    are retrieved, using
+    :func:`~hubspot.contacts.lists.get_all_contacts_by_last_update`. All
+    the contacts are retrieved in the first synchronization.
+    
+    Contacts deleted from HubSpot are not removed from ``contact_store``.
+    
+    """
+    watermark = contact_store.get_watermark()
+    contacts_and_added_at_timestamps = \
+        _get_contacts_and_added_at_timestamps_by_recency(
+            'recently_updated',
+            connection,
+            property_names,
+            watermark,
+            )
+
+    new_contact_count = 0
+    changed_contact_count = 0
+    latest_added_at_timestamp = None
+    for contact, added_at_timestamp in contacts_and_added_at_timestamps:
+        if latest_added_at_timestamp is None:
+            latest_added_at_timestamp = added_at_timestamp
+        else:
+            latest_added_at_timestamp = \
+                max(latest_added_at_timestamp, added_at_timestamp)
+
+        stored_contact = contact_store.get_contact(contact.vid)
+        if stored_contact == contact:
+            continue
+
+        contact_store.save_contact(contact)
+        if stored_contact:
+            changed_contact_count += 1
+        else:
+            new_contact_count += 1
+
+    if latest_added_at_timestamp is not None:
+        watermark = convert_timestamp_in_milliseconds_to_datetime(
+            latest_added_at_timestamp,
+            )
+    if watermark:
+        contact_store.set_watermark(watermark)
+
+    sync_result = ContactsSyncResult(
+        new_contact_count,
+        changed_contact_count,
+        watermark,
+        )
+    return sync_result
@@ -34,6 +34,7 @@ from hubspot.connection.testing import APICall
 from hubspot.connection.testing import SuccessfulAPICall
 from hubspot.connection.testing import UnsuccessfulAPICall
 
+from hubspot.contacts import Contact
 from hubspot.contacts._constants import BATCH_RETRIEVAL_SIZE_LIMIT
 from hubspot.contacts._constants import BATCH_SAVING_SIZE_LIMIT
 from hubspot.contacts._constants import CONTACTS_API_SCRIPT_NAME
@@ -42,10 +43,13 @@ from hubspot.contacts.generic_utils import \
 from hubspot.contacts.generic_utils import \
     convert_timestamp_in_milliseconds_to_datetime
 from hubspot.contacts.generic_utils import get_uuid4_str
+from hubspot.contacts.generic_utils import ipaginate_by_size
 from hubspot.contacts.generic_utils import paginate
 from hubspot.contacts.properties import DatetimeProperty
 from hubspot.contacts.request_data_formatters.contacts import \
     format_contacts_data_for_saving
+from hubspot.contacts.request_data_formatters.contacts import \
+    get_contact_data_byte_size
 from hubspot.contacts.request_data_formatters.properties import \
     format_data_for_property
 from hubspot.contacts.request_data_formatters.property_groups import \
@@ -559,18 +563,27 @@ class SaveContacts(object):
     
     """
 
-    def __init__(self, contacts, available_properties):
+    def __init__(
+        self,
+        contacts,
+        available_properties,
+        max_batch_byte_size=None,
+        ):
         """
         
         :param iterable contacts: Contacts to be supposedly saved
         :param iterable available_properties:
             :class:`~hubspot.contacts.properties.Property` instances for all
             the properties supposedly defined in the portal
+        :param int max_batch_byte_size: The maximum size of the body of each
+            request that :func:`~hubspot.contacts.save_contacts` is expected
+            to use, or ``None`` for no limit
         
         """
         super(SaveContacts, self).__init__()
 
         self._contacts_by_page = paginate(contacts, BATCH_SAVING_SIZE_LIMIT)
+        self._max_batch_byte_size = max_batch_byte_size
 
         self._property_type_by_property_name = \
             {p.name: p.__class__ for p in available_properties}
@@ -584,17 +597,27 @@ class SaveContacts(object):
         api_calls = self._available_properties_simulator()
 
         for batch_contacts in self._contacts_by_page:
-            request_body_deserialization = format_contacts_data_for_saving(
+            batch_contacts_data = format_contacts_data_for_saving(
                 batch_contacts,
                 self._property_type_by_property_name,
                 )
-            api_call = SuccessfulAPICall(
-                CONTACTS_API_SCRIPT_NAME + '/contact/batch/',
-                'POST',
-                request_body_deserialization=request_body_deserialization,
-                response_body_deserialization=None,
-                )
-            api_calls.append(api_call)
+            if self._max_batch_byte_size is None:
+                request_body_deserializations = [batch_contacts_data]
+            else:
+                request_body_deserializations = ipaginate_by_size(
+                    batch_contacts_data,
+                    BATCH_SAVING_SIZE_LIMIT,
+                    self._max_batch_byte_size,
+                    get_contact_data_byte_size,
+                    )
+            for request_body_deserialization in request_body_deserializations:
+                api_call = SuccessfulAPICall(
+                    CONTACTS_API_SCRIPT_NAME + '/contact/batch/',
+                    'POST',
+                    request_body_deserialization=request_body_deserialization,
+                    response_body_deserialization=None,
+                    )
+                api_calls.append(api_call)
 
         return api_calls
 
@@ -606,7 +629,7 @@ class UnsuccessfulSaveContacts(SaveContacts):
     
     """
 
-    def __init__(self, contacts, exception, available_properties):
+    def __init__(self, contacts, exception, available_properties, **kwargs):
         """
         
         :param iterable contacts: Contacts to be supposedly saved
@@ -615,10 +638,14 @@ class UnsuccessfulSaveContacts(SaveContacts):
             :class:`~hubspot.contacts.properties.Property` instances for all
             the properties supposedly defined in the portal
         
+        The remaining keyword arguments are the same as in
+        :class:`SaveContacts`.
+        
         """
         super(UnsuccessfulSaveContacts, self).__init__(
             contacts,
             available_properties,
+            **kwargs
             )
         self._exception = exception
 
@@ -1225,3 +1252,86 @@ class GetContactsFromListByAddedDate(GetAllContactsByLastUpdate):
     @property
     def _API_CALL_PATH_INFO(self):
         return self._API_CALL_PATH_INFO_TEMPLATE.format(self._contact_list.id)
+
+
+class GetContactVids(object):
+    """
+    Simulator for a successful call to
+    :func:`~hubspot.contacts.lists.iter_contact_vids`.
+    
+    """
+
+    def __init__(self, contacts, contact_list=None):
+        """
+        
+        :param iterable contacts: :class:`~hubspot.contacts.Contact` instances
+            for all the contacts supposedly in ``contact_list`` or the portal
+        :param hubspot.contacts.lists.ContactList contact_list: The list
+            that is expected to be passed to
+            :func:`~hubspot.contacts.lists.iter_contact_vids`
+        
+        """
+        super(GetContactVids, self).__init__()
+
+        if contact_list:
+            self._contacts_simulator = \
+                GetContactsFromList(contact_list, contacts, [])
+        else:
+            self._contacts_simulator = GetAllContacts(contacts, [])
+
+    def __call__(self):
+        # The property definitions are not retrieved
+        api_calls = self._contacts_simulator()[1:]
+        return api_calls
+
+
+class SyncStaticListMembership(object):
+    """
+    Simulator for a successful call to
+    :func:`~hubspot.contacts.lists.sync_static_list_membership`.
+    
+    """
+
+    def __init__(self, contact_list, current_contacts, desired_vids):
+        """
+        
+        :param hubspot.contacts.lists.ContactList contact_list: The list
+            whose membership would be supposedly synchronized
+        :param iterable current_contacts: The
+            :class:`~hubspot.contacts.Contact` instances supposedly in
+            ``contact_list``
+        :param iterable desired_vids: The VIDs that are expected to be
+            passed to
+            :func:`~hubspot.contacts.lists.sync_static_list_membership`
+        
+        All the contacts sent to HubSpot are supposedly added or removed.
+        
+        """
+        super(SyncStaticListMembership, self).__init__()
+
+        self._current_members_simulator = \
+            GetContactVids(current_contacts, contact_list)
+
+        current_vids = {c.vid for c in current_contacts}
+        desired_vids = set(desired_vids)
+        contacts_to_add = \
+            _make_contacts_from_vids(desired_vids - current_vids)
+        contacts_to_remove = \
+            _make_contacts_from_vids(current_vids - desired_vids)
+        self._contacts_addition_simulator = \
+            AddContactsToList(contact_list, contacts_to_add, contacts_to_add)
+        self._contacts_removal_simulator = RemoveContactsFromList(
+            contact_list,
+            contacts_to_remove,
+            contacts_to_remove,
+            )
+
+    def __call__(self):
+        api_calls = self._current_members_simulator()
+        api_calls.extend(self._contacts_addition_simulator())
+        api_calls.extend(self._contacts_removal_simulator())
+        return api_calls
+
+
+def _make_contacts_from_vids(vids):
+    return [Contact(vid, None, {}) for vid in sorted(vids)]
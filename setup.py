@@ -53,9 +53,10 @@ setup(
     packages=find_packages(exclude=['tests']),
     namespace_packages=['hubspot'],
     install_requires=[
-        'hubspot-connection >= 1.0rc2',
+        'hubspot-connection >= 1.0rc2, < 1.1',
         'pyrecord >= 1.0a1',
         'voluptuous == 0.8.8',
         ],
+    extras_require={'numpy': ['numpy >= 1.7']},
     test_suite='nose.collector',
     )
@@ -14,6 +14,10 @@
 #
 ##############################################################################
 
+from json import loads as json_deserialize
+
+from hubspot.connection.testing import MockPortalConnection
+
 from hubspot.contacts import Contact
 from hubspot.contacts.generic_utils import get_uuid4_str
 
@@ -34,6 +38,28 @@ def make_contact(vid, properties=None, related_contact_vids=None):
     return contact
 
 
+class SerializedBodyMockPortalConnection(MockPortalConnection):
+    """
+    Mock connection which can be sent request bodies serialized to JSON,
+    and checks them against the simulators once deserialized.
+    
+    """
+
+    def __init__(self, *api_calls_simulators):
+        super(SerializedBodyMockPortalConnection, self).__init__(
+            *api_calls_simulators
+            )
+
+        self.body_serializations = []
+
+    def send_serialized_post_request(self, url_path, body_serialization):
+        self.body_serializations.append(body_serialization)
+        return self.send_post_request(
+            url_path,
+            json_deserialize(body_serialization),
+            )
+
+
 def _get_random_email_address():
     email_user_name = get_uuid4_str()
     email_address = email_user_name + '@example.com'
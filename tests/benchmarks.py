@@ -0,0 +1,465 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Benchmarks for the hot paths in the retrieval and saving of contacts.
+
+Run them with::
+
+    python -m tests.benchmarks --contact-count 10000 --contact-count 100000
+
+Each stage runs in a forked process against a synthetic portal served by the
+simulators in :mod:`hubspot.contacts.testing`, and the following is reported:
+
+- The throughput in items (contacts, unless stated otherwise) per second.
+- The increase in the peak resident memory of the process, in KiB.
+- The net number of objects tracked by the garbage collector that the stage
+  allocated and didn't release.
+
+Stages whose name ends in "(simulated)" include the overhead of the mock
+connection checking each request.
+
+Memory is measured through ``/proc``, so the benchmarks only run on Linux.
+
+"""
+
+from argparse import ArgumentParser
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+from functools import partial
+from gc import collect as collect_garbage
+from gc import get_objects as get_gc_objects
+from os import _exit as exit_process
+from os import close
+from os import fdopen
+from os import fork
+from os import pipe
+from os import waitpid
+from pickle import dump as pickle_serialize
+from pickle import load as pickle_deserialize
+from random import Random
+from time import time as get_current_time
+
+from hubspot.connection.testing import MockPortalConnection
+
+from hubspot.contacts import Contact
+from hubspot.contacts import save_contacts
+from hubspot.contacts._constants import BATCH_SAVING_SIZE_LIMIT
+from hubspot.contacts._constants import CONTACTS_API_SCRIPT_NAME
+from hubspot.contacts._data_retrieval import PaginatedDataRetriever
+from hubspot.contacts._schemas.contacts import validate_contact_data
+from hubspot.contacts.generic_utils import ipaginate
+from hubspot.contacts.lists import ContactDecoder
+from hubspot.contacts.lists import _build_contact_from_data
+from hubspot.contacts.lists import get_all_contacts
+from hubspot.contacts.lists import iter_contact_vids
+from hubspot.contacts.properties import BooleanProperty
+from hubspot.contacts.properties import DateProperty
+from hubspot.contacts.properties import DatetimeProperty
+from hubspot.contacts.properties import EnumerationProperty
+from hubspot.contacts.properties import NumberProperty
+from hubspot.contacts.properties import StringProperty
+from hubspot.contacts.properties import get_all_properties
+from hubspot.contacts.request_data_formatters.contacts import \
+    ContactsEncoder
+from hubspot.contacts.request_data_formatters.contacts import \
+    format_contacts_data_for_saving
+from hubspot.contacts.testing import GetAllContacts
+from hubspot.contacts.testing import GetContactVids
+from hubspot.contacts.testing import SaveContacts
+
+
+_DEFAULT_CONTACT_COUNT = 10000
+
+_DEFAULT_PROPERTY_COUNT = 40
+
+_PROPERTY_FILL_RATIO = 0.7
+
+_PROPERTY_TYPES_MIX = (
+    (StringProperty, 8),
+    (EnumerationProperty, 3),
+    (NumberProperty, 3),
+    (BooleanProperty, 2),
+    (DateProperty, 2),
+    (DatetimeProperty, 2),
+    )
+
+_ENUMERATION_OPTIONS = {'gbp': 'Pound Sterling', 'eur': 'Euro', 'usd': 'USD'}
+
+_RANDOM_SEED = 1
+
+
+def main():
+    argument_parser = ArgumentParser(description=__doc__.split('\n\n')[0])
+    argument_parser.add_argument(
+        '--contact-count',
+        action='append',
+        type=int,
+        help='The number of contacts in the synthetic portal (repeatable)',
+        )
+    argument_parser.add_argument(
+        '--property-count',
+        type=int,
+        default=_DEFAULT_PROPERTY_COUNT,
+        help='The number of properties in the synthetic portal',
+        )
+    arguments = argument_parser.parse_args()
+
+    contact_counts = arguments.contact_count or [_DEFAULT_CONTACT_COUNT]
+    for contact_count in contact_counts:
+        _run_benchmarks(contact_count, arguments.property_count)
+
+
+def _run_benchmarks(contact_count, property_count):
+    random = Random(_RANDOM_SEED)
+    properties = _make_properties(property_count)
+    contacts = _make_contacts(contact_count, properties, random)
+    property_names = [p.name for p in properties]
+    property_type_by_property_name = {p.name: type(p) for p in properties}
+    contact_decoder = ContactDecoder(property_type_by_property_name)
+
+    contacts_data = _get_contacts_data(contacts, properties, property_names)
+    contacts_batches = list(ipaginate(contacts, BATCH_SAVING_SIZE_LIMIT))
+
+    stages = (
+        (
+            'PaginatedDataRetriever.get_data (simulated)',
+            partial(
+                _retrieve_contacts_data,
+                _make_contacts_retrieval_connection(
+                    contacts,
+                    properties,
+                    property_names,
+                    ),
+                property_names,
+                ),
+            ),
+        (
+            '_build_contact_from_data (strict validation)',
+            partial(
+                _build_contacts,
+                contacts_data,
+                contact_decoder,
+                ),
+            ),
+        (
+            '_build_contact_from_data (fast validation)',
+            partial(
+                _build_contacts,
+                contacts_data,
+                contact_decoder,
+                validate_contact_data,
+                ),
+            ),
+        (
+            '_build_contact_from_data (lazy decoding)',
+            partial(
+                _build_contacts,
+                contacts_data,
+                contact_decoder,
+                validate_contact_data,
+                lazy_decoding=True,
+                ),
+            ),
+        (
+            'get_all_contacts (simulated)',
+            partial(
+                _get_all_contacts,
+                MockPortalConnection(
+                    GetAllContacts(contacts, properties, property_names),
+                    ),
+                property_names,
+                ),
+            ),
+        (
+            'iter_contact_vids (simulated)',
+            partial(
+                _iter_contact_vids,
+                MockPortalConnection(GetContactVids(contacts)),
+                ),
+            ),
+        ('ipaginate', partial(_paginate_contacts, contacts)),
+        (
+            'format_contacts_data_for_saving',
+            partial(
+                _format_contacts_batches,
+                contacts_batches,
+                property_type_by_property_name,
+                ),
+            ),
+        (
+            'ContactsEncoder.encode_contacts',
+            partial(
+                _encode_contacts_batches,
+                contacts_batches,
+                ContactsEncoder(property_type_by_property_name),
+                ),
+            ),
+        (
+            'save_contacts (simulated)',
+            partial(
+                _save_contacts,
+                contacts,
+                MockPortalConnection(SaveContacts(contacts, properties)),
+                ),
+            ),
+        )
+
+    print '{} contacts, {} properties'.format(contact_count, property_count)
+    print '{:<46} {:>12} {:>12} {:>10}'.format(
+        'Stage',
+        'Items/sec',
+        'Peak KiB',
+        'Objects',
+        )
+    for stage_name, stage_function in stages:
+        stage_results = _run_stage_in_subprocess(stage_function)
+        print '{:<46} {:>12,.0f} {:>12,} {:>10,}'.format(
+            stage_name,
+            stage_results['item_count'] / stage_results['duration'],
+            stage_results['peak_memory_increase'],
+            stage_results['tracked_object_increase'],
+            )
+    print
+
+
+#{ Synthetic portal
+
+
+def _make_properties(property_count):
+    property_types = []
+    for property_type, weight in _PROPERTY_TYPES_MIX:
+        property_types.extend([property_type] * weight)
+
+    properties = []
+    for property_index in range(property_count):
+        property_type = property_types[property_index % len(property_types)]
+        property_name = 'property{}'.format(property_index)
+        if issubclass(property_type, EnumerationProperty):
+            additional_field_values = {'options': _ENUMERATION_OPTIONS}
+        else:
+            additional_field_values = {}
+        property_ = property_type(
+            property_name,
+            property_name,
+            '',
+            'benchmarks',
+            'text',
+            **additional_field_values
+            )
+        properties.append(property_)
+    return properties
+
+
+def _make_contacts(contact_count, properties, random):
+    contacts = []
+    for contact_vid in range(1, contact_count + 1):
+        contact_properties = {}
+        for property_ in properties:
+            if random.random() < _PROPERTY_FILL_RATIO:
+                contact_properties[property_.name] = \
+                    _make_property_value(property_, random)
+
+        contact = Contact(
+            contact_vid,
+            u'contact{}@example.com'.format(contact_vid),
+            contact_properties,
+            )
+        contacts.append(contact)
+    return contacts
+
+
+def _make_property_value(property_, random):
+    if isinstance(property_, EnumerationProperty):
+        property_value = random.choice(_ENUMERATION_OPTIONS.keys())
+    elif isinstance(property_, NumberProperty):
+        property_value = Decimal(random.randint(0, 10 ** 6)) / 100
+    elif isinstance(property_, BooleanProperty):
+        property_value = random.random() < 0.5
+    elif isinstance(property_, DateProperty):
+        property_value = date.fromordinal(random.randint(730000, 740000))
+    elif isinstance(property_, DatetimeProperty):
+        property_value = datetime.utcfromtimestamp(random.randint(0, 2 ** 31))
+    else:
+        property_value = u'value {}'.format(random.randint(0, 10 ** 9))
+    return property_value
+
+
+def _make_contacts_retrieval_connection(contacts, properties, property_names):
+    simulator = GetAllContacts(contacts, properties, property_names)
+    connection = MockPortalConnection(simulator)
+    get_all_properties(connection)
+    return connection
+
+
+def _get_contacts_data(contacts, properties, property_names):
+    connection = _make_contacts_retrieval_connection(
+        contacts,
+        properties,
+        property_names,
+        )
+    contacts_data = list(_iter_contacts_data(connection, property_names))
+    return contacts_data
+
+
+#{ Stages
+
+
+def _retrieve_contacts_data(connection, property_names):
+    item_count = 0
+    for _ in _iter_contacts_data(connection, property_names):
+        item_count += 1
+    return item_count
+
+
+def _iter_contacts_data(connection, property_names):
+    data_retriever = PaginatedDataRetriever('contacts', ['vid-offset'])
+    contacts_data = data_retriever.get_data(
+        connection,
+        CONTACTS_API_SCRIPT_NAME + '/lists/all/contacts/all',
+        {'property': property_names},
+        )
+    return contacts_data
+
+
+def _build_contacts(
+    contacts_data,
+    contact_decoder,
+    *contact_data_validator,
+    **kwargs
+    ):
+    for contact_data in contacts_data:
+        _build_contact_from_data(
+            contact_data,
+            contact_decoder,
+            *contact_data_validator,
+            **kwargs
+            )
+    return len(contacts_data)
+
+
+def _get_all_contacts(connection, property_names):
+    item_count = 0
+    for _ in get_all_contacts(connection, property_names):
+        item_count += 1
+    return item_count
+
+
+def _iter_contact_vids(connection):
+    item_count = 0
+    for contact_vids in iter_contact_vids(connection):
+        item_count += len(contact_vids)
+    return item_count
+
+
+def _paginate_contacts(contacts):
+    for _ in ipaginate(contacts, BATCH_SAVING_SIZE_LIMIT):
+        pass
+    return len(contacts)
+
+
+def _format_contacts_batches(contacts_batches, property_type_by_property_name):
+    item_count = 0
+    for contacts_batch in contacts_batches:
+        format_contacts_data_for_saving(
+            contacts_batch,
+            property_type_by_property_name,
+            )
+        item_count += len(contacts_batch)
+    return item_count
+
+
+def _encode_contacts_batches(contacts_batches, contacts_encoder):
+    item_count = 0
+    for contacts_batch in contacts_batches:
+        contacts_encoder.encode_contacts(contacts_batch)
+        item_count += len(contacts_batch)
+    return item_count
+
+
+def _save_contacts(contacts, connection):
+    save_contacts(contacts, connection)
+    return len(contacts)
+
+
+#{ Measurement
+
+
+def _run_stage_in_subprocess(stage_function):
+    """
+    Run ``stage_function`` in a child process, so that the peak memory of each
+    stage can be measured in isolation.
+    
+    """
+    read_file_descriptor, write_file_descriptor = pipe()
+
+    process_id = fork()
+    if process_id == 0:
+        close(read_file_descriptor)
+        with fdopen(write_file_descriptor, 'wb') as results_file:
+            pickle_serialize(_measure_stage(stage_function), results_file)
+        exit_process(0)
+
+    close(write_file_descriptor)
+    with fdopen(read_file_descriptor, 'rb') as results_file:
+        stage_results = pickle_deserialize(results_file)
+    waitpid(process_id, 0)
+
+    return stage_results
+
+
+def _measure_stage(stage_function):
+    collect_garbage()
+    initial_tracked_object_count = len(get_gc_objects())
+    _reset_peak_memory()
+    initial_memory = _get_memory_status_value('VmRSS')
+
+    start_time = get_current_time()
+    item_count = stage_function()
+    duration = get_current_time() - start_time
+
+    peak_memory = _get_memory_status_value('VmHWM')
+    collect_garbage()
+    tracked_object_count = len(get_gc_objects())
+
+    stage_results = {
+        'item_count': item_count,
+        'duration': duration,
+        'peak_memory_increase': max(peak_memory - initial_memory, 0),
+        'tracked_object_increase':
+            tracked_object_count - initial_tracked_object_count,
+        }
+    return stage_results
+
+
+def _reset_peak_memory():
+    with open('/proc/self/clear_refs', 'w') as clear_refs_file:
+        clear_refs_file.write('5')
+
+
+def _get_memory_status_value(status_key):
+    """Return the value of ``status_key`` for the current process in KiB"""
+    with open('/proc/self/status') as status_file:
+        for status_line in status_file:
+            if status_line.startswith(status_key + ':'):
+                return int(status_line.split()[1])
+
+
+#}
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+
+from os import listdir
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from nose.tools import eq_
+
+from hubspot.contacts.checkpoints import FileCheckpointStore
+
+
+class TestFileCheckpointStore(object):
+
+    def setup(self):
+        self._directory_path = mkdtemp()
+        file_path = path.join(self._directory_path, 'checkpoint.json')
+        self._checkpoint_store = FileCheckpointStore(file_path)
+
+    def teardown(self):
+        rmtree(self._directory_path)
+
+    def test_no_checkpoint(self):
+        eq_(None, self._checkpoint_store.get_checkpoint())
+
+    def test_setting_checkpoint(self):
+        checkpoint = {'vid-offset': 1, 'time-offset': 2}
+        self._checkpoint_store.set_checkpoint(checkpoint)
+
+        eq_(checkpoint, self._checkpoint_store.get_checkpoint())
+        eq_(['checkpoint.json'], listdir(self._directory_path))
+
+    def test_replacing_checkpoint(self):
+        self._checkpoint_store.set_checkpoint({'vid-offset': 1})
+        self._checkpoint_store.set_checkpoint({'vid-offset': 2})
+
+        eq_({'vid-offset': 2}, self._checkpoint_store.get_checkpoint())
+
+    def test_deleting_checkpoint(self):
+        self._checkpoint_store.set_checkpoint({'vid-offset': 1})
+        self._checkpoint_store.delete_checkpoint()
+
+        eq_(None, self._checkpoint_store.get_checkpoint())
+
+    def test_deleting_non_existing_checkpoint(self):
+        self._checkpoint_store.delete_checkpoint()
+
+        eq_(None, self._checkpoint_store.get_checkpoint())
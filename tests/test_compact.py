@@ -0,0 +1,152 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from sys import getsizeof
+
+from nose.tools import assert_is_none
+from nose.tools import assert_not_equal
+from nose.tools import eq_
+from nose.tools import ok_
+
+from hubspot.contacts.compact import CompactContact
+from hubspot.contacts.compact import PropertyNameIndex
+
+from tests._utils import make_contact
+
+
+class TestPropertyNameIndex(object):
+
+    def test_registering_new_property_name(self):
+        property_name_index = PropertyNameIndex(['foo'])
+
+        eq_(1, property_name_index.register_property_name('bar'))
+        eq_(1, property_name_index.get_position('bar'))
+        eq_('bar', property_name_index.get_property_name(1))
+        eq_(2, len(property_name_index))
+
+    def test_registering_existing_property_name(self):
+        property_name_index = PropertyNameIndex(['foo', 'bar'])
+
+        eq_(0, property_name_index.register_property_name('foo'))
+        eq_(2, len(property_name_index))
+
+    def test_unregistered_property_name(self):
+        property_name_index = PropertyNameIndex()
+
+        assert_is_none(property_name_index.get_position('foo'))
+
+
+class TestCompactContact(object):
+
+    def test_conversion_from_and_to_contact(self):
+        contact = make_contact(
+            1,
+            {'foo': 'bar', 'baz': None},
+            related_contact_vids=[2],
+            )
+
+        compact_contact = CompactContact.init_from_contact(contact)
+
+        eq_(contact.vid, compact_contact.vid)
+        eq_(contact.email_address, compact_contact.email_address)
+        eq_(contact.properties, compact_contact.properties)
+        eq_(contact.related_contact_vids, compact_contact.related_contact_vids)
+        eq_(contact, compact_contact.to_contact())
+
+    def test_no_properties(self):
+        compact_contact = CompactContact(1, None, {})
+
+        eq_({}, compact_contact.properties)
+        assert_is_none(compact_contact.get_property_value('foo'))
+
+    def test_getting_property_value(self):
+        property_name_index = PropertyNameIndex(['a', 'b', 'c', 'd'])
+        compact_contact = CompactContact(
+            1,
+            None,
+            {'d': 4, 'b': 2},
+            property_name_index=property_name_index,
+            )
+
+        eq_(2, compact_contact.get_property_value('b'))
+        eq_(4, compact_contact.get_property_value('d'))
+        assert_is_none(compact_contact.get_property_value('c'))
+        eq_(0, compact_contact.get_property_value('e', 0))
+
+    def test_replacing_properties(self):
+        compact_contact = CompactContact(1, None, {'foo': 1})
+
+        compact_contact.properties = {'bar': 2}
+
+        eq_({'bar': 2}, compact_contact.properties)
+
+    def test_mutating_properties(self):
+        compact_contact = CompactContact(1, None, {'foo': 1})
+
+        compact_contact.properties['foo'] = 2
+
+        eq_({'foo': 1}, compact_contact.properties)
+
+    def test_shared_property_name_index(self):
+        property_name_index = PropertyNameIndex()
+        compact_contact1 = CompactContact(
+            1,
+            None,
+            {'foo': 1},
+            property_name_index=property_name_index,
+            )
+        compact_contact2 = CompactContact(
+            2,
+            None,
+            {'bar': 2, 'foo': 3},
+            property_name_index=property_name_index,
+            )
+
+        eq_(2, len(property_name_index))
+        eq_({'foo': 1}, compact_contact1.properties)
+        eq_({'bar': 2, 'foo': 3}, compact_contact2.properties)
+
+    def test_equality(self):
+        contact = make_contact(1, {'foo': 'bar'})
+
+        compact_contact1 = CompactContact.init_from_contact(contact)
+        compact_contact2 = CompactContact.init_from_contact(
+            contact,
+            PropertyNameIndex(['baz', 'foo']),
+            )
+
+        eq_(compact_contact1, compact_contact2)
+        ok_(not compact_contact1 != compact_contact2)
+
+        compact_contact2.properties = {'foo': 'baz'}
+        assert_not_equal(compact_contact1, compact_contact2)
+
+    def test_memory_footprint(self):
+        property_names = ['property{}'.format(i) for i in range(10)]
+        properties = {n: u'value' for n in property_names}
+        contact = make_contact(1, properties)
+
+        compact_contact = CompactContact.init_from_contact(
+            contact,
+            PropertyNameIndex(property_names),
+            )
+
+        contact_size = getsizeof(contact) + \
+            getsizeof(contact.__dict__) + \
+            getsizeof(contact.properties)
+        compact_contact_size = getsizeof(compact_contact) + \
+            getsizeof(compact_contact._property_values)
+        ok_(compact_contact_size < contact_size)
@@ -0,0 +1,217 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+
+from threading import Lock
+from threading import Thread
+from time import sleep
+from time import time as get_current_time
+
+from hubspot.connection import APIKey
+from hubspot.connection.testing import MockPortalConnection
+from nose.tools import assert_false
+from nose.tools import assert_raises
+from nose.tools import eq_
+from nose.tools import ok_
+from requests.models import Response
+
+from hubspot.contacts.connections import RateLimitedPortalConnection
+from hubspot.contacts.connections import SerializedBodyPortalConnection
+from hubspot.contacts.connections import TokenBucketScheduler
+from hubspot.contacts.connections import can_send_serialized_bodies
+from hubspot.contacts.lists import ContactList
+from hubspot.contacts.lists import add_contacts_to_list
+from hubspot.contacts.lists import get_all_contact_lists
+from hubspot.contacts.testing import AddContactsToList
+from hubspot.contacts.testing import GetAllContactLists
+
+from tests._utils import SerializedBodyMockPortalConnection
+from tests._utils import make_contacts
+
+
+_STUB_URL_PATH = '/foo'
+
+_STUB_BODY_SERIALIZATION = '{"vids": [1, 2]}'
+
+_PORTAL_CONNECTION_INTERNAL_ATTRIBUTE_NAMES = (
+    '_API_URL',
+    '_authentication_handler',
+    '_change_source',
+    '_deserialize_response_body',
+    '_session',
+    )
+
+
+class TestSerializedBodyPortalConnection(object):
+
+    def setup(self):
+        self.session = _MockSession()
+
+        self.connection = SerializedBodyPortalConnection(APIKey('key'), 'test')
+        self.connection._session = self.session
+
+    def test_body_sent_as_is(self):
+        response_body_deserialization = \
+            self.connection.send_serialized_post_request(
+                _STUB_URL_PATH,
+                _STUB_BODY_SERIALIZATION,
+                )
+
+        eq_(None, response_body_deserialization)
+
+        request_args, request_kwargs = self.session.requests[0]
+        eq_(('POST', 'https://api.hubapi.com' + _STUB_URL_PATH), request_args)
+        eq_(_STUB_BODY_SERIALIZATION, request_kwargs['data'])
+        eq_(
+            {'content-type': 'application/json'},
+            request_kwargs['headers'],
+            )
+        eq_({'auditId': 'test'}, request_kwargs['params'])
+        ok_(request_kwargs['auth'])
+
+
+    def test_portal_connection_internals(self):
+        connection = SerializedBodyPortalConnection(APIKey('key'), 'test')
+
+        for attribute_name in _PORTAL_CONNECTION_INTERNAL_ATTRIBUTE_NAMES:
+            ok_(hasattr(connection, attribute_name), attribute_name)
+
+
+class TestTokenBucketScheduler(object):
+
+    def test_invalid_rate(self):
+        with assert_raises(ValueError):
+            TokenBucketScheduler(0)
+
+    def test_invalid_burst(self):
+        with assert_raises(ValueError):
+            TokenBucketScheduler(1, 0)
+
+    def test_burst(self):
+        scheduler = TokenBucketScheduler(1, 3)
+
+        start_time = get_current_time()
+        for _ in range(3):
+            scheduler.acquire('job')
+
+        ok_(get_current_time() - start_time < 0.5)
+
+    def test_rate(self):
+        scheduler = TokenBucketScheduler(50)
+
+        start_time = get_current_time()
+        for _ in range(4):
+            scheduler.acquire('job')
+
+        ok_(0.05 <= get_current_time() - start_time)
+
+    def test_fair_queuing(self):
+        scheduler = TokenBucketScheduler(20)
+        scheduler.acquire('busy job')
+
+        acquired_jobs = []
+        acquired_jobs_lock = Lock()
+
+        def acquire(job):
+            scheduler.acquire(job)
+            with acquired_jobs_lock:
+                acquired_jobs.append(job)
+
+        threads = \
+            [Thread(target=acquire, args=('busy job',)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        _wait_for_waiting_ticket_count(scheduler, 'busy job', 3)
+
+        thread = Thread(target=acquire, args=('other job',))
+        thread.start()
+        threads.append(thread)
+
+        for thread in threads:
+            thread.join()
+
+        eq_('other job', acquired_jobs[1])
+
+
+class TestRateLimitedPortalConnection(object):
+
+    _STUB_CONTACT_LIST = ContactList(1, 'atestlist', False)
+
+    def test_requests(self):
+        contacts = make_contacts(1)
+
+        simulators = [
+            GetAllContactLists([self._STUB_CONTACT_LIST]),
+            AddContactsToList(self._STUB_CONTACT_LIST, contacts, contacts),
+            ]
+        connection = MockPortalConnection(*simulators)
+        scheduler = TokenBucketScheduler(100)
+        with RateLimitedPortalConnection(connection, scheduler) as \
+                rate_limited_connection:
+            list(get_all_contact_lists(rate_limited_connection))
+            add_contacts_to_list(
+                self._STUB_CONTACT_LIST,
+                contacts,
+                rate_limited_connection,
+                )
+
+    def test_serialized_bodies(self):
+        contacts = make_contacts(1)
+
+        simulator = \
+            AddContactsToList(self._STUB_CONTACT_LIST, contacts, contacts)
+        connection = SerializedBodyMockPortalConnection(simulator)
+        scheduler = TokenBucketScheduler(100)
+        with RateLimitedPortalConnection(connection, scheduler) as \
+                rate_limited_connection:
+            add_contacts_to_list(
+                self._STUB_CONTACT_LIST,
+                contacts,
+                rate_limited_connection,
+                )
+
+        eq_(1, len(connection.body_serializations))
+
+    def test_serialized_bodies_unsupported(self):
+        scheduler = TokenBucketScheduler(100)
+        rate_limited_connection = \
+            RateLimitedPortalConnection(MockPortalConnection(), scheduler)
+
+        assert_false(can_send_serialized_bodies(rate_limited_connection))
+
+
+def _wait_for_waiting_ticket_count(scheduler, job, ticket_count):
+    while True:
+        with scheduler._condition:
+            job_tickets = scheduler._tickets_by_job.get(job, ())
+            if ticket_count <= len(job_tickets):
+                break
+        sleep(0.001)
+
+
+class _MockSession(object):
+
+    def __init__(self):
+        super(_MockSession, self).__init__()
+
+        self.requests = []
+
+    def request(self, *args, **kwargs):
+        self.requests.append((args, kwargs))
+
+        response = Response()
+        response.status_code = 204
+        return response
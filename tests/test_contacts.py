@@ -18,19 +18,35 @@
 from datetime import date
 from datetime import datetime
 from decimal import Decimal
+from json import dumps as json_serialize
+from json import loads as json_deserialize
+from threading import Lock
+from time import sleep
 
 from hubspot.connection.exc import HubspotServerError
 from hubspot.connection.testing import MockPortalConnection
 from nose.tools import assert_raises
 from nose.tools import assert_raises_regexp
 from nose.tools import eq_
+from nose.tools import ok_
 
+from hubspot.contacts import ContactsBatchSavingResult
 from hubspot.contacts import save_contacts
+from hubspot.contacts import save_contacts_concurrently
 from hubspot.contacts._constants import BATCH_SAVING_SIZE_LIMIT
+from hubspot.contacts.digests import SQLiteContactDigestStore
 from hubspot.contacts.exc import HubspotPropertyValueError
+from hubspot.contacts.request_data_formatters.contacts import \
+    ContactsEncoder
+from hubspot.contacts.request_data_formatters.contacts import \
+    format_contacts_data_for_saving
+from hubspot.contacts.request_data_formatters.contacts import \
+    get_contact_digest
+from hubspot.contacts.testing import GetAllProperties
 from hubspot.contacts.testing import SaveContacts
 from hubspot.contacts.testing import UnsuccessfulSaveContacts
 
+from tests._utils import SerializedBodyMockPortalConnection
 from tests._utils import make_contact
 from tests._utils import make_contacts
 from tests.test_properties import STUB_BOOLEAN_PROPERTY
@@ -54,6 +70,134 @@ class TestSavingContacts(object):
         contacts = make_contacts(BATCH_SAVING_SIZE_LIMIT + 1)
         self._check_saved_contacts_match(contacts)
 
+    def test_exceeding_batch_byte_size_limit(self):
+        contacts = make_contacts(3)
+        max_batch_byte_size = _get_contacts_byte_size(contacts[:2])
+
+        simulator = SaveContacts(
+            contacts,
+            [STUB_STRING_PROPERTY],
+            max_batch_byte_size,
+            )
+        with MockPortalConnection(simulator) as connection:
+            save_contacts(contacts, connection, max_batch_byte_size)
+
+        saving_api_calls = connection.api_calls[1:]
+        eq_(
+            [2, 1],
+            [len(c.request_body_deserialization) for c in saving_api_calls],
+            )
+        for api_call in saving_api_calls:
+            request_body = json_serialize(api_call.request_body_deserialization)
+            ok_(len(request_body) <= max_batch_byte_size)
+
+    def test_no_batch_byte_size_limit_by_default(self):
+        contacts = make_contacts(2)
+        for contact in contacts:
+            contact.properties = {STUB_STRING_PROPERTY.name: 'a' * 2 ** 20}
+
+        simulator = SaveContacts(contacts, [STUB_STRING_PROPERTY])
+        with MockPortalConnection(simulator) as connection:
+            save_contacts(contacts, connection)
+
+        eq_(2, len(connection.api_calls))
+
+    def test_contact_exceeding_batch_byte_size_limit(self):
+        contacts = make_contacts(2)
+
+        simulator = SaveContacts(contacts, [STUB_STRING_PROPERTY], 1)
+        with MockPortalConnection(simulator) as connection:
+            save_contacts(contacts, connection, 1)
+
+    def test_serialized_bodies(self):
+        contacts = make_contacts(BATCH_SAVING_SIZE_LIMIT + 1)
+        contacts[0].properties = {STUB_NUMBER_PROPERTY.name: Decimal('1.5')}
+
+        simulator = SaveContacts(contacts, [STUB_NUMBER_PROPERTY])
+        with SerializedBodyMockPortalConnection(simulator) as connection:
+            save_contacts(contacts, connection)
+
+        eq_(2, len(connection.body_serializations))
+
+    def test_serialized_bodies_exceeding_batch_byte_size_limit(self):
+        contacts = make_contacts(3)
+        max_batch_byte_size = _get_contacts_byte_size(contacts[:2])
+
+        simulator = SaveContacts(
+            contacts,
+            [STUB_STRING_PROPERTY],
+            max_batch_byte_size,
+            )
+        with SerializedBodyMockPortalConnection(simulator) as connection:
+            save_contacts(contacts, connection, max_batch_byte_size)
+
+        body_serializations = connection.body_serializations
+        eq_(2, len(body_serializations))
+        ok_(all(len(b) <= max_batch_byte_size for b in body_serializations))
+
+    def test_contact_digests(self):
+        contacts = make_contacts(2)
+        contact_digest_store = SQLiteContactDigestStore(':memory:')
+
+        with self._make_connection_for_contacts(contacts) as connection:
+            save_contacts(
+                contacts,
+                connection,
+                contact_digest_store=contact_digest_store,
+                )
+
+        for contact in contacts:
+            ok_(contact_digest_store.get_digest(contact.email_address))
+
+    def test_unchanged_contacts(self):
+        contacts = make_contacts(2)
+        contact_digest_store = SQLiteContactDigestStore(':memory:')
+
+        with self._make_connection_for_contacts(contacts) as connection:
+            save_contacts(
+                contacts,
+                connection,
+                contact_digest_store=contact_digest_store,
+                )
+
+        simulator = GetAllProperties([STUB_STRING_PROPERTY])
+        with MockPortalConnection(simulator) as connection:
+            save_contacts(
+                contacts,
+                connection,
+                contact_digest_store=contact_digest_store,
+                )
+
+    def test_changed_contacts(self):
+        contacts = make_contacts(BATCH_SAVING_SIZE_LIMIT + 1)
+        contact_digest_store = SQLiteContactDigestStore(':memory:')
+
+        with self._make_connection_for_contacts(contacts) as connection:
+            save_contacts(
+                contacts,
+                connection,
+                contact_digest_store=contact_digest_store,
+                )
+
+        changed_contacts = [contacts[0], contacts[-1]]
+        for contact in changed_contacts:
+            contact.properties = {STUB_STRING_PROPERTY.name: 'changed'}
+        unchanged_contact_digest = \
+            contact_digest_store.get_digest(contacts[1].email_address)
+
+        connection = self._make_connection_for_contacts(changed_contacts)
+        with connection:
+            save_contacts(
+                contacts,
+                connection,
+                contact_digest_store=contact_digest_store,
+                )
+
+        eq_(
+            unchanged_contact_digest,
+            contact_digest_store.get_digest(contacts[1].email_address),
+            )
+
     def test_contacts_as_a_generator(self):
         contacts = make_contacts(BATCH_SAVING_SIZE_LIMIT)
         connection = self._make_connection_for_contacts(contacts)
@@ -203,6 +347,51 @@ class TestUnsuccessfullySavingContacts(object):
 
         eq_(self._STUB_EXCEPTION, context_manager.exception)
 
+    def test_contact_digests(self):
+        contacts = make_contacts(1)
+        contact_digest_store = SQLiteContactDigestStore(':memory:')
+
+        with self._make_connection_for_contacts(contacts) as connection:
+            with assert_raises(HubspotServerError):
+                save_contacts(
+                    contacts,
+                    connection,
+                    contact_digest_store=contact_digest_store,
+                    )
+
+        eq_(None, contact_digest_store.get_digest(contacts[0].email_address))
+
+    def test_contact_digests_with_duplicated_contact(self):
+        contact = make_contact(1)
+        changed_contact = contact.copy()
+        changed_contact.properties = {STUB_STRING_PROPERTY.name: 'changed'}
+        contacts = [contact, changed_contact]
+        max_batch_byte_size = _get_contacts_byte_size([contact])
+        contact_digest_store = SQLiteContactDigestStore(':memory:')
+
+        simulator = UnsuccessfulSaveContacts(
+            contacts,
+            self._STUB_EXCEPTION,
+            [STUB_STRING_PROPERTY],
+            max_batch_byte_size=max_batch_byte_size,
+            )
+        with MockPortalConnection(simulator) as connection:
+            with assert_raises(HubspotServerError):
+                save_contacts(
+                    contacts,
+                    connection,
+                    max_batch_byte_size,
+                    contact_digest_store,
+                    )
+
+        eq_(
+            get_contact_digest(
+                contact,
+                {STUB_STRING_PROPERTY.name: STUB_STRING_PROPERTY.__class__},
+                ),
+            contact_digest_store.get_digest(contact.email_address),
+            )
+
     @classmethod
     def _make_connection_for_contacts(cls, contacts):
         simulator = UnsuccessfulSaveContacts(
@@ -212,3 +401,247 @@ class TestUnsuccessfullySavingContacts(object):
             )
         connection = MockPortalConnection(simulator)
         return connection
+
+
+class TestSavingContactsConcurrently(object):
+
+    _STUB_EXCEPTION = HubspotServerError('Internal server error', 500)
+
+    def test_no_contacts(self):
+        connection = MockPortalConnection(SaveContacts([], []))
+        with connection:
+            batch_results = save_contacts_concurrently([], connection)
+
+        eq_([], batch_results)
+
+    def test_exceeding_batch_size_limit(self):
+        contacts = make_contacts(BATCH_SAVING_SIZE_LIMIT + 1)
+        simulator = SaveContacts(contacts, [STUB_STRING_PROPERTY])
+        with MockPortalConnection(simulator) as connection:
+            batch_results = \
+                save_contacts_concurrently(contacts, connection, worker_count=1)
+
+        expected_batch_results = [
+            ContactsBatchSavingResult(0, BATCH_SAVING_SIZE_LIMIT),
+            ContactsBatchSavingResult(1, 1),
+            ]
+        eq_(expected_batch_results, batch_results)
+
+    def test_exceeding_batch_byte_size_limit(self):
+        contacts = make_contacts(3)
+        max_batch_byte_size = _get_contacts_byte_size(contacts[:2])
+
+        simulator = SaveContacts(
+            contacts,
+            [STUB_STRING_PROPERTY],
+            max_batch_byte_size,
+            )
+        with MockPortalConnection(simulator) as connection:
+            batch_results = save_contacts_concurrently(
+                contacts,
+                connection,
+                worker_count=1,
+                max_batch_byte_size=max_batch_byte_size,
+                )
+
+        expected_batch_results = [
+            ContactsBatchSavingResult(0, 2),
+            ContactsBatchSavingResult(1, 1),
+            ]
+        eq_(expected_batch_results, batch_results)
+
+    def test_serialized_bodies(self):
+        contacts = make_contacts(BATCH_SAVING_SIZE_LIMIT + 1)
+        simulator = SaveContacts(contacts, [STUB_STRING_PROPERTY])
+        with SerializedBodyMockPortalConnection(simulator) as connection:
+            batch_results = \
+                save_contacts_concurrently(contacts, connection, worker_count=1)
+
+        expected_batch_results = [
+            ContactsBatchSavingResult(0, BATCH_SAVING_SIZE_LIMIT),
+            ContactsBatchSavingResult(1, 1),
+            ]
+        eq_(expected_batch_results, batch_results)
+        eq_(2, len(connection.body_serializations))
+
+    def test_multiple_workers(self):
+        contacts = make_contacts(BATCH_SAVING_SIZE_LIMIT * 4)
+        connection = _ConcurrentSavingConnection([STUB_STRING_PROPERTY])
+
+        batch_results = save_contacts_concurrently(
+            contacts,
+            connection,
+            worker_count=4,
+            max_batches_in_flight=2,
+            )
+
+        eq_(range(4), [r.batch_index for r in batch_results])
+        ok_(all(r.exception is None for r in batch_results))
+
+        saved_email_addresses = \
+            sorted(c['email'] for c in connection.saved_contacts_data)
+        expected_email_addresses = sorted(c.email_address for c in contacts)
+        eq_(expected_email_addresses, saved_email_addresses)
+
+    def test_invalid_worker_count(self):
+        connection = _ConcurrentSavingConnection([STUB_STRING_PROPERTY])
+
+        with assert_raises_regexp(ValueError, 'worker_count'):
+            save_contacts_concurrently(
+                make_contacts(1),
+                connection,
+                worker_count=0,
+                )
+
+    def test_invalid_max_batches_in_flight(self):
+        connection = _ConcurrentSavingConnection([STUB_STRING_PROPERTY])
+
+        with assert_raises_regexp(ValueError, 'max_batches_in_flight'):
+            save_contacts_concurrently(
+                make_contacts(1),
+                connection,
+                max_batches_in_flight=0,
+                )
+
+    def test_unsuccessful_batch(self):
+        contacts = make_contacts(BATCH_SAVING_SIZE_LIMIT + 1)
+        simulator = UnsuccessfulSaveContacts(
+            contacts,
+            self._STUB_EXCEPTION,
+            [STUB_STRING_PROPERTY],
+            )
+        with MockPortalConnection(simulator) as connection:
+            batch_results = \
+                save_contacts_concurrently(contacts, connection, worker_count=1)
+
+        expected_batch_results = [
+            ContactsBatchSavingResult(0, BATCH_SAVING_SIZE_LIMIT),
+            ContactsBatchSavingResult(
+                1,
+                1,
+                contacts[BATCH_SAVING_SIZE_LIMIT:],
+                self._STUB_EXCEPTION,
+                ),
+            ]
+        eq_(expected_batch_results, batch_results)
+
+    def test_interrupted_batch(self):
+        connection = _ConcurrentSavingConnection(
+            [STUB_STRING_PROPERTY],
+            _StubInterruption(),
+            )
+
+        with assert_raises(_StubInterruption):
+            save_contacts_concurrently(
+                make_contacts(BATCH_SAVING_SIZE_LIMIT * 2),
+                connection,
+                worker_count=2,
+                )
+
+    def test_invalid_property_value(self):
+        contact = make_contact(1, {STUB_NUMBER_PROPERTY.name: 'abc'})
+        simulator = GetAllProperties([STUB_NUMBER_PROPERTY])
+        with MockPortalConnection(simulator) as connection:
+            batch_results = save_contacts_concurrently([contact], connection)
+
+        batch_result = batch_results[0]
+        eq_([contact], batch_result.failed_contacts)
+        ok_(isinstance(batch_result.exception, HubspotPropertyValueError))
+
+
+class TestContactsEncoder(object):
+
+    _PROPERTY_TYPE_BY_PROPERTY_NAME = {
+        'is_polite': STUB_BOOLEAN_PROPERTY.__class__,
+        'birthday': STUB_DATE_PROPERTY.__class__,
+        'last_seen': STUB_DATETIME_PROPERTY.__class__,
+        'currency': STUB_ENUMERATION_PROPERTY.__class__,
+        'height': STUB_NUMBER_PROPERTY.__class__,
+        'nickname': STUB_STRING_PROPERTY.__class__,
+        }
+
+    def test_no_contacts(self):
+        self._check_encoded_contacts_match_formatted_contacts([])
+
+    def test_typed_property_values(self):
+        contacts = [
+            make_contact(
+                1,
+                {
+                    'is_polite': True,
+                    'birthday': date(2014, 4, 4),
+                    'last_seen': datetime(2014, 4, 4, 10, 28, 0, 140000),
+                    'currency': 'gbp',
+                    'height': Decimal('1.81'),
+                    'nickname': u'J\xf6rg "the \\ one"',
+                    },
+                ),
+            make_contact(2, {'is_polite': False, 'height': 2}),
+            ]
+        self._check_encoded_contacts_match_formatted_contacts(contacts)
+
+    def test_unset_property_values(self):
+        contacts = [make_contact(1, {'is_polite': None, 'nickname': None})]
+        self._check_encoded_contacts_match_formatted_contacts(contacts)
+
+    def test_no_email_address(self):
+        contact = make_contact(1)
+        contact.email_address = None
+        self._check_encoded_contacts_match_formatted_contacts([contact])
+
+    def test_invalid_property_value(self):
+        contacts_encoder = ContactsEncoder(self._PROPERTY_TYPE_BY_PROPERTY_NAME)
+        contact = make_contact(1, {'height': 'abc'})
+
+        with assert_raises_regexp(HubspotPropertyValueError, 'not a number'):
+            contacts_encoder.encode_contact(contact)
+
+    def _check_encoded_contacts_match_formatted_contacts(self, contacts):
+        contacts_encoder = ContactsEncoder(self._PROPERTY_TYPE_BY_PROPERTY_NAME)
+        contacts_data = format_contacts_data_for_saving(
+            contacts,
+            self._PROPERTY_TYPE_BY_PROPERTY_NAME,
+            )
+
+        encoded_contacts = contacts_encoder.encode_contacts(contacts)
+
+        eq_(contacts_data, json_deserialize(encoded_contacts))
+        eq_(len(json_serialize(contacts_data)), len(encoded_contacts))
+
+
+def _get_contacts_byte_size(contacts):
+    contacts_data = format_contacts_data_for_saving(contacts, {})
+    contacts_byte_size = len(json_serialize(contacts_data))
+    return contacts_byte_size
+
+
+class _ConcurrentSavingConnection(object):
+
+    def __init__(self, available_properties, exception=None):
+        super(_ConcurrentSavingConnection, self).__init__()
+
+        self.saved_contacts_data = []
+
+        self._exception = exception
+
+        self._properties_connection = \
+            MockPortalConnection(GetAllProperties(available_properties))
+        self._lock = Lock()
+
+    def send_get_request(self, url_path, query_string_args=None):
+        return self._properties_connection.send_get_request(
+            url_path,
+            query_string_args,
+            )
+
+    def send_post_request(self, url_path, body_deserialization):
+        sleep(0.01)
+        with self._lock:
+            self.saved_contacts_data.extend(body_deserialization)
+
+        if self._exception:
+            raise self._exception
+
+
+class _StubInterruption(BaseException):
+    pass
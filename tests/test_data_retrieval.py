@@ -0,0 +1,57 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+
+from traceback import extract_tb
+import sys
+
+from nose.tools import assert_raises
+from nose.tools import eq_
+
+from hubspot.contacts._data_retrieval import _prefetch
+
+
+class TestPrefetching(object):
+
+    def test_items(self):
+        eq_([1, 2, 3], list(_prefetch(iter([1, 2, 3]), 1)))
+
+    def test_exception(self):
+        prefetched_items = _prefetch(_iter_items_then_raise(ValueError()), 1)
+
+        eq_(1, next(prefetched_items))
+        with assert_raises(ValueError):
+            next(prefetched_items)
+
+        traceback_function_names = \
+            [f[2] for f in extract_tb(sys.exc_info()[2])]
+        eq_('_iter_items_then_raise', traceback_function_names[-1])
+
+    def test_base_exception(self):
+        prefetched_items = _prefetch(_iter_items_then_raise(_StubError()), 1)
+
+        eq_(1, next(prefetched_items))
+        with assert_raises(_StubError):
+            next(prefetched_items)
+
+
+def _iter_items_then_raise(exception):
+    yield 1
+    raise exception
+
+
+class _StubError(BaseException):
+    pass
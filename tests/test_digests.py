@@ -0,0 +1,66 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from nose.tools import eq_
+
+from hubspot.contacts.digests import SQLiteContactDigestStore
+
+
+_STUB_EMAIL_ADDRESS = 'john@example.com'
+
+
+class TestSQLiteContactDigestStore(object):
+
+    def setup(self):
+        self._directory_path = mkdtemp()
+        self._database_path = path.join(self._directory_path, 'digests.db')
+        self._contact_digest_store = \
+            SQLiteContactDigestStore(self._database_path)
+
+    def teardown(self):
+        self._contact_digest_store.close()
+        rmtree(self._directory_path)
+
+    def test_no_digest(self):
+        eq_(None, self._contact_digest_store.get_digest(_STUB_EMAIL_ADDRESS))
+
+    def test_setting_digests(self):
+        digest_by_email_address = {
+            _STUB_EMAIL_ADDRESS: 'abc',
+            'jane@example.com': 'def',
+            }
+        self._contact_digest_store.set_digests(digest_by_email_address)
+
+        for email_address, digest in digest_by_email_address.items():
+            eq_(digest, self._contact_digest_store.get_digest(email_address))
+
+    def test_replacing_digest(self):
+        self._contact_digest_store.set_digests({_STUB_EMAIL_ADDRESS: 'abc'})
+        self._contact_digest_store.set_digests({_STUB_EMAIL_ADDRESS: 'def'})
+
+        eq_('def', self._contact_digest_store.get_digest(_STUB_EMAIL_ADDRESS))
+
+    def test_persistence(self):
+        self._contact_digest_store.set_digests({_STUB_EMAIL_ADDRESS: 'abc'})
+        self._contact_digest_store.close()
+
+        self._contact_digest_store = \
+            SQLiteContactDigestStore(self._database_path)
+        eq_('abc', self._contact_digest_store.get_digest(_STUB_EMAIL_ADDRESS))
@@ -0,0 +1,141 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from hubspot.connection.testing import MockPortalConnection
+from nose.tools import eq_
+
+from hubspot.contacts._constants import BATCH_RETRIEVAL_SIZE_LIMIT
+from hubspot.contacts.exports import export_all_contacts
+from hubspot.contacts.exports import export_all_contacts_by_last_update
+from hubspot.contacts.exports import load_contacts
+from hubspot.contacts.properties import BooleanProperty
+from hubspot.contacts.properties import DateProperty
+from hubspot.contacts.properties import DatetimeProperty
+from hubspot.contacts.properties import NumberProperty
+from hubspot.contacts.properties import StringProperty
+from hubspot.contacts.testing import GetAllContacts
+from hubspot.contacts.testing import GetAllContactsByLastUpdate
+from hubspot.contacts.testing import STUB_LAST_MODIFIED_DATETIME
+
+from tests._utils import make_contact
+from tests._utils import make_contacts
+
+
+_PROPERTIES = (
+    BooleanProperty('is_polite', 'Is polite?', '', 'group', 'booleancheckbox'),
+    DateProperty('birthday', 'Birthday', '', 'group', 'date'),
+    DatetimeProperty('last_seen', 'Last seen', '', 'group', 'date'),
+    NumberProperty('height', 'Height', '', 'group', 'number'),
+    StringProperty('nickname', 'Nickname', '', 'group', 'text'),
+    )
+
+_PROPERTY_NAMES = [p.name for p in _PROPERTIES]
+
+
+class _BaseExportTestCase(object):
+
+    _EXPORTER = None
+
+    _SIMULATOR_CLASS = None
+
+    def setup(self):
+        self._directory_path = mkdtemp()
+
+    def teardown(self):
+        rmtree(self._directory_path)
+
+    def test_no_contacts(self):
+        self._check_exported_contacts_loaded([])
+
+    def test_exceeding_pagination_size(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT + 1)
+        self._check_exported_contacts_loaded(contacts)
+
+    def test_typed_property_values(self):
+        contacts = [
+            make_contact(
+                1,
+                {
+                    'is_polite': True,
+                    'birthday': date(1900, 1, 1),
+                    'last_seen': datetime(2014, 4, 4, 10, 28, 0, 140000),
+                    'height': Decimal('1.81'),
+                    'nickname': u'J\xf6rg',
+                    },
+                related_contact_vids=[2],
+                ),
+            make_contact(
+                2,
+                {
+                    'is_polite': False,
+                    'last_seen': datetime(2014, 4, 4, 10, 28),
+                    },
+                ),
+            ]
+        self._check_exported_contacts_loaded(contacts)
+
+    def test_compression(self):
+        contacts = make_contacts(2)
+        self._check_exported_contacts_loaded(contacts, compress=True)
+
+    def _check_exported_contacts_loaded(self, contacts, **kwargs):
+        file_path = path.join(self._directory_path, 'contacts.ndjson')
+
+        simulator = self._SIMULATOR_CLASS(
+            contacts,
+            list(_PROPERTIES),
+            _PROPERTY_NAMES,
+            )
+        with MockPortalConnection(simulator) as connection:
+            contact_count = self._EXPORTER(
+                connection,
+                file_path,
+                _PROPERTY_NAMES,
+                **kwargs
+                )
+
+        eq_(len(contacts), contact_count)
+
+        expected_contacts = []
+        for contact in contacts:
+            expected_contact = contact.copy()
+            expected_contact.properties = dict(
+                contact.properties,
+                lastmodifieddate=STUB_LAST_MODIFIED_DATETIME,
+                )
+            expected_contacts.append(expected_contact)
+        eq_(expected_contacts, list(load_contacts(file_path)))
+
+
+class TestExportingAllContacts(_BaseExportTestCase):
+
+    _EXPORTER = staticmethod(export_all_contacts)
+
+    _SIMULATOR_CLASS = GetAllContacts
+
+
+class TestExportingAllContactsByLastUpdate(_BaseExportTestCase):
+
+    _EXPORTER = staticmethod(export_all_contacts_by_last_update)
+
+    _SIMULATOR_CLASS = GetAllContactsByLastUpdate
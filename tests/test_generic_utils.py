@@ -0,0 +1,168 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from datetime import date
+from datetime import datetime
+
+from nose.plugins.skip import SkipTest
+from nose.tools import eq_
+
+from hubspot.contacts import generic_utils
+from hubspot.contacts.generic_utils import \
+    convert_timestamp_in_milliseconds_to_date
+from hubspot.contacts.generic_utils import \
+    convert_timestamp_in_milliseconds_to_datetime
+from hubspot.contacts.generic_utils import \
+    convert_timestamps_in_milliseconds_to_dates
+from hubspot.contacts.generic_utils import \
+    convert_timestamps_in_milliseconds_to_datetimes
+from hubspot.contacts.generic_utils import ipaginate
+from hubspot.contacts.generic_utils import ipaginate_by_size
+
+
+class TestPagination(object):
+
+    def test_list(self):
+        pages = list(ipaginate(range(5), 2))
+
+        eq_([[0, 1], [2, 3], [4]], pages)
+
+    def test_list_with_complete_pages(self):
+        pages = list(ipaginate(range(4), 2))
+
+        eq_([[0, 1], [2, 3]], pages)
+
+    def test_empty_list(self):
+        eq_([], list(ipaginate([], 2)))
+
+    def test_generator(self):
+        pages = list(ipaginate((i for i in range(5)), 2))
+
+        eq_([[0, 1], [2, 3], [4]], pages)
+
+    def test_tuple(self):
+        pages = list(ipaginate(tuple(range(3)), 2))
+
+        eq_([[0, 1], [2]], pages)
+
+
+class TestPaginationBySize(object):
+
+    def test_page_size(self):
+        pages = list(ipaginate_by_size(range(5), 2, 100, _get_item_byte_size))
+
+        eq_([[0, 1], [2, 3], [4]], pages)
+
+    def test_page_byte_size(self):
+        pages = \
+            list(ipaginate_by_size([3, 1, 2, 4, 1], 10, 4, _get_item_byte_size))
+
+        eq_([[3, 1], [2], [4], [1]], pages)
+
+    def test_item_exceeding_page_byte_size(self):
+        pages = list(ipaginate_by_size([1, 5, 1], 10, 4, _get_item_byte_size))
+
+        eq_([[1], [5], [1]], pages)
+
+    def test_no_items(self):
+        eq_([], list(ipaginate_by_size([], 2, 4, _get_item_byte_size)))
+
+
+def _get_item_byte_size(item):
+    return item
+
+
+_TIMESTAMPS_MILLISECONDS = [
+    u'1396607280140',
+    None,
+    u'1396569600000',
+    u'0',
+    u'-1',
+    u'-86400001',
+    ]
+
+
+class _BaseTimestampsConversionTestCase(object):
+
+    _NUMPY = None
+
+    def setup(self):
+        self._original_numpy = generic_utils.numpy
+        generic_utils.numpy = self._NUMPY
+
+    def teardown(self):
+        generic_utils.numpy = self._original_numpy
+
+    def test_datetimes(self):
+        datetimes = convert_timestamps_in_milliseconds_to_datetimes(
+            _TIMESTAMPS_MILLISECONDS,
+            )
+
+        eq_(
+            _convert_timestamps(
+                convert_timestamp_in_milliseconds_to_datetime,
+                _TIMESTAMPS_MILLISECONDS,
+                ),
+            datetimes,
+            )
+        eq_(datetime(2014, 4, 4, 10, 28, 0, 140000), datetimes[0])
+
+    def test_dates(self):
+        dates = convert_timestamps_in_milliseconds_to_dates(
+            _TIMESTAMPS_MILLISECONDS,
+            )
+
+        eq_(
+            _convert_timestamps(
+                convert_timestamp_in_milliseconds_to_date,
+                _TIMESTAMPS_MILLISECONDS,
+                ),
+            dates,
+            )
+        eq_(date(2014, 4, 4), dates[0])
+
+    def test_no_timestamps(self):
+        eq_([], convert_timestamps_in_milliseconds_to_datetimes([]))
+        eq_([], convert_timestamps_in_milliseconds_to_dates([]))
+
+    def test_null_timestamps(self):
+        eq_([None], convert_timestamps_in_milliseconds_to_datetimes([None]))
+        eq_([None], convert_timestamps_in_milliseconds_to_dates([None]))
+
+
+class TestTimestampsConversionWithoutNumpy(_BaseTimestampsConversionTestCase):
+
+    _NUMPY = None
+
+
+class TestTimestampsConversionWithNumpy(_BaseTimestampsConversionTestCase):
+
+    def setup(self):
+        try:
+            import numpy
+        except ImportError:
+            raise SkipTest('NumPy is not installed')
+
+        self._NUMPY = numpy
+        super(TestTimestampsConversionWithNumpy, self).setup()
+
+
+def _convert_timestamps(converter, timestamps_milliseconds):
+    values = [
+        converter(t) if t is not None else None
+        for t in timestamps_milliseconds
+        ]
+    return values
@@ -0,0 +1,283 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from json import dumps as json_serialize
+from threading import Lock
+
+from hubspot.connection.testing import MockPortalConnection
+from nose.tools import eq_
+from nose.tools import ok_
+
+from hubspot.contacts import save_contacts
+from hubspot.contacts._constants import BATCH_RETRIEVAL_SIZE_LIMIT
+from hubspot.contacts._constants import CONTACTS_API_SCRIPT_NAME
+from hubspot.contacts.instrumentation import MetricsSink
+from hubspot.contacts.instrumentation import configure_metrics_sink
+from hubspot.contacts.instrumentation import get_metrics_sink
+from hubspot.contacts.lists import ContactList
+from hubspot.contacts.lists import add_contacts_to_list
+from hubspot.contacts.lists import get_all_contact_lists
+from hubspot.contacts.lists import get_all_contacts
+from hubspot.contacts.lists import get_all_contacts_by_last_update
+from hubspot.contacts.lists import iter_contact_vids
+from hubspot.contacts.request_data_formatters.contacts import \
+    format_contacts_data_for_saving
+from hubspot.contacts.testing import AddContactsToList
+from hubspot.contacts.testing import GetAllContactLists
+from hubspot.contacts.testing import GetAllContacts
+from hubspot.contacts.testing import GetAllContactsByLastUpdate
+from hubspot.contacts.testing import GetContactVids
+from hubspot.contacts.testing import SaveContacts
+
+from tests._utils import SerializedBodyMockPortalConnection
+from tests._utils import make_contacts
+from tests.test_properties import STUB_STRING_PROPERTY
+
+
+_STUB_CONTACT_LIST = ContactList(1, 'atestlist', False)
+
+
+class TestConfiguringMetricsSink(object):
+
+    def setup(self):
+        self._connection = MockPortalConnection()
+
+    def test_no_metrics_sink(self):
+        eq_(None, get_metrics_sink(self._connection))
+
+    def test_metrics_sink(self):
+        metrics_sink = _RecordingMetricsSink()
+        configure_metrics_sink(self._connection, metrics_sink)
+
+        eq_(metrics_sink, get_metrics_sink(self._connection))
+
+    def test_removing_metrics_sink(self):
+        configure_metrics_sink(self._connection, _RecordingMetricsSink())
+        configure_metrics_sink(self._connection, None)
+
+        eq_(None, get_metrics_sink(self._connection))
+
+    def test_removing_non_existing_metrics_sink(self):
+        configure_metrics_sink(self._connection, None)
+
+        eq_(None, get_metrics_sink(self._connection))
+
+
+    def test_connection_without_weak_references(self):
+        contacts = make_contacts(1)
+
+        simulator = GetAllContacts(contacts, [STUB_STRING_PROPERTY])
+        with MockPortalConnection(simulator) as connection:
+            slotted_connection = _SlottedConnection(connection)
+            eq_(None, get_metrics_sink(slotted_connection))
+            retrieved_contacts = list(get_all_contacts(slotted_connection))
+
+        eq_([c.vid for c in contacts], [c.vid for c in retrieved_contacts])
+
+
+class TestPageRetrievalMetrics(object):
+
+    def setup(self):
+        self._metrics_sink = _RecordingMetricsSink()
+
+    def test_contacts(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT + 1)
+
+        simulator = GetAllContacts(contacts, [STUB_STRING_PROPERTY])
+        with self._make_connection(simulator) as connection:
+            list(get_all_contacts(connection))
+
+        self._assert_page_retrieval_metrics_match(
+            CONTACTS_API_SCRIPT_NAME + '/lists/all/contacts/all',
+            [BATCH_RETRIEVAL_SIZE_LIMIT, 1],
+            )
+        page_retrievals = self._metrics_sink.page_retrievals
+        ok_(0 < sum(m.validation_duration for m in page_retrievals))
+        ok_(0 < sum(m.decoding_duration for m in page_retrievals))
+
+    def test_contacts_by_recency(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT + 1)
+
+        simulator = \
+            GetAllContactsByLastUpdate(contacts, [STUB_STRING_PROPERTY])
+        with self._make_connection(simulator) as connection:
+            list(get_all_contacts_by_last_update(connection))
+
+        self._assert_page_retrieval_metrics_match(
+            CONTACTS_API_SCRIPT_NAME + '/lists/recently_updated/contacts/'
+            'recent',
+            [BATCH_RETRIEVAL_SIZE_LIMIT, 1],
+            )
+
+    def test_prefetched_contacts(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT + 1)
+
+        simulator = GetAllContacts(contacts, [STUB_STRING_PROPERTY])
+        with self._make_connection(simulator) as connection:
+            list(get_all_contacts(connection, prefetch_depth=1))
+
+        self._assert_page_retrieval_metrics_match(
+            CONTACTS_API_SCRIPT_NAME + '/lists/all/contacts/all',
+            [BATCH_RETRIEVAL_SIZE_LIMIT, 1],
+            )
+
+    def test_contact_lists(self):
+        contact_lists = [_STUB_CONTACT_LIST]
+
+        simulator = GetAllContactLists(contact_lists)
+        with self._make_connection(simulator) as connection:
+            list(get_all_contact_lists(connection))
+
+        self._assert_page_retrieval_metrics_match(
+            CONTACTS_API_SCRIPT_NAME + '/lists',
+            [1],
+            )
+
+    def test_pages(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT + 1)
+
+        simulator = GetContactVids(contacts)
+        with self._make_connection(simulator) as connection:
+            list(iter_contact_vids(connection))
+
+        self._assert_page_retrieval_metrics_match(
+            CONTACTS_API_SCRIPT_NAME + '/lists/all/contacts/all',
+            [BATCH_RETRIEVAL_SIZE_LIMIT, 1],
+            )
+        for page_retrieval_metrics in self._metrics_sink.page_retrievals:
+            eq_(0, page_retrieval_metrics.decoding_duration)
+
+    def test_partially_consumed_page(self):
+        contacts = make_contacts(1)
+
+        simulator = GetAllContacts(contacts, [STUB_STRING_PROPERTY])
+        with self._make_connection(simulator) as connection:
+            contacts_retrieved = get_all_contacts(connection)
+            next(contacts_retrieved)
+
+        eq_([], self._metrics_sink.page_retrievals)
+
+    def _make_connection(self, simulator):
+        connection = MockPortalConnection(simulator)
+        configure_metrics_sink(connection, self._metrics_sink)
+        return connection
+
+    def _assert_page_retrieval_metrics_match(self, url_path, item_counts):
+        page_retrievals = self._metrics_sink.page_retrievals
+        eq_(item_counts, [m.item_count for m in page_retrievals])
+        for page_retrieval_metrics in page_retrievals:
+            eq_(url_path, page_retrieval_metrics.url_path)
+            ok_(0 <= page_retrieval_metrics.request_duration)
+
+
+class TestBatchSendingMetrics(object):
+
+    def setup(self):
+        self._metrics_sink = _RecordingMetricsSink()
+
+    def test_saving_contacts(self):
+        contacts = make_contacts(2)
+
+        simulator = SaveContacts(contacts, [STUB_STRING_PROPERTY])
+        connection = MockPortalConnection(simulator)
+        self._check_contacts_saving_metrics(contacts, connection)
+
+    def test_saving_contacts_with_serialized_bodies(self):
+        contacts = make_contacts(2)
+
+        simulator = SaveContacts(contacts, [STUB_STRING_PROPERTY])
+        connection = SerializedBodyMockPortalConnection(simulator)
+        self._check_contacts_saving_metrics(contacts, connection)
+
+        body_serialization = connection.body_serializations[0]
+        eq_(
+            len(body_serialization),
+            self._metrics_sink.batch_sendings[0].byte_size,
+            )
+
+    def _check_contacts_saving_metrics(self, contacts, connection):
+        configure_metrics_sink(connection, self._metrics_sink)
+        with connection:
+            save_contacts(contacts, connection)
+
+        contacts_data = format_contacts_data_for_saving(
+            contacts,
+            {STUB_STRING_PROPERTY.name: STUB_STRING_PROPERTY.__class__},
+            )
+
+        batch_sending_metrics, = self._metrics_sink.batch_sendings
+        eq_(
+            CONTACTS_API_SCRIPT_NAME + '/contact/batch/',
+            batch_sending_metrics.url_path,
+            )
+        eq_(len(contacts), batch_sending_metrics.item_count)
+        eq_(
+            len(json_serialize(contacts_data)),
+            batch_sending_metrics.byte_size,
+            )
+        ok_(0 <= batch_sending_metrics.request_duration)
+        eq_(None, batch_sending_metrics.validation_duration)
+
+    def test_updating_contact_list_membership(self):
+        contacts = make_contacts(2)
+
+        simulator = AddContactsToList(_STUB_CONTACT_LIST, contacts, contacts)
+        with MockPortalConnection(simulator) as connection:
+            configure_metrics_sink(connection, self._metrics_sink)
+            add_contacts_to_list(_STUB_CONTACT_LIST, contacts, connection)
+
+        batch_sending_metrics, = self._metrics_sink.batch_sendings
+        eq_(
+            CONTACTS_API_SCRIPT_NAME + '/lists/1/add',
+            batch_sending_metrics.url_path,
+            )
+        eq_(len(contacts), batch_sending_metrics.item_count)
+        request_body = json_serialize({'vids': [c.vid for c in contacts]})
+        eq_(len(request_body), batch_sending_metrics.byte_size)
+        ok_(0 <= batch_sending_metrics.request_duration)
+        ok_(0 <= batch_sending_metrics.validation_duration)
+
+
+class _RecordingMetricsSink(MetricsSink):
+
+    def __init__(self):
+        super(_RecordingMetricsSink, self).__init__()
+
+        self.page_retrievals = []
+        self.batch_sendings = []
+
+        self._lock = Lock()
+
+    def record_page_retrieval(self, page_retrieval_metrics):
+        with self._lock:
+            self.page_retrievals.append(page_retrieval_metrics)
+
+    def record_batch_sending(self, batch_sending_metrics):
+        with self._lock:
+            self.batch_sendings.append(batch_sending_metrics)
+
+
+class _SlottedConnection(object):
+
+    __slots__ = ('_connection', )
+
+    def __init__(self, connection):
+        super(_SlottedConnection, self).__init__()
+
+        self._connection = connection
+
+    def send_get_request(self, url_path, query_string_args=None):
+        return self._connection.send_get_request(url_path, query_string_args)
@@ -17,16 +17,21 @@
 from abc import ABCMeta
 from abc import abstractmethod
 from abc import abstractproperty
+from array import array
 from datetime import date
 from datetime import datetime
 from datetime import timedelta
 from decimal import Decimal
 from inspect import isgenerator
+from itertools import chain
 from itertools import islice
+from threading import Lock
+from time import sleep
 
 from hubspot.connection.exc import HubspotClientError
 from hubspot.connection.exc import HubspotServerError
 from hubspot.connection.testing import MockPortalConnection
+from nose.tools import assert_is_instance
 from nose.tools import assert_items_equal
 from nose.tools import assert_not_in
 from nose.tools import assert_raises
@@ -38,8 +43,16 @@ from voluptuous import Invalid
 from hubspot.contacts import Contact
 from hubspot.contacts._constants import BATCH_RETRIEVAL_SIZE_LIMIT
 from hubspot.contacts._constants import BATCH_SAVING_SIZE_LIMIT
+from hubspot.contacts._constants import CONTACTS_API_SCRIPT_NAME
+from hubspot.contacts.checkpoints import CheckpointStore
+from hubspot.contacts.compact import CompactContact
+from hubspot.contacts.lists import ContactDecoder
 from hubspot.contacts.lists import ContactList
+from hubspot.contacts.lists import ContactListMembershipSyncResult
+from hubspot.contacts.lists import ContactListMembershipUpdateResult
+from hubspot.contacts.lists import LazyContactProperties
 from hubspot.contacts.lists import add_contacts_to_list
+from hubspot.contacts.lists import add_contacts_to_list_by_batch
 from hubspot.contacts.lists import create_static_contact_list
 from hubspot.contacts.lists import delete_contact_list
 from hubspot.contacts.lists import get_all_contact_lists
@@ -47,7 +60,13 @@ from hubspot.contacts.lists import get_all_contacts
 from hubspot.contacts.lists import get_all_contacts_by_last_update
 from hubspot.contacts.lists import get_all_contacts_from_list
 from hubspot.contacts.lists import get_all_contacts_from_list_by_added_date
+from hubspot.contacts.lists import get_contact_decoder
+from hubspot.contacts.lists import iter_contact_column_batches
+from hubspot.contacts.lists import iter_contact_vids
 from hubspot.contacts.lists import remove_contacts_from_list
+from hubspot.contacts.lists import remove_contacts_from_list_by_batch
+from hubspot.contacts.lists import sync_static_list_membership
+from hubspot.contacts.properties import NumberProperty
 from hubspot.contacts.properties import StringProperty
 from hubspot.contacts.testing import AddContactsToList
 from hubspot.contacts.testing import CreateStaticContactList
@@ -56,13 +75,16 @@ from hubspot.contacts.testing import GetAllContactLists
 from hubspot.contacts.testing import GetAllContacts
 from hubspot.contacts.testing import GetAllContactsByLastUpdate
 from hubspot.contacts.testing import GetContactsFromListByAddedDate
+from hubspot.contacts.testing import GetContactVids
 from hubspot.contacts.testing import GetContactsFromList
 from hubspot.contacts.testing import RemoveContactsFromList
 from hubspot.contacts.testing import STUB_LAST_MODIFIED_DATETIME
+from hubspot.contacts.testing import SyncStaticListMembership
 from hubspot.contacts.testing import UnsuccessfulCreateStaticContactList
 from hubspot.contacts.testing import UnsuccessfulGetAllContacts
 from hubspot.contacts.testing import UnsuccessfulGetAllContactsByLastUpdate
 
+from tests._utils import SerializedBodyMockPortalConnection
 from tests._utils import make_contact
 from tests._utils import make_contacts
 from tests.test_properties import STUB_BOOLEAN_PROPERTY
@@ -224,6 +246,10 @@ class _BaseContactListMembershipUpdateTestCase(object):
 
     __metaclass__ = ABCMeta
 
+    _MEMBERSHIP_UPDATER = abstractproperty()
+
+    _BATCH_MEMBERSHIP_UPDATER = abstractproperty()
+
     _SIMULATOR_CLASS = abstractproperty()
 
     def test_no_contacts(self):
@@ -270,6 +296,24 @@ class _BaseContactListMembershipUpdateTestCase(object):
                 connection,
                 )
 
+    def test_serialized_bodies(self):
+        contacts = make_contacts(BATCH_SAVING_SIZE_LIMIT + 1)
+
+        simulator = self._SIMULATOR_CLASS(
+            _STUB_CONTACT_LIST,
+            contacts,
+            contacts,
+            )
+        with SerializedBodyMockPortalConnection(simulator) as connection:
+            updated_contact_vids = self._MEMBERSHIP_UPDATER(
+                _STUB_CONTACT_LIST,
+                contacts,
+                connection,
+                )
+
+        eq_(_get_contact_vids(contacts), updated_contact_vids)
+        eq_(2, len(connection.body_serializations))
+
     def test_contacts_as_a_generator(self):
         contacts = make_contacts(1)
 
@@ -283,6 +327,108 @@ class _BaseContactListMembershipUpdateTestCase(object):
         expected_updated_contact_vids = _get_contact_vids(contacts)
         assert_items_equal(expected_updated_contact_vids, updated_contact_vids)
 
+    def test_updates_by_batch(self):
+        contacts = make_contacts(BATCH_SAVING_SIZE_LIMIT + 1)
+
+        with self._make_connection(contacts, contacts) as connection:
+            batch_results = self._BATCH_MEMBERSHIP_UPDATER(
+                _STUB_CONTACT_LIST,
+                contacts,
+                connection,
+                )
+            ok_(isgenerator(batch_results))
+
+            batch_results = list(batch_results)
+
+        expected_batch_results = [
+            ContactListMembershipUpdateResult(
+                0,
+                _get_contact_vids(contacts[:BATCH_SAVING_SIZE_LIMIT]),
+                ),
+            ContactListMembershipUpdateResult(
+                1,
+                _get_contact_vids(contacts[BATCH_SAVING_SIZE_LIMIT:]),
+                ),
+            ]
+        eq_(expected_batch_results, batch_results)
+
+    def test_multiple_workers(self):
+        contacts = make_contacts(BATCH_SAVING_SIZE_LIMIT * 4)
+        connection = _ConcurrentMembershipUpdateConnection()
+
+        updated_contact_vids = self._MEMBERSHIP_UPDATER(
+            _STUB_CONTACT_LIST,
+            contacts,
+            connection,
+            worker_count=4,
+            max_batches_in_flight=2,
+            )
+
+        eq_(_get_contact_vids(contacts), updated_contact_vids)
+
+        expected_url_path = '{}/lists/{}/{}'.format(
+            CONTACTS_API_SCRIPT_NAME,
+            _STUB_CONTACT_LIST.id,
+            self._SIMULATOR_CLASS.url_path_list_action,
+            )
+        eq_({expected_url_path}, connection.url_paths)
+
+    def test_invalid_worker_count(self):
+        connection = _ConcurrentMembershipUpdateConnection()
+
+        for membership_updater in self._get_membership_updaters():
+            with assert_raises_regexp(ValueError, 'worker_count'):
+                membership_updater(
+                    _STUB_CONTACT_LIST,
+                    make_contacts(1),
+                    connection,
+                    worker_count=0,
+                    )
+
+    def test_invalid_max_batches_in_flight(self):
+        connection = _ConcurrentMembershipUpdateConnection()
+
+        for membership_updater in self._get_membership_updaters():
+            with assert_raises_regexp(ValueError, 'max_batches_in_flight'):
+                membership_updater(
+                    _STUB_CONTACT_LIST,
+                    make_contacts(1),
+                    connection,
+                    worker_count=2,
+                    max_batches_in_flight=0,
+                    )
+
+        eq_(set(), connection.url_paths)
+
+    def _get_membership_updaters(self):
+        return [self._MEMBERSHIP_UPDATER, self._BATCH_MEMBERSHIP_UPDATER]
+
+    def test_unsuccessful_batch_with_multiple_workers(self):
+        exception = HubspotServerError('Internal server error', 500)
+        connection = _ConcurrentMembershipUpdateConnection(exception)
+
+        with assert_raises(HubspotServerError):
+            self._MEMBERSHIP_UPDATER(
+                _STUB_CONTACT_LIST,
+                make_contacts(BATCH_SAVING_SIZE_LIMIT * 2),
+                connection,
+                worker_count=2,
+                )
+
+    def test_interrupted_batch_with_multiple_workers(self):
+        connection = _ConcurrentMembershipUpdateConnection(_StubInterruption())
+
+        for membership_updater in self._get_membership_updaters():
+            with assert_raises(_StubInterruption):
+                list(
+                    membership_updater(
+                        _STUB_CONTACT_LIST,
+                        make_contacts(BATCH_SAVING_SIZE_LIMIT * 2),
+                        connection,
+                        worker_count=2,
+                        ),
+                    )
+
     def _test_membership_update(
         self,
         expected_updated_contacts,
@@ -348,10 +494,37 @@ class _BaseContactListMembershipUpdateTestCase(object):
         return lambda: api_calls
 
 
+class _ConcurrentMembershipUpdateConnection(object):
+
+    def __init__(self, exception=None):
+        super(_ConcurrentMembershipUpdateConnection, self).__init__()
+
+        self.url_paths = set()
+
+        self._exception = exception
+        self._lock = Lock()
+
+    def send_post_request(self, url_path, body_deserialization):
+        sleep(0.01)
+        with self._lock:
+            self.url_paths.add(url_path)
+
+        if self._exception:
+            raise self._exception
+
+        return {'updated': body_deserialization['vids']}
+
+
+class _StubInterruption(BaseException):
+    pass
+
+
 class TestAddingContactsToList(_BaseContactListMembershipUpdateTestCase):
 
     _MEMBERSHIP_UPDATER = staticmethod(add_contacts_to_list)
 
+    _BATCH_MEMBERSHIP_UPDATER = staticmethod(add_contacts_to_list_by_batch)
+
     _SIMULATOR_CLASS = AddContactsToList
 
     def test_contacts_not_in_list_without_exceeding_batch_size_limit(self):
@@ -425,6 +598,9 @@ class TestRemovingContactsFromList(_BaseContactListMembershipUpdateTestCase):
 
     _MEMBERSHIP_UPDATER = staticmethod(remove_contacts_from_list)
 
+    _BATCH_MEMBERSHIP_UPDATER = \
+        staticmethod(remove_contacts_from_list_by_batch)
+
     _SIMULATOR_CLASS = RemoveContactsFromList
 
     def test_contacts_not_in_list_without_exceeding_batch_size_limit(self):
@@ -492,6 +668,320 @@ class TestRemovingContactsFromList(_BaseContactListMembershipUpdateTestCase):
         return updated_contacts
 
 
+class TestGettingContactVids(object):
+
+    def test_no_contacts(self):
+        self._check_contact_vids_retrieved([])
+
+    def test_exceeding_pagination_size(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT + 1)
+        self._check_contact_vids_retrieved(contacts)
+
+    def test_contact_list(self):
+        contacts = make_contacts(2)
+        self._check_contact_vids_retrieved(contacts, _STUB_CONTACT_LIST)
+
+    def test_prefetching(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT * 2 + 1)
+        self._check_contact_vids_retrieved(contacts, prefetch_depth=1)
+
+    def test_vids_by_page(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT + 1)
+
+        simulator = GetContactVids(contacts)
+        with MockPortalConnection(simulator) as connection:
+            contact_vids_chunks = list(iter_contact_vids(connection))
+
+        expected_contact_vids_chunks = [
+            array('l', range(1, BATCH_RETRIEVAL_SIZE_LIMIT + 1)),
+            array('l', [BATCH_RETRIEVAL_SIZE_LIMIT + 1]),
+            ]
+        eq_(expected_contact_vids_chunks, contact_vids_chunks)
+
+    @staticmethod
+    def _check_contact_vids_retrieved(contacts, contact_list=None, **kwargs):
+        simulator = GetContactVids(contacts, contact_list)
+        with MockPortalConnection(simulator) as connection:
+            contact_vids_chunks = \
+                iter_contact_vids(connection, contact_list, **kwargs)
+            contact_vids = list(chain.from_iterable(contact_vids_chunks))
+
+        eq_(_get_contact_vids(contacts), contact_vids)
+
+
+class TestGettingContactColumnBatches(object):
+
+    def test_no_contacts(self):
+        contact_column_batches = self._get_contact_column_batches([])
+
+        eq_(1, len(contact_column_batches))
+        contact_column_batch = contact_column_batches[0]
+        eq_(array('l'), contact_column_batch.vids)
+        eq_([], contact_column_batch.email_addresses)
+        eq_({}, contact_column_batch.property_columns)
+
+    def test_exceeding_pagination_size(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT + 1)
+
+        contact_column_batches = self._get_contact_column_batches(contacts)
+
+        eq_(
+            [BATCH_RETRIEVAL_SIZE_LIMIT, 1],
+            [len(b.vids) for b in contact_column_batches],
+            )
+        eq_(
+            _get_contact_vids(contacts),
+            list(chain.from_iterable(b.vids for b in contact_column_batches)),
+            )
+        eq_(
+            [c.email_address for c in contacts],
+            list(
+                chain.from_iterable(
+                    b.email_addresses for b in contact_column_batches
+                    ),
+                ),
+            )
+
+    def test_contact_list(self):
+        contacts = make_contacts(2)
+
+        simulator = GetContactsFromList(_STUB_CONTACT_LIST, contacts, [])
+        with MockPortalConnection(simulator) as connection:
+            contact_column_batches = list(
+                iter_contact_column_batches(
+                    connection,
+                    contact_list=_STUB_CONTACT_LIST,
+                    ),
+                )
+
+        eq_(array('l', [1, 2]), contact_column_batches[0].vids)
+
+    def test_property_columns(self):
+        contacts = [
+            make_contact(1, {STUB_NUMBER_PROPERTY.name: Decimal('1.5')}),
+            make_contact(2),
+            make_contact(3, {STUB_NUMBER_PROPERTY.name: Decimal('3')}),
+            ]
+
+        contact_column_batches = self._get_contact_column_batches(
+            contacts,
+            [STUB_NUMBER_PROPERTY],
+            [STUB_NUMBER_PROPERTY.name, 'undefined'],
+            )
+
+        property_columns = contact_column_batches[0].property_columns
+        eq_([STUB_NUMBER_PROPERTY.name], property_columns.keys())
+
+        property_column = property_columns[STUB_NUMBER_PROPERTY.name]
+        eq_([Decimal('1.5'), None, Decimal('3')], property_column.values)
+        eq_(bytearray([0b010]), property_column.null_bitmap)
+
+    def test_datetime_property_columns(self):
+        last_seen = datetime(2014, 4, 4, 10, 28, 0, 140000)
+        contacts = [
+            make_contact(1),
+            make_contact(2, {STUB_DATETIME_PROPERTY.name: last_seen}),
+            ]
+
+        contact_column_batches = self._get_contact_column_batches(
+            contacts,
+            [STUB_DATETIME_PROPERTY],
+            [STUB_DATETIME_PROPERTY.name],
+            )
+
+        property_column = contact_column_batches[0].property_columns[
+            STUB_DATETIME_PROPERTY.name
+            ]
+        eq_([None, last_seen], property_column.values)
+        eq_(bytearray([0b01]), property_column.null_bitmap)
+
+    def test_prefetching(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT * 2 + 1)
+
+        contact_column_batches = \
+            self._get_contact_column_batches(contacts, prefetch_depth=1)
+
+        eq_(
+            _get_contact_vids(contacts),
+            list(chain.from_iterable(b.vids for b in contact_column_batches)),
+            )
+
+    @staticmethod
+    def _get_contact_column_batches(
+        contacts,
+        available_properties=(),
+        property_names=(),
+        **kwargs
+        ):
+        simulator = GetAllContacts(
+            contacts,
+            list(available_properties),
+            property_names,
+            )
+        with MockPortalConnection(simulator) as connection:
+            contact_column_batches = list(
+                iter_contact_column_batches(
+                    connection,
+                    property_names,
+                    **kwargs
+                    ),
+                )
+        return contact_column_batches
+
+
+class TestLazyContactProperties(object):
+
+    def setup(self):
+        self._converted_values = []
+
+    def test_decoding_on_access(self):
+        properties = self._make_lazy_contact_properties({'a': u'1', 'b': u'2'})
+
+        eq_(2, properties['b'])
+        eq_([u'2'], self._converted_values)
+
+    def test_memoization(self):
+        properties = self._make_lazy_contact_properties({'a': u'1'})
+
+        properties['a']
+        properties['a']
+
+        eq_([u'1'], self._converted_values)
+
+    def test_missing_property(self):
+        properties = self._make_lazy_contact_properties({'a': u'1'})
+
+        assert_not_in('b', properties)
+        with assert_raises(KeyError):
+            properties['b']
+
+    def test_setting_property(self):
+        properties = self._make_lazy_contact_properties({'a': u'1'})
+
+        properties['a'] = 3
+        properties['b'] = 4
+
+        eq_({'a': 3, 'b': 4}, dict(properties))
+        eq_([], self._converted_values)
+
+    def test_deleting_property(self):
+        properties = self._make_lazy_contact_properties({'a': u'1', 'b': u'2'})
+
+        properties['a']
+        del properties['a']
+
+        eq_(['b'], list(properties))
+        eq_(1, len(properties))
+
+    def test_equality(self):
+        properties = self._make_lazy_contact_properties({'a': u'1'})
+
+        eq_({'a': 1}, properties)
+
+    def test_decoder(self):
+        contact_decoder = ContactDecoder({
+            STUB_NUMBER_PROPERTY.name: NumberProperty,
+            STUB_STRING_PROPERTY.name + '2': StringProperty,
+            })
+
+        properties = contact_decoder.decode_properties_lazily({
+            STUB_NUMBER_PROPERTY.name: u'1.5',
+            STUB_STRING_PROPERTY.name + '2': u'',
+            'undefined': u'foo',
+            })
+
+        eq_({STUB_NUMBER_PROPERTY.name: Decimal('1.5')}, properties)
+
+    def _make_lazy_contact_properties(self, raw_property_values):
+        converter_by_property_name = \
+            {n: self._convert_value for n in raw_property_values}
+        converter_by_property_name['b'] = self._convert_value
+        properties = LazyContactProperties(
+            raw_property_values,
+            converter_by_property_name,
+            )
+        return properties
+
+    def _convert_value(self, raw_value):
+        self._converted_values.append(raw_value)
+        return int(raw_value)
+
+
+class TestSyncingStaticListMembership(object):
+
+    def test_no_changes(self):
+        contacts = make_contacts(2)
+        self._check_membership_sync(
+            contacts,
+            _get_contact_vids(contacts),
+            ContactListMembershipSyncResult([], []),
+            )
+
+    def test_empty_list(self):
+        self._check_membership_sync(
+            [],
+            [1, 2],
+            ContactListMembershipSyncResult([1, 2], []),
+            )
+
+    def test_emptying_list(self):
+        self._check_membership_sync(
+            make_contacts(2),
+            [],
+            ContactListMembershipSyncResult([], [1, 2]),
+            )
+
+    def test_adding_and_removing_contacts(self):
+        self._check_membership_sync(
+            make_contacts(3),
+            [4, 3, 2],
+            ContactListMembershipSyncResult([4], [1]),
+            )
+
+    def test_high_vids(self):
+        self._check_membership_sync(
+            make_contacts(1),
+            [2 ** 40, 2 ** 33],
+            ContactListMembershipSyncResult([2 ** 33, 2 ** 40], [1]),
+            )
+
+    def test_exceeding_batch_size_limit(self):
+        current_contact_count = BATCH_RETRIEVAL_SIZE_LIMIT + 1
+        contacts = make_contacts(current_contact_count)
+        desired_vids = \
+            range(current_contact_count, BATCH_SAVING_SIZE_LIMIT * 3)
+
+        self._check_membership_sync(
+            contacts,
+            desired_vids,
+            ContactListMembershipSyncResult(
+                desired_vids[1:],
+                range(1, current_contact_count),
+                ),
+            )
+
+    @staticmethod
+    def _check_membership_sync(
+        current_contacts,
+        desired_vids,
+        expected_sync_result,
+        ):
+        desired_vids = list(desired_vids)
+        simulator = SyncStaticListMembership(
+            _STUB_CONTACT_LIST,
+            current_contacts,
+            desired_vids,
+            )
+        with MockPortalConnection(simulator) as connection:
+            sync_result = sync_static_list_membership(
+                _STUB_CONTACT_LIST,
+                (vid for vid in desired_vids),
+                connection,
+                )
+
+        eq_(expected_sync_result, sync_result)
+
+
 def _get_contact_vids(contacts):
     return [c.vid for c in contacts]
 
@@ -592,6 +1082,75 @@ class _BaseGettingContactsTestCase(object):
         contacts = [make_contact(1, related_contact_vids=[2, 3])]
         self._check_contacts_from_simulated_retrieval_equal(contacts, contacts)
 
+    def test_fast_validation(self):
+        contacts = [make_contact(1, related_contact_vids=[2])]
+
+        retrieved_contacts = self._retrieve_simulated_contacts(
+            contacts,
+            strict_validation=False,
+            )
+
+        _assert_retrieved_contacts_equal(contacts, retrieved_contacts)
+
+    def test_prefetching(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT * 2 + 1)
+
+        retrieved_contacts = \
+            self._retrieve_simulated_contacts(contacts, prefetch_depth=1)
+
+        _assert_retrieved_contacts_equal(contacts, retrieved_contacts)
+
+    def test_contact_decoder(self):
+        contacts = [make_contact(1, {STUB_STRING_PROPERTY.name: u'foo'})]
+
+        retrieved_contacts = self._retrieve_simulated_contacts(
+            contacts,
+            {'property_names': [STUB_STRING_PROPERTY.name]},
+            use_contact_decoder=True,
+            )
+
+        _assert_retrieved_contacts_equal(contacts, retrieved_contacts)
+
+    def test_compact(self):
+        contacts = [
+            make_contact(1, {STUB_PROPERTY.name: 'foo'}),
+            make_contact(
+                2,
+                {STUB_PROPERTY.name: 'bar'},
+                related_contact_vids=[1],
+                ),
+            ]
+
+        retrieved_contacts = self._retrieve_simulated_contacts(
+            contacts,
+            {'property_names': [STUB_PROPERTY.name]},
+            compact=True,
+            )
+
+        for retrieved_contact in retrieved_contacts:
+            assert_is_instance(retrieved_contact, CompactContact)
+
+        _assert_retrieved_contacts_equal(
+            contacts,
+            [c.to_contact() for c in retrieved_contacts],
+            )
+
+    def test_lazy_decoding(self):
+        contacts = [make_contact(1, {STUB_NUMBER_PROPERTY.name: Decimal('1')})]
+
+        retrieved_contacts = self._retrieve_simulated_contacts(
+            contacts,
+            {'property_names': [STUB_NUMBER_PROPERTY.name]},
+            available_property=STUB_NUMBER_PROPERTY,
+            lazy_decoding=True,
+            )
+
+        assert_is_instance(
+            retrieved_contacts[0].properties,
+            LazyContactProperties,
+            )
+        _assert_retrieved_contacts_equal(contacts, retrieved_contacts)
+
     #{ Property type casting
 
     def test_property_type_casting(self):
@@ -660,30 +1219,14 @@ class _BaseGettingContactsTestCase(object):
         property_value,
         **kwargs
         ):
-        property_names = [property_definition.name]
-
-        if self._CONTACT_LIST:
-            kwargs['contact_list'] = self._CONTACT_LIST
-
         simulator_contact = \
             make_contact(1, {property_definition.name: property_value})
-        connection = self._make_connection_for_contacts(
-            contacts=[simulator_contact],
+        retrieved_contacts = self._retrieve_simulated_contacts(
+            [simulator_contact],
+            dict(kwargs, property_names=[property_definition.name]),
             available_property=property_definition,
-            property_names=property_names,
-            **kwargs
             )
 
-        with connection:
-            # Trigger API calls by consuming iterator
-            retrieved_contacts = list(
-                self._RETRIEVER(
-                    connection=connection,
-                    property_names=property_names,
-                    **kwargs
-                    ),
-                )
-
         retrieved_contact = retrieved_contacts[0]
         return retrieved_contact
 
@@ -711,19 +1254,50 @@ class _BaseGettingContactsTestCase(object):
         expected_contacts,
         **kwargs
         ):
+        retrieved_contacts = \
+            self._retrieve_simulated_contacts(simulator_contacts, kwargs)
+        _assert_retrieved_contacts_equal(expected_contacts, retrieved_contacts)
 
+    def _retrieve_simulated_contacts(
+        self,
+        simulator_contacts,
+        simulator_kwargs=None,
+        available_property=None,
+        use_contact_decoder=False,
+        **retriever_kwargs
+        ):
+        """
+        Retrieve ``simulator_contacts`` with the retriever under test.
+        
+        ``simulator_kwargs`` are passed to both the simulator and the
+        retriever, whereas ``retriever_kwargs`` are only passed to the latter.
+        
+        """
+        simulator_kwargs = dict(simulator_kwargs or {})
         if self._CONTACT_LIST:
-            kwargs['contact_list'] = self._CONTACT_LIST
+            simulator_kwargs['contact_list'] = self._CONTACT_LIST
 
-        connection = \
-            self._make_connection_for_contacts(simulator_contacts, **kwargs)
+        connection = self._make_connection_for_contacts(
+            simulator_contacts,
+            available_property,
+            **simulator_kwargs
+            )
 
         with connection:
+            if use_contact_decoder:
+                # The property definitions are only retrieved by the decoder
+                retriever_kwargs['contact_decoder'] = \
+                    get_contact_decoder(connection)
+
             # Trigger API calls by consuming iterator
-            retrieved_contacts = \
-                list(self._RETRIEVER(connection=connection, **kwargs))
+            retrieved_contacts = list(
+                self._RETRIEVER(
+                    connection=connection,
+                    **dict(simulator_kwargs, **retriever_kwargs)
+                    ),
+                )
 
-        _assert_retrieved_contacts_equal(expected_contacts, retrieved_contacts)
+        return retrieved_contacts
 
     @classmethod
     def _make_connection_for_contacts(
@@ -773,6 +1347,23 @@ def _get_contacts_with_email_property(simulator_contacts):
     return contacts_with_email_property
 
 
+class _MemoryCheckpointStore(CheckpointStore):
+
+    def __init__(self):
+        super(_MemoryCheckpointStore, self).__init__()
+
+        self._checkpoint = None
+
+    def get_checkpoint(self):
+        return self._checkpoint
+
+    def set_checkpoint(self, checkpoint):
+        self._checkpoint = checkpoint
+
+    def delete_checkpoint(self):
+        self._checkpoint = None
+
+
 def _assert_retrieved_contacts_equal(expected_contacts, retrieved_contacts):
     contacts_with_lastmodifieddate = \
         _derive_contacts_with_lastmodifieddate(expected_contacts)
@@ -813,6 +1404,8 @@ class _BaseTestUnsuccessfulGettingAllContacts(object):
 
     _SIMULATOR_CLASS = abstractproperty()
 
+    _SUCCESSFUL_SIMULATOR_CLASS = abstractproperty()
+
     def test_no_successfully_retrieved_contacts(self):
         connection = self._make_connection([])
         with connection:
@@ -836,6 +1429,62 @@ class _BaseTestUnsuccessfulGettingAllContacts(object):
             with assert_raises(HubspotServerError):
                 next(retrieved_contacts)
 
+    def test_prefetching_some_successfully_retrieved_contacts(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT + 1)
+
+        connection = self._make_connection(contacts)
+        with connection:
+            retrieved_contacts = self._RETRIEVER(connection, prefetch_depth=1)
+
+            successufully_retrieved_contacts = \
+                islice(retrieved_contacts, len(contacts))
+            _assert_retrieved_contacts_equal(
+                contacts,
+                list(successufully_retrieved_contacts),
+                )
+
+            with assert_raises(HubspotServerError):
+                next(retrieved_contacts)
+
+    def test_resuming_from_checkpoint(self):
+        contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT * 2 + 1)
+        first_pages_contacts = contacts[:BATCH_RETRIEVAL_SIZE_LIMIT * 2]
+        last_page_contacts = contacts[BATCH_RETRIEVAL_SIZE_LIMIT * 2:]
+        checkpoint_store = _MemoryCheckpointStore()
+
+        connection = self._make_connection(first_pages_contacts)
+        with connection:
+            retrieved_contacts = \
+                self._RETRIEVER(connection, checkpoint_store=checkpoint_store)
+
+            successfully_retrieved_contacts = \
+                islice(retrieved_contacts, len(first_pages_contacts))
+            _assert_retrieved_contacts_equal(
+                first_pages_contacts,
+                list(successfully_retrieved_contacts),
+                )
+
+            with assert_raises(HubspotServerError):
+                next(retrieved_contacts)
+
+        ok_(checkpoint_store.get_checkpoint())
+
+        simulator = self._SUCCESSFUL_SIMULATOR_CLASS(
+            contacts,
+            [STUB_STRING_PROPERTY],
+            )
+        api_calls = simulator()
+        # Skip the API calls for the pages that were already retrieved
+        del api_calls[1:3]
+        connection = MockPortalConnection(lambda: api_calls)
+        with connection:
+            retrieved_contacts = list(
+                self._RETRIEVER(connection, checkpoint_store=checkpoint_store),
+                )
+
+        _assert_retrieved_contacts_equal(last_page_contacts, retrieved_contacts)
+        eq_(None, checkpoint_store.get_checkpoint())
+
     @classmethod
     def _make_connection(cls, contacts):
         simulator = cls._make_simulator(contacts)
@@ -860,6 +1509,8 @@ class TestUnsuccessfulGettingAllContacts(
 
     _SIMULATOR_CLASS = UnsuccessfulGetAllContacts
 
+    _SUCCESSFUL_SIMULATOR_CLASS = GetAllContacts
+
 
 class TestGettingAllContactsByLastUpdate(_BaseGettingContactsTestCase):
 
@@ -945,6 +1596,41 @@ class TestUnsuccessfulGettingAllContactsByLastUpdate(
 
     _SIMULATOR_CLASS = UnsuccessfulGetAllContactsByLastUpdate
 
+    _SUCCESSFUL_SIMULATOR_CLASS = GetAllContactsByLastUpdate
+
+    def test_duplicated_contacts_across_resumption(self):
+        first_page_contacts = make_contacts(BATCH_RETRIEVAL_SIZE_LIMIT)
+        duplicated_contact = first_page_contacts[0]
+        checkpoint_store = _MemoryCheckpointStore()
+
+        connection = self._make_connection(first_page_contacts)
+        with connection:
+            retrieved_contacts = \
+                self._RETRIEVER(connection, checkpoint_store=checkpoint_store)
+            list(islice(retrieved_contacts, len(first_page_contacts)))
+
+            with assert_raises(HubspotServerError):
+                next(retrieved_contacts)
+
+        simulator = self._SUCCESSFUL_SIMULATOR_CLASS(
+            first_page_contacts + [duplicated_contact],
+            [STUB_STRING_PROPERTY],
+            )
+        api_calls = simulator()
+        # Skip the API call for the page that was already retrieved
+        del api_calls[1]
+        connection = MockPortalConnection(lambda: api_calls)
+        with connection:
+            retrieved_contacts = list(
+                self._RETRIEVER(connection, checkpoint_store=checkpoint_store),
+                )
+
+        # The contacts retrieved before the checkpoint are not remembered
+        _assert_retrieved_contacts_equal(
+            [duplicated_contact],
+            retrieved_contacts,
+            )
+
 
 class TestGettingAllContactsFromList(_BaseGettingContactsTestCase):
 
@@ -14,6 +14,8 @@
 #
 ##############################################################################
 
+from time import sleep
+
 from hubspot.connection.exc import HubspotClientError
 from hubspot.connection.testing import MockPortalConnection
 from nose.tools import assert_raises
@@ -22,6 +24,9 @@ from nose.tools import eq_
 from nose.tools import ok_
 from voluptuous import MultipleInvalid
 
+from hubspot.contacts._property_utils import get_property_type_by_property_name
+from hubspot.contacts.connections import RateLimitedPortalConnection
+from hubspot.contacts.connections import TokenBucketScheduler
 from hubspot.contacts.generic_utils import get_uuid4_str
 from hubspot.contacts.properties import BooleanProperty
 from hubspot.contacts.properties import DateProperty
@@ -30,9 +35,11 @@ from hubspot.contacts.properties import EnumerationProperty
 from hubspot.contacts.properties import NumberProperty
 from hubspot.contacts.properties import Property
 from hubspot.contacts.properties import StringProperty
+from hubspot.contacts.properties import configure_property_definitions_cache
 from hubspot.contacts.properties import create_property
 from hubspot.contacts.properties import delete_property
 from hubspot.contacts.properties import get_all_properties
+from hubspot.contacts.properties import invalidate_property_definitions_cache
 from hubspot.contacts.testing import CreateProperty
 from hubspot.contacts.testing import DeleteProperty
 from hubspot.contacts.testing import GetAllProperties
@@ -189,3 +196,179 @@ def test_successful_property_deletion():
     simulator = DeleteProperty(property_name)
     with MockPortalConnection(simulator) as connection:
         delete_property(property_name, connection)
+
+
+class TestPropertyDefinitionsCache(object):
+
+    def teardown(self):
+        configure_property_definitions_cache(0)
+
+    def test_disabled_by_default(self):
+        simulators = [GetAllProperties([STUB_STRING_PROPERTY])] * 2
+        with MockPortalConnection(*simulators) as connection:
+            get_property_type_by_property_name(connection)
+            get_property_type_by_property_name(connection)
+
+    def test_enabled(self):
+        configure_property_definitions_cache(60)
+
+        simulator = GetAllProperties([STUB_STRING_PROPERTY])
+        with MockPortalConnection(simulator) as connection:
+            property_type_by_property_name = \
+                get_property_type_by_property_name(connection)
+            cached_property_type_by_property_name = \
+                get_property_type_by_property_name(connection)
+
+        eq_(
+            {STUB_STRING_PROPERTY.name: StringProperty},
+            property_type_by_property_name,
+            )
+        eq_(
+            property_type_by_property_name,
+            cached_property_type_by_property_name,
+            )
+
+    def test_entries_per_connection(self):
+        configure_property_definitions_cache(60)
+
+        simulator1 = GetAllProperties([STUB_STRING_PROPERTY])
+        simulator2 = GetAllProperties([STUB_NUMBER_PROPERTY])
+        with MockPortalConnection(simulator1) as connection1:
+            with MockPortalConnection(simulator2) as connection2:
+                get_property_type_by_property_name(connection1)
+                property_type_by_property_name = \
+                    get_property_type_by_property_name(connection2)
+
+        eq_(
+            {STUB_NUMBER_PROPERTY.name: NumberProperty},
+            property_type_by_property_name,
+            )
+
+    def test_expiry(self):
+        configure_property_definitions_cache(0.01)
+
+        simulators = [GetAllProperties([STUB_STRING_PROPERTY])] * 2
+        with MockPortalConnection(*simulators) as connection:
+            get_property_type_by_property_name(connection)
+            sleep(0.02)
+            get_property_type_by_property_name(connection)
+
+    def test_explicit_invalidation(self):
+        configure_property_definitions_cache(60)
+
+        simulators = [GetAllProperties([STUB_STRING_PROPERTY])] * 2
+        with MockPortalConnection(*simulators) as connection:
+            get_property_type_by_property_name(connection)
+            invalidate_property_definitions_cache(connection)
+            get_property_type_by_property_name(connection)
+
+    def test_invalidation_upon_property_creation(self):
+        configure_property_definitions_cache(60)
+
+        connection = MockPortalConnection(
+            GetAllProperties([STUB_STRING_PROPERTY]),
+            CreateProperty(STUB_NUMBER_PROPERTY),
+            GetAllProperties([STUB_NUMBER_PROPERTY]),
+            )
+        with connection:
+            get_property_type_by_property_name(connection)
+            create_property(STUB_NUMBER_PROPERTY, connection)
+            property_type_by_property_name = \
+                get_property_type_by_property_name(connection)
+
+        eq_(
+            {STUB_NUMBER_PROPERTY.name: NumberProperty},
+            property_type_by_property_name,
+            )
+
+    def test_invalidation_upon_property_deletion(self):
+        configure_property_definitions_cache(60)
+
+        connection = MockPortalConnection(
+            GetAllProperties([STUB_STRING_PROPERTY]),
+            DeleteProperty(STUB_STRING_PROPERTY.name),
+            GetAllProperties([]),
+            )
+        with connection:
+            get_property_type_by_property_name(connection)
+            delete_property(STUB_STRING_PROPERTY.name, connection)
+            property_type_by_property_name = \
+                get_property_type_by_property_name(connection)
+
+        eq_({}, property_type_by_property_name)
+
+    def test_entries_shared_by_rate_limited_connections(self):
+        configure_property_definitions_cache(60)
+
+        connection = MockPortalConnection(
+            GetAllProperties([STUB_STRING_PROPERTY]),
+            CreateProperty(STUB_NUMBER_PROPERTY),
+            GetAllProperties([STUB_NUMBER_PROPERTY]),
+            )
+        scheduler = TokenBucketScheduler(100)
+        rate_limited_connection1 = \
+            RateLimitedPortalConnection(connection, scheduler)
+        rate_limited_connection2 = \
+            RateLimitedPortalConnection(connection, scheduler)
+        with connection:
+            get_property_type_by_property_name(rate_limited_connection1)
+            get_property_type_by_property_name(rate_limited_connection2)
+            create_property(STUB_NUMBER_PROPERTY, rate_limited_connection1)
+            property_type_by_property_name = \
+                get_property_type_by_property_name(rate_limited_connection2)
+
+        eq_(
+            {STUB_NUMBER_PROPERTY.name: NumberProperty},
+            property_type_by_property_name,
+            )
+
+    def test_invalidation_during_retrieval(self):
+        configure_property_definitions_cache(60)
+
+        simulators = [GetAllProperties([STUB_STRING_PROPERTY])] * 2
+        with MockPortalConnection(*simulators) as connection:
+            invalidating_connection = _InvalidatingConnection(connection)
+            get_property_type_by_property_name(invalidating_connection)
+            get_property_type_by_property_name(invalidating_connection)
+
+    def test_connection_without_weak_references(self):
+        configure_property_definitions_cache(60)
+
+        simulators = [GetAllProperties([STUB_STRING_PROPERTY])] * 2
+        with MockPortalConnection(*simulators) as connection:
+            slotted_connection = _SlottedConnection(connection)
+            get_property_type_by_property_name(slotted_connection)
+            get_property_type_by_property_name(slotted_connection)
+            invalidate_property_definitions_cache(slotted_connection)
+
+
+class _InvalidatingConnection(object):
+    """
+    Connection which invalidates its own cache entry whilst the property
+    definitions are being retrieved.
+    
+    """
+
+    def __init__(self, connection):
+        super(_InvalidatingConnection, self).__init__()
+
+        self._connection = connection
+
+    def send_get_request(self, url_path, query_string_args=None):
+        response_data = \
+            self._connection.send_get_request(url_path, query_string_args)
+        invalidate_property_definitions_cache(self)
+        return response_data
+
+
+class _SlottedConnection(object):
+
+    __slots__ = ('_connection', )
+
+    def __init__(self, connection):
+        super(_SlottedConnection, self).__init__()
+
+        self._connection = connection
+
+    def send_get_request(self, url_path, query_string_args=None):
+        return self._connection.send_get_request(url_path, query_string_args)
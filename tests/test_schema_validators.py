@@ -16,6 +16,7 @@
 
 from nose.tools import assert_raises
 from nose.tools import eq_
+from nose.tools import ok_
 from voluptuous import Invalid
 from voluptuous import Schema
 
@@ -23,6 +24,8 @@ from hubspot.contacts._schemas._validators import AnyListItemValidates
 from hubspot.contacts._schemas._validators import Constant
 from hubspot.contacts._schemas._validators import DynamicDictionary
 from hubspot.contacts._schemas._validators import GetDictValue
+from hubspot.contacts._schemas.contacts import CONTACT_SCHEMA
+from hubspot.contacts._schemas.contacts import validate_contact_data
 
 
 class TestGetttingDictValues(object):
@@ -117,3 +120,71 @@ class TestConstantValue(object):
     def test_non_matching_value(self):
         with assert_raises(Invalid):
             self.schema(2)
+
+
+class TestContactDataValidation(object):
+    """
+    The hand-written contact validator must accept and reject the same data
+    as the contact schema.
+
+    """
+
+    def test_valid_contact(self):
+        contact_data = _make_contact_data()
+        expected_contact_data = CONTACT_SCHEMA(_make_contact_data())
+
+        eq_(expected_contact_data, validate_contact_data(contact_data))
+
+    def test_extra_keys(self):
+        contact_data = _make_contact_data(**{'canonical-vid': 1})
+        expected_contact_data = CONTACT_SCHEMA(contact_data)
+
+        eq_(expected_contact_data, validate_contact_data(contact_data))
+
+    def test_invalid_contacts(self):
+        invalid_contacts_data = [
+            [],
+            _make_contact_data(vid='1'),
+            _make_contact_data(properties=[]),
+            _make_contact_data(properties={'name': {'value': u'value'}}),
+            _make_contact_data(properties={u'name': {}}),
+            _make_contact_data(properties={u'name': {'value': 1}}),
+            _make_contact_data(**{'identity-profiles': []}),
+            _make_contact_data(**{'identity-profiles': [{'vid': 1}]}),
+            _make_contact_data(
+                **{'identity-profiles': [{'vid': 1, 'identities': {}}]}
+                ),
+            ]
+        for key in ('vid', 'properties', 'identity-profiles'):
+            contact_data = _make_contact_data()
+            del contact_data[key]
+            invalid_contacts_data.append(contact_data)
+
+        for contact_data in invalid_contacts_data:
+            yield self._assert_contact_data_invalid, contact_data
+
+    @staticmethod
+    def _assert_contact_data_invalid(contact_data):
+        with assert_raises(Invalid):
+            CONTACT_SCHEMA(contact_data)
+
+        with assert_raises(Invalid) as context_manager:
+            validate_contact_data(contact_data)
+
+        ok_(context_manager.exception.msg)
+
+
+def _make_contact_data(**overridden_items):
+    contact_data = {
+        'vid': 1,
+        'properties': {u'name': {'value': u'value', 'versions': []}},
+        'identity-profiles': [
+            {
+                'vid': 1,
+                'identities': [{'type': u'EMAIL', 'value': u'a@example.com'}],
+                },
+            {'vid': 2, 'identities': []},
+            ],
+        }
+    contact_data.update(overridden_items)
+    return contact_data
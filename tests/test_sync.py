@@ -0,0 +1,138 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+
+from hubspot.connection.testing import MockPortalConnection
+from nose.tools import eq_
+
+from hubspot.contacts.sync import ContactsSyncResult
+from hubspot.contacts.sync import SQLiteContactStore
+from hubspot.contacts.sync import sync_contacts
+from hubspot.contacts.testing import GetAllContactsByLastUpdate
+from hubspot.contacts.testing import STUB_LAST_MODIFIED_DATETIME
+
+from tests._utils import make_contact
+from tests._utils import make_contacts
+from tests.test_properties import STUB_STRING_PROPERTY
+
+
+class TestSyncingContacts(object):
+
+    def setup(self):
+        self._contact_store = SQLiteContactStore(':memory:')
+
+    def teardown(self):
+        self._contact_store.close()
+
+    def test_no_contacts(self):
+        sync_result = self._sync_contacts([])
+
+        eq_(ContactsSyncResult(0, 0, None), sync_result)
+        eq_(None, self._contact_store.get_watermark())
+
+    def test_first_sync(self):
+        contacts = make_contacts(2)
+
+        sync_result = self._sync_contacts(contacts)
+
+        expected_watermark = \
+            GetAllContactsByLastUpdate.get_contact_added_at_datetime(
+                contacts[0],
+                contacts,
+                )
+        eq_(ContactsSyncResult(2, 0, expected_watermark), sync_result)
+        eq_(expected_watermark, self._contact_store.get_watermark())
+
+        for contact in contacts:
+            eq_(
+                _derive_contact_with_lastmodifieddate(contact),
+                self._contact_store.get_contact(contact.vid),
+                )
+
+    def test_new_contact(self):
+        self._sync_contacts(make_contacts(1))
+
+        new_contact = make_contact(2)
+        sync_result = self._sync_contacts([new_contact])
+
+        eq_(1, sync_result.new_contact_count)
+        eq_(0, sync_result.changed_contact_count)
+        eq_(
+            _derive_contact_with_lastmodifieddate(new_contact),
+            self._contact_store.get_contact(new_contact.vid),
+            )
+
+    def test_changed_contact(self):
+        contact = make_contact(1, {STUB_STRING_PROPERTY.name: u'foo'})
+        self._sync_contacts([contact])
+
+        changed_contact = contact.copy()
+        changed_contact.properties = {STUB_STRING_PROPERTY.name: u'bar'}
+        sync_result = self._sync_contacts([changed_contact])
+
+        eq_(0, sync_result.new_contact_count)
+        eq_(1, sync_result.changed_contact_count)
+        eq_(
+            _derive_contact_with_lastmodifieddate(changed_contact),
+            self._contact_store.get_contact(contact.vid),
+            )
+
+    def test_unchanged_contact(self):
+        contacts = make_contacts(1)
+        self._sync_contacts(contacts)
+
+        sync_result = self._sync_contacts(contacts)
+
+        eq_(0, sync_result.new_contact_count)
+        eq_(0, sync_result.changed_contact_count)
+
+    def test_sync_from_watermark(self):
+        """Only the contacts updated since the last sync are retrieved"""
+        contacts = make_contacts(3)
+        self._sync_contacts(contacts)
+
+        # The simulator checks that the watermark is used as the cutoff
+        sync_result = self._sync_contacts(contacts)
+
+        eq_(0, sync_result.new_contact_count)
+
+    def test_contact_not_in_store(self):
+        eq_(None, self._contact_store.get_contact(1))
+
+    def _sync_contacts(self, contacts):
+        property_names = [STUB_STRING_PROPERTY.name]
+        simulator = GetAllContactsByLastUpdate(
+            contacts,
+            [STUB_STRING_PROPERTY],
+            property_names,
+            cutoff_datetime=self._contact_store.get_watermark(),
+            )
+        with MockPortalConnection(simulator) as connection:
+            sync_result = sync_contacts(
+                connection,
+                self._contact_store,
+                property_names,
+                )
+        return sync_result
+
+
+def _derive_contact_with_lastmodifieddate(contact):
+    contact = contact.copy()
+    contact.properties = dict(
+        contact.properties,
+        lastmodifieddate=STUB_LAST_MODIFIED_DATETIME,
+        )
+    return contact
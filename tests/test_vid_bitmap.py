@@ -0,0 +1,76 @@
+##############################################################################
+#
+# Copyright (c) 2014, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of hubspot-contacts
+# <https://github.com/2degrees/hubspot-contacts>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+
+from nose.tools import assert_false
+from nose.tools import assert_in
+from nose.tools import assert_not_in
+from nose.tools import assert_raises
+from nose.tools import eq_
+from nose.tools import ok_
+
+from hubspot.contacts._vid_bitmap import VidBitmap
+
+
+class TestVidBitmap(object):
+
+    def test_empty(self):
+        vid_bitmap = VidBitmap()
+
+        eq_(0, len(vid_bitmap))
+        eq_([], list(vid_bitmap))
+        assert_not_in(1, vid_bitmap)
+
+    def test_adding_new_vid(self):
+        vid_bitmap = VidBitmap()
+
+        ok_(vid_bitmap.add(1))
+        assert_in(1, vid_bitmap)
+        eq_(1, len(vid_bitmap))
+
+    def test_adding_existing_vid(self):
+        vid_bitmap = VidBitmap([1])
+
+        assert_false(vid_bitmap.add(1))
+        eq_(1, len(vid_bitmap))
+
+    def test_vids_beyond_bitmap(self):
+        vid_bitmap = VidBitmap([3])
+
+        assert_not_in(10 ** 6, vid_bitmap)
+
+        vid_bitmap.add(10 ** 6)
+        assert_in(10 ** 6, vid_bitmap)
+        assert_in(3, vid_bitmap)
+
+    def test_sparse_high_vids(self):
+        high_vids = [2 ** 40 + 1, 2 ** 33, 2 ** 32 + 5]
+        vid_bitmap = VidBitmap([5] + high_vids)
+
+        eq_(4, len(vid_bitmap))
+        eq_([5] + sorted(high_vids), list(vid_bitmap))
+        assert_not_in(2 ** 32 + 4, vid_bitmap)
+        eq_(4, len(vid_bitmap._page_by_page_index))
+
+    def test_iteration_in_ascending_order(self):
+        vids = [17, 0, 8, 7, 1000]
+        vid_bitmap = VidBitmap(vids)
+
+        eq_(sorted(vids), list(vid_bitmap))
+
+    def test_negative_vid(self):
+        with assert_raises(ValueError):
+            VidBitmap().add(-1)